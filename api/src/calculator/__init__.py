@@ -1,12 +1,14 @@
 """AgentFICO Score Calculator Module."""
 from .score_calculator import (
     AgentFICOScore,
+    BatchScoreResult,
     RiskLevel,
     ScoreCalculator,
 )
 
 __all__ = [
     "AgentFICOScore",
+    "BatchScoreResult",
     "RiskLevel",
     "ScoreCalculator",
 ]
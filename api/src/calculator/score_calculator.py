@@ -12,15 +12,23 @@ The default weighting is:
 - erc8004Stability: 20%
 """
 
-from dataclasses import dataclass
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import logging
 
 from ..data_sources.etherscan import EtherscanClient
+from ..data_sources.multichain import MultiChainTxSource
+from ..data_sources.rate_limiter import Priority, RateLimiter, request_priority
 from ..data_sources.x402 import X402DataSource
 from ..data_sources.erc8004 import ERC8004DataSource
+from ..services.anomaly_flags import AnomalyFlag, AnomalyFlagStore
+from ..services.metrics_rollup import AgentMetrics, DailyMetricsRollup
+from ..services.score_history import ScoreHistoryStore, ScoreRecord
 
 # Anti-Gaming imports (optional, graceful fallback if not available)
 try:
@@ -29,6 +37,7 @@ try:
         detect_anomaly,
         calculate_consistency_bonus,
         assess_transaction_quality,
+        get_config_version,
         is_feature_enabled,
     )
     ANTI_GAMING_AVAILABLE = True
@@ -104,6 +113,29 @@ class AgentFICOScore:
         }
 
 
+@dataclass
+class BatchScoreResult:
+    """Result of scoring several agents at once.
+
+    Attributes:
+        scores: Successfully calculated scores keyed by lowercase address
+        errors: Error messages keyed by lowercase address
+    """
+
+    scores: Dict[str, AgentFICOScore] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def _unique_addresses(addresses: Iterable[str]) -> Iterator[str]:
+    """Yield lowercase addresses, skipping duplicates."""
+    seen = set()
+    for address in addresses:
+        address = address.lower()
+        if address not in seen:
+            seen.add(address)
+            yield address
+
+
 class ScoreCalculator:
     """AgentFICO Score Calculator Engine.
 
@@ -129,20 +161,51 @@ class ScoreCalculator:
         "erc8004_stability": 0.20,
     }
 
+    # Per-source timeouts in seconds (sources are fetched concurrently)
+    DEFAULT_SOURCE_TIMEOUTS = {
+        "tx_success": 20.0,
+        "x402_profitability": 10.0,
+        "erc8004_stability": 10.0,
+    }
+
+    # Overall latency budget for collecting all sources (seconds)
+    DEFAULT_LATENCY_BUDGET = 25.0
+
+    # Confidence penalty for each source missing from a partial score
+    MISSING_SOURCE_CONFIDENCE_PENALTY = 20
+
+    # Fallback worker count for batch scoring when the tx source
+    # does not expose a rate_limiter
+    DEFAULT_BATCH_CONCURRENCY = 5
+
     def __init__(
         self,
-        etherscan_client: EtherscanClient,
+        etherscan_client: Union[EtherscanClient, MultiChainTxSource],
         x402_source: X402DataSource,
         erc8004_source: ERC8004DataSource,
         weights: Optional[dict] = None,
+        source_timeouts: Optional[dict] = None,
+        latency_budget: float = DEFAULT_LATENCY_BUDGET,
+        history_store: Optional[ScoreHistoryStore] = None,
+        metrics_rollup: Optional[DailyMetricsRollup] = None,
+        anomaly_flags: Optional[AnomalyFlagStore] = None,
     ):
         """Initialize the score calculator.
 
         Args:
             etherscan_client: Etherscan API client for transaction data
+                (or a MultiChainTxSource aggregating several chains)
             x402_source: x402 data source for profitability metrics
             erc8004_source: ERC-8004 data source for stability score
             weights: Optional custom weights (must sum to 1.0)
+            source_timeouts: Optional per-source timeouts in seconds,
+                keyed like ``DEFAULT_SOURCE_TIMEOUTS``
+            latency_budget: Upper bound in seconds for collecting all sources
+            history_store: Optional store every computed score is appended to
+            metrics_rollup: Optional daily metrics feeding anomaly detection
+                and the consistency bonus (without it both see no history)
+            anomaly_flags: Optional store of flags raised by the batch anomaly
+                scan; an active flag penalizes the score until it expires
 
         Raises:
             ValueError: If weights do not sum to 1.0
@@ -151,12 +214,36 @@ class ScoreCalculator:
         self.x402 = x402_source
         self.erc8004 = erc8004_source
         self.weights = weights or self.DEFAULT_WEIGHTS.copy()
+        self.source_timeouts = {**self.DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self.latency_budget = latency_budget
+        self.history_store = history_store
+        self.metrics_rollup = metrics_rollup
+        self.anomaly_flags = anomaly_flags
+
+        # In-flight computations keyed by (address, days) for single-flight
+        self._inflight: Dict[Tuple[str, int], asyncio.Task] = {}
 
         # Validate weights sum to 1.0
         total = sum(self.weights.values())
         if abs(total - 1.0) > 0.001:
             raise ValueError(f"Weights must sum to 1.0, got {total}")
 
+    @property
+    def weights_version(self) -> str:
+        """Short stable fingerprint of the configured weights."""
+        encoded = json.dumps(self.weights, sort_keys=True).encode()
+        return hashlib.sha1(encoded).hexdigest()[:12]
+
+    @property
+    def cache_version(self) -> str:
+        """Version of everything that affects a score besides its inputs.
+
+        Combines the weights fingerprint with the anti-gaming config
+        version, so cached scores are not served across config changes.
+        """
+        config_version = get_config_version() if ANTI_GAMING_AVAILABLE else 0
+        return f"{self.weights_version}:{config_version}"
+
     async def calculate_score(
         self,
         agent_address: str,
@@ -164,8 +251,144 @@ class ScoreCalculator:
     ) -> AgentFICOScore:
         """Calculate the AgentFICO score for an agent.
 
-        Fetches data from all three sources and calculates weighted
-        average to produce the overall score.
+        Concurrent calls for the same ``(agent_address, days)`` are
+        coalesced (single-flight): only the first caller triggers the
+        computation and every waiter receives the same AgentFICOScore.
+        Cancelling one waiter does not cancel the shared computation.
+
+        Args:
+            agent_address: Ethereum address of the agent (0x...)
+            days: Analysis period in days (default: 30)
+
+        Returns:
+            AgentFICOScore object with all score components
+        """
+        key = (agent_address.lower(), days)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._calculate_score(agent_address, days))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release_inflight(key, done))
+        return await asyncio.shield(task)
+
+    async def calculate_scores(
+        self,
+        addresses: Iterable[str],
+        days: int = 30,
+        max_concurrency: Optional[int] = None,
+    ) -> BatchScoreResult:
+        """Calculate scores for many agents with bounded concurrency.
+
+        Addresses are deduplicated case-insensitively. At most
+        ``max_concurrency`` scores are computed at once; by default this
+        matches the Etherscan client's calls-per-second limit so workers
+        do not pile up behind the rate limiter. A failure for one address
+        is recorded in ``errors`` and does not affect the others.
+
+        Args:
+            addresses: Agent Ethereum addresses
+            days: Analysis period in days (default: 30)
+            max_concurrency: Maximum scores computed concurrently
+
+        Returns:
+            BatchScoreResult with scores and per-address errors
+        """
+        result = BatchScoreResult()
+        async for address, score, error in self.iter_scores(
+            addresses, days, max_concurrency=max_concurrency
+        ):
+            if error is None:
+                result.scores[address] = score
+            else:
+                result.errors[address] = error
+        return result
+
+    async def iter_scores(
+        self,
+        addresses: Iterable[str],
+        days: int = 30,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, Optional[AgentFICOScore], Optional[str]]]:
+        """Score many agents, yielding each result as soon as it completes.
+
+        A fixed pool of workers pulls addresses lazily from ``addresses``
+        and hands results over a bounded queue, so memory stays flat no
+        matter how many agents are scored. Addresses are deduplicated
+        case-insensitively. Closing the iterator early cancels the workers.
+        Workers run in the batch priority lane, so interactive scoring
+        calls are served first by the Etherscan rate limiter.
+
+        Args:
+            addresses: Agent Ethereum addresses (any iterable)
+            days: Analysis period in days (default: 30)
+            max_concurrency: Maximum scores computed concurrently
+
+        Yields:
+            Tuples of (address, score, error) in completion order; exactly
+            one of ``score`` and ``error`` is set
+        """
+        concurrency = max_concurrency or self._batch_concurrency()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        pending = _unique_addresses(addresses)
+        done = object()
+
+        async def _worker() -> None:
+            for address in pending:
+                try:
+                    item = (address, await self.calculate_score(address, days), None)
+                except Exception as e:
+                    logger.warning(f"Batch scoring failed for {address}: {e}")
+                    item = (address, None, str(e) or type(e).__name__)
+                await queue.put(item)
+
+        async def _run_workers() -> None:
+            try:
+                await asyncio.gather(*(_worker() for _ in range(concurrency)))
+            finally:
+                await queue.put(done)
+
+        with request_priority(Priority.BATCH):
+            # The runner task copies the current context, including the lane
+            runner = asyncio.ensure_future(_run_workers())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                yield item
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    def _batch_concurrency(self) -> int:
+        """Default batch worker count: one per call/sec of the tx source's key pool."""
+        rate_limiter = getattr(self.etherscan, "rate_limiter", None)
+        if not isinstance(rate_limiter, RateLimiter):
+            return self.DEFAULT_BATCH_CONCURRENCY
+        return max(1, int(rate_limiter.total_rate))
+
+    def _release_inflight(self, key: Tuple[str, int], task: asyncio.Task) -> None:
+        """Forget a finished computation so later calls start fresh."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _calculate_score(
+        self,
+        agent_address: str,
+        days: int = 30,
+    ) -> AgentFICOScore:
+        """Calculate the AgentFICO score for an agent (uncoalesced).
+
+        Fetches data from all three sources concurrently and calculates
+        weighted average to produce the overall score. A source that
+        exceeds its timeout (or the overall latency budget) contributes a
+        score of 0, is listed under ``breakdown["missing"]`` and lowers the
+        confidence, so a partial score is returned instead of an error.
 
         Args:
             agent_address: Ethereum address of the agent (0x...)
@@ -174,12 +397,23 @@ class ScoreCalculator:
         Returns:
             AgentFICOScore object with all score components
         """
-        # 1. Collect scores from each data source
-        tx_result = await self.etherscan.get_agent_tx_success_score(
-            agent_address, days
+        # 1. Collect scores from each data source (concurrently)
+        results, missing = await self._collect_sources(
+            {
+                "tx_success": self.etherscan.get_agent_tx_success_score(
+                    agent_address, days
+                ),
+                "x402_profitability": self.x402.calculate_profitability(
+                    agent_address, days
+                ),
+                "erc8004_stability": self.erc8004.calculate_stability_score(
+                    agent_address
+                ),
+            }
         )
-        x402_result = await self.x402.calculate_profitability(agent_address, days)
-        erc8004_result = await self.erc8004.calculate_stability_score(agent_address)
+        tx_result = results["tx_success"]
+        x402_result = results["x402_profitability"]
+        erc8004_result = results["erc8004_stability"]
 
         # 2. Extract individual scores (0-100)
         tx_score = tx_result.get("score", 0)
@@ -207,10 +441,24 @@ class ScoreCalculator:
         risk_level = self._calculate_risk_level(overall)
 
         # 5. Calculate confidence
-        confidence = self._calculate_confidence(tx_result, x402_result, erc8004_result)
+        confidence = self._calculate_confidence(
+            tx_result, x402_result, erc8004_result, missing=missing
+        )
 
         # 6. Build result
-        return AgentFICOScore(
+        breakdown = {
+            "weights": self.weights,
+            "sources": {
+                "txSuccess": tx_result,
+                "x402Profitability": x402_result,
+                "erc8004Stability": erc8004_result,
+            },
+        }
+        if missing:
+            breakdown["partial"] = True
+            breakdown["missing"] = missing
+
+        score = AgentFICOScore(
             agent_address=agent_address,
             overall=overall,
             tx_success=tx_score,
@@ -219,15 +467,70 @@ class ScoreCalculator:
             risk_level=risk_level,
             confidence=confidence,
             timestamp=datetime.now(timezone.utc),
-            breakdown={
-                "weights": self.weights,
-                "sources": {
-                    "txSuccess": tx_result,
-                    "x402Profitability": x402_result,
-                    "erc8004Stability": erc8004_result,
-                },
-            },
+            breakdown=breakdown,
+        )
+
+        # 7. Append to the score history
+        if self.history_store is not None:
+            await self._record_history(score, days, tx_result)
+
+        return score
+
+    async def _record_history(
+        self, score: AgentFICOScore, days: int, tx_result: dict
+    ) -> None:
+        """Append a computed score to the history (failures are logged only)."""
+        try:
+            await self.history_store.append(
+                ScoreRecord(
+                    address=score.agent_address,
+                    recorded_at=int(score.timestamp.timestamp() * 1000),
+                    days=days,
+                    overall=score.overall,
+                    tx_success=score.tx_success,
+                    x402_profitability=score.x402_profitability,
+                    erc8004_stability=score.erc8004_stability,
+                    risk_level=int(score.risk_level),
+                    confidence=score.confidence,
+                    tx_count=tx_result.get("total_txs", 0),
+                    success_rate=tx_result.get("success_rate", 0.0),
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Could not record score history for {score.agent_address}: {e}")
+
+    async def _collect_sources(
+        self,
+        coros: Dict[str, Awaitable[dict]],
+    ) -> Tuple[Dict[str, dict], List[str]]:
+        """Await all data sources concurrently within their timeouts.
+
+        Each source is bounded by its own timeout and by the overall
+        latency budget. Sources that time out are replaced by an empty
+        result flagged with ``"missing": True``; other exceptions propagate.
+
+        Args:
+            coros: Source coroutines keyed by weight name
+
+        Returns:
+            Tuple of (results keyed by weight name, names of missing sources)
+        """
+
+        async def _bounded(name: str, coro: Awaitable[dict]) -> dict:
+            timeout = min(self.source_timeouts[name], self.latency_budget)
+            try:
+                return await asyncio.wait_for(coro, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Score source {name} exceeded {timeout:.1f}s budget")
+                return {"score": 0, "missing": True, "error": "timeout"}
+
+        names = list(coros)
+        values = await asyncio.gather(
+            *(_bounded(name, coros[name]) for name in names)
         )
+        results = dict(zip(names, values))
+        missing = [name for name in names if results[name].get("missing")]
+        return results, missing
 
     def _calculate_risk_level(self, overall: int) -> RiskLevel:
         """Determine risk level based on overall score.
@@ -254,6 +557,7 @@ class ScoreCalculator:
         tx_result: dict,
         x402_result: dict,
         erc8004_result: dict,
+        missing: Optional[List[str]] = None,
     ) -> int:
         """Calculate confidence score based on data quality.
 
@@ -261,11 +565,13 @@ class ScoreCalculator:
         - Transaction count: More transactions = higher confidence (up to +30)
         - Registration status: Registered agent = +20
         - Base confidence: 50
+        - Missing source (timed out): -20 each
 
         Args:
             tx_result: Transaction success result
             x402_result: Profitability result
             erc8004_result: Stability result
+            missing: Names of sources missing from a partial score
 
         Returns:
             Confidence score (0-100)
@@ -285,7 +591,11 @@ class ScoreCalculator:
         if erc8004_result.get("is_registered", False):
             confidence += 20
 
-        return min(confidence, 100)
+        # Partial score penalty
+        if missing:
+            confidence -= self.MISSING_SOURCE_CONFIDENCE_PENALTY * len(missing)
+
+        return max(0, min(confidence, 100))
 
     def calculate_score_sync(
         self,
@@ -357,21 +667,17 @@ class ScoreCalculator:
         }
         adjusted_score = float(base_score)
 
+        metrics = await self._agent_metrics(agent_address, tx_result)
+        stored_flag = await self._stored_anomaly_flag(agent_address)
+
         try:
             # 1. Anomaly Detection (can reduce score)
             if is_feature_enabled("anomaly"):
-                # For now, use simplified metrics
-                current_metrics = {
-                    "tx_count": tx_result.get("total_txs", 0),
-                    "success_rate": tx_result.get("success_rate", 0),
-                }
-                # Historical would come from DB in production
-                historical_metrics = []
-                
                 anomaly_result = detect_anomaly(
                     agent_address,
-                    current_metrics,
-                    historical_metrics
+                    metrics.current,
+                    metrics.history,
+                    baseline=metrics.baseline,
                 )
                 
                 if anomaly_result.get("is_anomaly"):
@@ -382,13 +688,19 @@ class ScoreCalculator:
                         "factor": penalty_factor,
                         "flags": anomaly_result.get("flags", [])
                     })
+                elif stored_flag is not None:
+                    # Flagged by the last batch scan and not yet expired
+                    adjusted_score *= stored_flag.penalty_factor
+                    adjustments["applied"].append({
+                        "type": "anomaly_flag",
+                        "factor": stored_flag.penalty_factor,
+                        "flags": stored_flag.types,
+                        "expires_at": stored_flag.expires_at,
+                    })
 
             # 2. Consistency Bonus (can increase score)
             if is_feature_enabled("consistency"):
-                # Historical performance would come from DB
-                performance_history = []
-                
-                consistency_result = calculate_consistency_bonus(performance_history)
+                consistency_result = calculate_consistency_bonus(metrics.history)
                 bonus = consistency_result.get("bonus_points", 0)
                 
                 if bonus > 0:
@@ -414,3 +726,39 @@ class ScoreCalculator:
         except Exception as e:
             logger.warning(f"Anti-gaming adjustment failed: {e}")
             return base_score, {"error": str(e)}
+
+    async def _stored_anomaly_flag(self, agent_address: str) -> Optional[AnomalyFlag]:
+        """Active batch-scan flag of the agent (None if unavailable)."""
+        if self.anomaly_flags is None:
+            return None
+        try:
+            return await self.anomaly_flags.get_flag(agent_address)
+        except Exception as e:
+            logger.warning(f"Anomaly flags unavailable for {agent_address}: {e}")
+            return None
+
+    async def _agent_metrics(self, agent_address: str, tx_result: dict) -> AgentMetrics:
+        """Current and daily metrics for the anti-gaming checks.
+
+        Comes from ``metrics_rollup`` when configured. Otherwise (or if the
+        rollup fails) only the scored period is known and the history is
+        empty.
+        """
+        fallback = AgentMetrics(
+            current={
+                "tx_count": tx_result.get("total_txs", 0),
+                # txSuccess reports 0-100; the anti-gaming checks use 0-1
+                "success_rate": tx_result.get("success_rate", 0) / 100,
+            },
+            history=[],
+        )
+        if self.metrics_rollup is None:
+            return fallback
+        try:
+            metrics = await self.metrics_rollup.get_metrics(agent_address)
+        except Exception as e:
+            logger.warning(f"Daily metrics unavailable for {agent_address}: {e}")
+            return fallback
+        # A quiet last day keeps the scored period's success rate
+        metrics.current.setdefault("success_rate", fallback.current["success_rate"])
+        return metrics
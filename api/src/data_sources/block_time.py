@@ -0,0 +1,117 @@
+"""Timestamp to block number resolution cache.
+
+Scoring windows are expressed in days, but Etherscan's account endpoints
+filter by block range. ``BlockTimeCache`` keeps, per chain, a sorted set
+of known ``(timestamp, block)`` anchors so that a window cutoff can be
+turned into a ``startblock`` without an API call whenever nearby anchors
+are already known. Anchors come from ``getblocknobytime`` lookups and from
+the transactions that pass through the client (every transaction is a
+free, exact anchor).
+
+Estimates are conservative: they err towards an earlier block, so a
+resolved ``startblock`` never cuts off in-window rows. Callers still
+filter by timestamp afterwards.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+
+class BlockTimeCache:
+    """Per-chain timestamp to block interpolation cache.
+
+    Args:
+        max_anchors: Anchors kept per chain; the oldest are dropped first
+        max_gap: Seconds past the nearest earlier anchor that may be
+            answered with that anchor's block when no later anchor exists
+        max_span: Widest anchor pair (seconds) used for interpolation
+        slack: Fraction of the interpolated distance given back towards
+            the earlier anchor, to absorb uneven block times (missed slots)
+
+    Example:
+        >>> cache = BlockTimeCache()
+        >>> cache.record(1, 1706536800, 19000000)
+        >>> cache.record(1, 1706540400, 19000300)
+        >>> cache.estimate(1, 1706538600)
+        19000135
+    """
+
+    DEFAULT_MAX_ANCHORS = 4096
+    DEFAULT_MAX_GAP = 3600  # 1 hour
+    DEFAULT_MAX_SPAN = 86400  # 1 day
+    DEFAULT_SLACK = 0.1
+
+    def __init__(
+        self,
+        max_anchors: int = DEFAULT_MAX_ANCHORS,
+        max_gap: int = DEFAULT_MAX_GAP,
+        max_span: int = DEFAULT_MAX_SPAN,
+        slack: float = DEFAULT_SLACK,
+    ):
+        self.max_anchors = max_anchors
+        self.max_gap = max_gap
+        self.max_span = max_span
+        self.slack = slack
+        self._timestamps: Dict[int, List[int]] = {}
+        self._blocks: Dict[int, List[int]] = {}
+
+    def record(self, chain_id: int, timestamp: int, block_number: int) -> None:
+        """Remember that ``block_number`` was produced at ``timestamp``.
+
+        Args:
+            chain_id: Chain the block belongs to
+            timestamp: Block timestamp (Unix seconds)
+            block_number: Block number
+        """
+        timestamps = self._timestamps.setdefault(chain_id, [])
+        blocks = self._blocks.setdefault(chain_id, [])
+
+        i = bisect_left(timestamps, timestamp)
+        if i < len(timestamps) and timestamps[i] == timestamp:
+            # Several blocks can share a second on fast chains; keep the first
+            blocks[i] = min(blocks[i], block_number)
+            return
+
+        timestamps.insert(i, timestamp)
+        blocks.insert(i, block_number)
+        if len(timestamps) > self.max_anchors:
+            excess = len(timestamps) - self.max_anchors
+            del timestamps[:excess]
+            del blocks[:excess]
+
+    def estimate(self, chain_id: int, timestamp: int) -> Optional[int]:
+        """Estimate the first block at or after ``timestamp``.
+
+        Args:
+            chain_id: Chain to resolve on
+            timestamp: Unix timestamp (seconds)
+
+        Returns:
+            A block number no later than the true first block (within the
+            slack tolerance), or None when no usable anchors are cached
+        """
+        timestamps = self._timestamps.get(chain_id)
+        if not timestamps:
+            return None
+        blocks = self._blocks[chain_id]
+
+        i = bisect_right(timestamps, timestamp)
+        if i == 0:
+            return None
+
+        t0, b0 = timestamps[i - 1], blocks[i - 1]
+        if t0 == timestamp:
+            return b0
+
+        if i < len(timestamps):
+            t1, b1 = timestamps[i], blocks[i]
+            if t1 - t0 <= self.max_span:
+                offset = (b1 - b0) * (timestamp - t0) / (t1 - t0)
+                return b0 + int(offset * (1 - self.slack))
+
+        if timestamp - t0 <= self.max_gap:
+            return b0
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(timestamps) for timestamps in self._timestamps.values())
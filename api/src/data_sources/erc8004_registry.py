@@ -253,6 +253,22 @@ class ERC8004RegistryClient:
         except Exception:
             return None
     
+    async def get_agent_wallets(self) -> list[str]:
+        """등록된 모든 에이전트의 지갑 주소 조회
+
+        지갑이 설정되지 않은 에이전트는 소유자 주소를 사용합니다.
+        조회에 실패한 에이전트는 건너뜁니다.
+        """
+        async def _wallet(agent_id: int) -> Optional[str]:
+            wallet = await self.get_agent_wallet(agent_id)
+            return wallet or await self.get_owner(agent_id)
+
+        valid_ids = await self.get_valid_token_ids()
+        results = await asyncio.gather(
+            *(_wallet(aid) for aid in valid_ids), return_exceptions=True
+        )
+        return [r.lower() for r in results if isinstance(r, str)]
+
     async def get_token_uri(self, agent_id: int) -> str:
         """에이전트 메타데이터 URI 조회"""
         try:
@@ -438,3 +454,21 @@ async def list_all_agents(
         has_more=offset + len(agents) < total,
         chain="all",
     )
+
+
+async def list_all_agent_wallets() -> list[str]:
+    """모든 체인에 등록된 에이전트 지갑 주소 조회 (중복 제거)
+
+    백그라운드 점수 스케줄러의 추적 대상 목록으로 사용됩니다.
+    """
+    results = await asyncio.gather(
+        *(get_registry_client(chain).get_agent_wallets() for chain in Chain),
+        return_exceptions=True,
+    )
+    wallets: list[str] = []
+    for chain, result in zip(Chain, results):
+        if isinstance(result, list):
+            wallets.extend(result)
+        else:
+            logger.warning(f"[{chain}] Failed to list agent wallets: {result}")
+    return list(dict.fromkeys(wallets))
@@ -1,13 +1,33 @@
 """Etherscan API client for transaction data collection."""
 
 import asyncio
-import time
+import importlib.util
+import logging
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
 
 import httpx
 
-from ..models.transaction import Transaction, TransactionStatus
+from ..models.transaction import Transaction, TransactionBatch, TransactionStatus
+from .block_time import BlockTimeCache
+from .json_stream import EnvelopeParser
+from .rate_limiter import RateLimiter
+from .resilience import CircuitBreaker, RetryPolicy
+from .tx_stats import normalize_success_rate, tx_success_stats
+from .tx_store import (
+    INTERNAL,
+    NORMAL,
+    TransactionStore,
+    merge_transactions,
+    transaction_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 requires the optional ``h2`` package (``pip install httpx[http2]``)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class EtherscanError(Exception):
@@ -17,9 +37,15 @@ class EtherscanError(Exception):
 
 
 class EtherscanRateLimitError(EtherscanError):
-    """Raised when rate limit is exceeded."""
+    """Raised when rate limit is exceeded.
 
-    pass
+    Attributes:
+        retry_after: Seconds the server asked to wait, if it said
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class EtherscanAPIError(EtherscanError):
@@ -28,20 +54,78 @@ class EtherscanAPIError(EtherscanError):
     pass
 
 
+class EtherscanCircuitOpenError(EtherscanError):
+    """Raised when calls are suspended after sustained failures.
+
+    Attributes:
+        retry_after: Seconds until the circuit lets a probe through
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _EndOfWindow(Exception):
+    """Raised by a row parser to stop reading a streamed response."""
+
+
+# Parses one raw result row; returns None to discard it
+RowParser = Callable[[dict], Any]
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class TransactionPage:
+    """One page of a paginated transaction walk.
+
+    Attributes:
+        transactions: New rows on this page (boundary duplicates removed)
+        last_page: True when the walk is exhausted after this page
+        truncated: True when the walk stopped at the max-rows safety cap
+    """
+
+    transactions: List[Transaction]
+    last_page: bool
+    truncated: bool = False
+
+
 class EtherscanClient:
-    """Etherscan API client with rate limiting (5 calls/sec).
+    """Etherscan API client with rate limiting (5 calls/sec per key).
 
     This client provides methods to fetch transaction data from Etherscan
     and calculate success rates for AI agent scoring.
 
     Attributes:
         BASE_URL: Etherscan API V2 base URL
-        RATE_LIMIT: Maximum calls per second (5 for free tier)
+        RATE_LIMIT: Maximum calls per RATE_WINDOW per key (5 for free tier)
         RATE_WINDOW: Time window for rate limiting in seconds
 
+    Calls are paced by a token-bucket ``RateLimiter``. Pass a shared
+    limiter to spread calls over a pool of API keys, coordinate several
+    worker processes, or let interactive calls preempt batch jobs.
+
+    Transient failures (rate limits, timeouts, connection errors, HTTP 429
+    and 5xx) are retried with jittered exponential backoff, honouring
+    ``Retry-After``. Sustained failures open a circuit breaker that fails
+    calls fast; scoring then serves the stored history when a tx store is
+    configured. Outcomes are counted in ``stats``.
+
+    The client owns a long-lived ``httpx.AsyncClient`` so that consecutive
+    requests reuse warm keep-alive connections instead of paying a fresh
+    TCP+TLS handshake per call. Call ``aclose()`` (or use the client as an
+    async context manager) to release the pool.
+
     Example:
-        >>> client = EtherscanClient(api_key="YOUR_API_KEY")
-        >>> score = await client.get_agent_tx_success_score("0x123...")
+        >>> async with EtherscanClient(api_key="YOUR_API_KEY") as client:
+        ...     score = await client.get_agent_tx_success_score("0x123...")
         >>> print(f"Success rate: {score['success_rate']:.2f}%")
     """
 
@@ -56,77 +140,225 @@ class EtherscanClient:
         "base": 8453,
         "base-sepolia": 84532,
     }
+    TESTNETS = frozenset({"sepolia", "base-sepolia"})
+
+    # Pagination: Etherscan returns at most 10,000 rows per query window
+    PAGE_SIZE = 10000
+    MAX_ROWS = 100_000  # safety cap per address and transaction kind
+    LATEST_BLOCK = 99999999
 
-    def __init__(self, api_key: str, chain: str = "ethereum", timeout: float = 30.0):
+    # Connection pool defaults
+    MAX_CONNECTIONS = 20
+    MAX_KEEPALIVE_CONNECTIONS = 10
+    KEEPALIVE_EXPIRY = 30.0  # seconds
+
+    def __init__(
+        self,
+        api_key: str,
+        chain: str = "ethereum",
+        timeout: float = 30.0,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None,
+        tx_store: Optional[TransactionStore] = None,
+        history_days: Optional[int] = None,
+        max_rows: Optional[int] = MAX_ROWS,
+        block_times: Optional[BlockTimeCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
         """Initialize Etherscan client.
 
         Args:
             api_key: Etherscan API key
             chain: Chain name (ethereum, sepolia, base, base-sepolia)
             timeout: Request timeout in seconds
+            max_connections: Maximum number of pooled connections
+            max_keepalive_connections: Maximum idle keep-alive connections
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Enable HTTP/2 (default: enabled when ``h2`` is installed)
+            tx_store: Optional local transaction store; when set, histories
+                are synced incrementally from a per-address block cursor
+            history_days: Days of history the tx store must cover, when
+                longer than the scoring window (e.g. for the daily metrics
+                rollup); older blocks are backfilled on the next sync
+            max_rows: Safety cap on rows fetched per address and
+                transaction kind (None for no cap)
+            block_times: Timestamp to block cache used to resolve scoring
+                windows to a start block (may be shared between clients)
+            rate_limiter: Token-bucket limiter handing out API keys
+                (default: ``api_key`` alone at RATE_LIMIT calls/sec)
+            retry_policy: Backoff for transient failures
+            circuit_breaker: Breaker guarding the API (default: opens after
+                5 consecutive transient failures for 30 seconds)
         """
         self.api_key = api_key
         self.chain = chain
         self.chain_id = self.CHAIN_IDS.get(chain, 1)
         self.timeout = timeout
-        self._last_call_times: List[float] = []
-        self._lock = asyncio.Lock()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else (http2 and HTTP2_AVAILABLE)
+        self.tx_store = tx_store
+        self.history_days = history_days
+        self.max_rows = max_rows
+        # An empty cache is falsy (it has a length), so test for None
+        self.block_times = block_times if block_times is not None else BlockTimeCache()
+        self.rate_limiter = rate_limiter or RateLimiter(
+            [api_key], rate=self.RATE_LIMIT / self.RATE_WINDOW
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.stats: Counter = Counter()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "EtherscanClient":
+        return self
 
-    async def _rate_limit(self) -> None:
-        """Enforce rate limiting using sliding window.
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
-        Ensures no more than RATE_LIMIT calls are made within RATE_WINDOW seconds.
-        Automatically waits if limit would be exceeded.
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client (lazy initialization).
+
+        The pool is created on first use so that it binds to the running
+        event loop, and is recreated transparently after ``aclose()``.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its connection pool."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    async def _rate_limit(self) -> str:
+        """Wait for the rate limiter and return the API key to use.
+
+        Calls run in the current task's priority lane (see
+        ``rate_limiter.request_priority``).
         """
-        async with self._lock:
-            current_time = time.monotonic()
-
-            # Remove timestamps outside the sliding window
-            self._last_call_times = [
-                t
-                for t in self._last_call_times
-                if current_time - t < self.RATE_WINDOW
-            ]
-
-            # If at limit, wait until oldest call expires
-            if len(self._last_call_times) >= self.RATE_LIMIT:
-                oldest_call = min(self._last_call_times)
-                wait_time = self.RATE_WINDOW - (current_time - oldest_call)
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    # Recalculate after sleep
-                    current_time = time.monotonic()
-                    self._last_call_times = [
-                        t
-                        for t in self._last_call_times
-                        if current_time - t < self.RATE_WINDOW
-                    ]
-
-            # Record this call
-            self._last_call_times.append(time.monotonic())
-
-    async def _make_request(self, params: dict) -> dict:
-        """Make an API request with rate limiting.
+        return await self.rate_limiter.acquire()
+
+    async def _make_request(
+        self, params: dict, row_parser: Optional[RowParser] = None
+    ) -> dict:
+        """Make an API request with rate limiting, retries and circuit breaking.
 
         Args:
             params: API parameters
+            row_parser: Parse ``result`` rows while the body streams in
+                (see ``_request_once``)
 
         Returns:
             API response data
 
         Raises:
             EtherscanAPIError: If API returns an error
-            EtherscanRateLimitError: If rate limit is exceeded on API side
+            EtherscanRateLimitError: If rate limit is still exceeded after retries
+            EtherscanCircuitOpenError: If calls are suspended by the breaker
         """
-        await self._rate_limit()
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow_request():
+                self.stats["circuit_rejected"] += 1
+                raise EtherscanCircuitOpenError(
+                    "Etherscan calls suspended after repeated failures",
+                    retry_after=self.circuit_breaker.retry_after,
+                )
+
+            try:
+                data = await self._request_once(dict(params), row_parser)
+            except Exception as e:
+                if not self._is_transient(e):
+                    # The API answered; the failure is about this request
+                    self.circuit_breaker.record_success()
+                    self.stats["requests_failed"] += 1
+                    raise
+
+                if self.circuit_breaker.record_failure():
+                    self.stats["circuit_opened"] += 1
+                    logger.warning(f"Etherscan circuit opened after failure: {e}")
+                attempt += 1
+                if attempt >= self.retry_policy.max_attempts:
+                    self.stats["retries_exhausted"] += 1
+                    raise
+
+                delay = self.retry_policy.delay(attempt - 1, self._retry_hint(e))
+                self.stats["retries"] += 1
+                logger.info(
+                    f"Retrying Etherscan {params.get('action')} in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.retry_policy.max_attempts}): {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.circuit_breaker.record_success()
+            self.stats["requests_succeeded"] += 1
+            if attempt:
+                self.stats["recovered_after_retry"] += 1
+            return data
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Return True for failures worth retrying."""
+        if isinstance(error, EtherscanRateLimitError):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return isinstance(error, httpx.TransportError)
+
+    @staticmethod
+    def _retry_hint(error: Exception) -> Optional[float]:
+        """Return the server's requested wait for a failure, if any."""
+        if isinstance(error, httpx.HTTPStatusError):
+            return _retry_after(error.response)
+        return getattr(error, "retry_after", None)
+
+    async def _request_once(
+        self, params: dict, row_parser: Optional[RowParser] = None
+    ) -> dict:
+        """Make a single rate-limited API request.
 
-        params["apikey"] = self.api_key
+        With a ``row_parser`` the body is streamed and each row of the
+        ``result`` array is parsed as soon as it arrives; the raw document
+        and row dicts are never held in full. A parser returns None to drop
+        a row, or raises ``_EndOfWindow`` to stop reading the body.
+
+        Args:
+            params: API parameters
+            row_parser: Optional per-row parser for list endpoints
+
+        Returns:
+            API response data (``result`` holds parsed rows when streamed)
+
+        Raises:
+            EtherscanAPIError: If API returns an error
+            EtherscanRateLimitError: If rate limit is exceeded on API side
+        """
+        params["apikey"] = await self._rate_limit()
         params["chainid"] = self.chain_id  # V2 API requires chainid
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        client = self._get_client()
+        if row_parser is None:
             response = await client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+            self._check_response(response)
             data = response.json()
+        else:
+            async with client.stream("GET", self.BASE_URL, params=params) as response:
+                self._check_response(response)
+                data = await self._read_rows(response, row_parser)
 
         # Handle API errors
         if data.get("status") == "0":
@@ -148,6 +380,72 @@ class EtherscanClient:
 
         return data
 
+    @staticmethod
+    def _check_response(response: httpx.Response) -> None:
+        """Raise for HTTP-level failures."""
+        if response.status_code == 429:
+            raise EtherscanRateLimitError(
+                "Rate limit exceeded: HTTP 429", retry_after=_retry_after(response)
+            )
+        response.raise_for_status()
+
+    async def _read_rows(self, response: httpx.Response, row_parser: RowParser) -> dict:
+        """Parse a streamed response body row by row.
+
+        Returns:
+            The envelope fields, with ``result`` replaced by the parsed rows
+            when it is an array
+        """
+        parser = EnvelopeParser()
+        parsed: List[Any] = []
+        try:
+            try:
+                async for text in response.aiter_text():
+                    for row in parser.feed(text):
+                        item = row_parser(row)
+                        if item is not None:
+                            parsed.append(item)
+                for row in parser.close():
+                    item = row_parser(row)
+                    if item is not None:
+                        parsed.append(item)
+            except _EndOfWindow:
+                # Leaving the stream unread closes its connection
+                self.stats["streams_stopped_early"] += 1
+        except ValueError as e:
+            raise EtherscanAPIError(f"Malformed response: {e}") from e
+
+        self.stats["rows_streamed"] += parser.rows
+        data = dict(parser.fields)
+        if parser.has_array:
+            data["result"] = parsed
+        return data
+
+    def _row_parser(
+        self,
+        is_internal: bool = False,
+        since_timestamp: Optional[int] = None,
+        sort: str = "desc",
+    ) -> RowParser:
+        """Build a row parser that drops rows before ``since_timestamp``.
+
+        Rows arrive in ``sort`` order, so in a descending listing the first
+        out-of-window row ends the window and the rest of the body is not
+        read.
+        """
+
+        def parse(tx_data: dict) -> Optional[Transaction]:
+            if (
+                since_timestamp is not None
+                and int(tx_data.get("timeStamp", "0")) < since_timestamp
+            ):
+                if sort == "desc":
+                    raise _EndOfWindow
+                return None
+            return self._parse_transaction(tx_data, is_internal=is_internal)
+
+        return parse
+
     def _parse_transaction(self, tx_data: dict, is_internal: bool = False) -> Transaction:
         """Parse raw transaction data into Transaction object.
 
@@ -191,6 +489,8 @@ class EtherscanClient:
             timestamp=int(tx_data.get("timeStamp", "0")),
             block_number=int(tx_data.get("blockNumber", "0")),
             method_id=method_id,
+            # Internal calls of one parent share its hash
+            trace_id=tx_data.get("traceId", "") if is_internal else "",
         )
 
     async def get_transactions(
@@ -201,6 +501,7 @@ class EtherscanClient:
         page: int = 1,
         offset: int = 100,
         sort: str = "desc",
+        since_timestamp: Optional[int] = None,
     ) -> List[Transaction]:
         """Fetch normal transactions for an address.
 
@@ -211,6 +512,8 @@ class EtherscanClient:
             page: Page number for pagination
             offset: Number of transactions per page (max 10000)
             sort: Sort order ('asc' or 'desc')
+            since_timestamp: Drop rows older than this while parsing (with
+                'desc', stop reading at the first one)
 
         Returns:
             List of Transaction objects
@@ -229,13 +532,15 @@ class EtherscanClient:
             "sort": sort,
         }
 
-        data = await self._make_request(params)
+        data = await self._make_request(
+            params, row_parser=self._row_parser(False, since_timestamp, sort)
+        )
         result = data.get("result", [])
 
         if not isinstance(result, list):
             return []
 
-        return [self._parse_transaction(tx) for tx in result]
+        return result
 
     async def get_internal_transactions(
         self,
@@ -245,6 +550,7 @@ class EtherscanClient:
         page: int = 1,
         offset: int = 100,
         sort: str = "desc",
+        since_timestamp: Optional[int] = None,
     ) -> List[Transaction]:
         """Fetch internal transactions for an address.
 
@@ -257,6 +563,8 @@ class EtherscanClient:
             page: Page number for pagination
             offset: Number of transactions per page (max 10000)
             sort: Sort order ('asc' or 'desc')
+            since_timestamp: Drop rows older than this while parsing (with
+                'desc', stop reading at the first one)
 
         Returns:
             List of Transaction objects
@@ -275,13 +583,72 @@ class EtherscanClient:
             "sort": sort,
         }
 
-        data = await self._make_request(params)
+        data = await self._make_request(
+            params, row_parser=self._row_parser(True, since_timestamp, sort)
+        )
         result = data.get("result", [])
 
         if not isinstance(result, list):
             return []
 
-        return [self._parse_transaction(tx, is_internal=True) for tx in result]
+        return result
+
+    async def get_block_by_timestamp(self, timestamp: int, closest: str = "before") -> int:
+        """Fetch the block produced closest to a timestamp.
+
+        Args:
+            timestamp: Unix timestamp (seconds)
+            closest: 'before' (last block at or before) or 'after'
+
+        Returns:
+            Block number
+
+        Raises:
+            EtherscanAPIError: If API returns an error
+        """
+        params = {
+            "module": "block",
+            "action": "getblocknobytime",
+            "timestamp": timestamp,
+            "closest": closest,
+        }
+
+        data = await self._make_request(params)
+        try:
+            return int(data.get("result"))
+        except (TypeError, ValueError):
+            raise EtherscanAPIError(f"Unexpected block number: {data.get('result')!r}")
+
+    async def resolve_start_block(self, timestamp: int) -> Optional[int]:
+        """Resolve a window cutoff to a conservative ``startblock``.
+
+        Uses the cached anchors when they are close enough, otherwise asks
+        Etherscan for the last block at or before ``timestamp`` and caches
+        the answer. The result never starts after the cutoff, so callers
+        still filter by timestamp.
+
+        Args:
+            timestamp: Window cutoff (Unix seconds)
+
+        Returns:
+            Block number to pass as ``startblock``, or None if the lookup
+            failed (callers fall back to the full history)
+        """
+        block = self.block_times.estimate(self.chain_id, timestamp)
+        if block is not None:
+            self.stats["block_lookups_cached"] += 1
+            return block
+
+        try:
+            block = await self.get_block_by_timestamp(timestamp, closest="before")
+        except (EtherscanError, httpx.HTTPError) as e:
+            self.stats["block_lookup_failures"] += 1
+            logger.warning(f"Could not resolve block for timestamp {timestamp}: {e}")
+            return None
+
+        self.stats["block_lookups"] += 1
+        self.block_times.record(self.chain_id, timestamp, block)
+        return block
 
     async def get_all_transactions(
         self,
@@ -289,68 +656,320 @@ class EtherscanClient:
         start_block: int = 0,
         end_block: int = 99999999,
         include_internal: bool = True,
+        since_timestamp: Optional[int] = None,
     ) -> List[Transaction]:
         """Fetch all transactions (normal + internal) for an address.
 
+        Normal and internal transactions are requested concurrently (each
+        request still passes through the rate limiter) and merged in linear
+        time, since Etherscan returns both lists already sorted.
+
         Args:
             address: Ethereum address (0x...)
             start_block: Starting block number
             end_block: Ending block number
             include_internal: Whether to include internal transactions
+            since_timestamp: Skip rows older than this (Unix seconds) while
+                parsing, and stop each walk once it passes them
 
         Returns:
             Combined list of Transaction objects, sorted by timestamp
         """
-        # Fetch normal transactions
-        normal_txs = await self.get_transactions(
-            address=address,
-            start_block=start_block,
-            end_block=end_block,
-            offset=10000,
+        kinds = [NORMAL, INTERNAL] if include_internal else [NORMAL]
+        tx_lists = await asyncio.gather(
+            *(
+                self._collect_transactions(
+                    address, kind, start_block, end_block, since_timestamp
+                )
+                for kind in kinds
+            )
         )
 
-        if not include_internal:
-            return normal_txs
+        # Merge the newest-first lists
+        return merge_transactions(*tx_lists)
 
-        # Fetch internal transactions
-        internal_txs = await self.get_internal_transactions(
-            address=address,
+    async def _collect_transactions(
+        self,
+        address: str,
+        kind: str,
+        start_block: int,
+        end_block: int,
+        since_timestamp: Optional[int] = None,
+    ) -> List[Transaction]:
+        """Collect every page of one transaction kind, newest first."""
+        txs: List[Transaction] = []
+        async for page in self.iter_transaction_pages(
+            address,
+            kind,
             start_block=start_block,
             end_block=end_block,
-            offset=10000,
-        )
+            sort="desc",
+            since_timestamp=since_timestamp,
+        ):
+            txs.extend(page.transactions)
+        return txs
+
+    async def iter_transactions(
+        self,
+        address: str,
+        kind: str = NORMAL,
+        start_block: int = 0,
+        end_block: int = LATEST_BLOCK,
+        sort: str = "desc",
+    ) -> AsyncIterator[Transaction]:
+        """Iterate over every transaction in a block range, page by page.
 
-        # Combine and sort by timestamp (newest first)
-        all_txs = normal_txs + internal_txs
-        all_txs.sort(key=lambda tx: tx.timestamp, reverse=True)
+        Transactions are yielded as each page arrives. See
+        ``iter_transaction_pages`` for how the 10,000-row cap is handled.
 
-        return all_txs
+        Args:
+            address: Ethereum address (0x...)
+            kind: "normal" or "internal"
+            start_block: Starting block number
+            end_block: Ending block number
+            sort: Sort order ('asc' or 'desc')
 
-    def calculate_success_rate(self, transactions: List[Transaction]) -> float:
-        """Calculate transaction success rate.
+        Yields:
+            Transaction objects in the requested order
+        """
+        async for page in self.iter_transaction_pages(
+            address, kind, start_block=start_block, end_block=end_block, sort=sort
+        ):
+            for tx in page.transactions:
+                yield tx
+
+    async def iter_transaction_pages(
+        self,
+        address: str,
+        kind: str = NORMAL,
+        start_block: int = 0,
+        end_block: int = LATEST_BLOCK,
+        sort: str = "desc",
+        page_size: int = PAGE_SIZE,
+        since_timestamp: Optional[int] = None,
+    ) -> AsyncIterator[TransactionPage]:
+        """Walk a block range in pages, beyond Etherscan's 10,000-row cap.
+
+        Etherscan only serves the first 10,000 rows of a query window, so
+        when a page comes back full the window is narrowed to start (asc)
+        or end (desc) at the page's last block and queried again. Rows of
+        that boundary block already seen are dropped. The walk stops after
+        ``max_rows`` rows and reports it via ``TransactionPage.truncated``.
 
         Args:
-            transactions: List of Transaction objects
+            address: Ethereum address (0x...)
+            kind: "normal" or "internal"
+            start_block: Starting block number
+            end_block: Ending block number
+            sort: Sort order ('asc' or 'desc')
+            page_size: Rows per request (max 10,000)
+            since_timestamp: Newest-first walks only: end the walk at the
+                first row older than this, without parsing the rest of
+                that response
 
-        Returns:
-            Success rate as percentage (0-100)
+        Yields:
+            TransactionPage objects in walk order
         """
-        if not transactions:
-            return 0.0
+        fetch = (
+            self.get_internal_transactions if kind == INTERNAL else self.get_transactions
+        )
+        page_size = min(page_size, self.PAGE_SIZE)
+        ascending = sort == "asc"
+        if since_timestamp is not None and ascending:
+            raise ValueError("since_timestamp requires a descending walk")
+        # A short page then also means the window ended
+        window = {} if since_timestamp is None else {"since_timestamp": since_timestamp}
+        boundary_keys: set = set()
+        rows = 0
+        pages = 0
+
+        while start_block <= end_block:
+            page = await fetch(
+                address=address,
+                start_block=start_block,
+                end_block=end_block,
+                offset=page_size,
+                sort=sort,
+                **window,
+            )
+            pages += 1
+            self.stats["pages_fetched"] += 1
+            if page:
+                # Every row is a free timestamp -> block anchor
+                self.block_times.record(self.chain_id, page[0].timestamp, page[0].block_number)
+                self.block_times.record(self.chain_id, page[-1].timestamp, page[-1].block_number)
+
+            fresh = page
+            if boundary_keys:
+                fresh = [tx for tx in page if transaction_key(tx) not in boundary_keys]
+
+            truncated = False
+            if self.max_rows is not None and rows + len(fresh) > self.max_rows:
+                fresh = fresh[: self.max_rows - rows]
+                truncated = True
+            rows += len(fresh)
+
+            last_page = len(page) < page_size
+            yield TransactionPage(fresh, last_page=last_page or truncated, truncated=truncated)
+
+            if truncated:
+                self.stats["walks_truncated"] += 1
+                logger.warning(
+                    f"Stopped {kind} transaction walk for {address} at "
+                    f"{self.max_rows} rows after {pages} pages"
+                )
+                break
+            if last_page:
+                break
+
+            boundary = page[-1].block_number
+            if boundary == page[0].block_number:
+                # A single block holds a full page; it cannot be split further
+                logger.warning(
+                    f"Block {boundary} holds more than {page_size} {kind} "
+                    f"transactions for {address}; skipping the remainder"
+                )
+                boundary_keys = set()
+                if ascending:
+                    start_block = boundary + 1
+                else:
+                    end_block = boundary - 1
+                continue
+
+            boundary_keys = {
+                transaction_key(tx) for tx in page if tx.block_number == boundary
+            }
+            if ascending:
+                start_block = boundary
+            else:
+                end_block = boundary
+
+        if pages > 1:
+            self.stats["paginated_walks"] += 1
+            logger.info(f"Fetched {rows} {kind} transactions for {address} in {pages} pages")
 
-        # Only count non-pending transactions
-        completed_txs = [
-            tx for tx in transactions if tx.status != TransactionStatus.PENDING
-        ]
+    async def sync_transactions(
+        self,
+        address: str,
+        include_internal: bool = True,
+        start_block: Optional[int] = 0,
+    ) -> Dict[str, int]:
+        """Incrementally sync an address's history into the tx store.
 
-        if not completed_txs:
-            return 0.0
+        For each transaction kind only blocks after the stored cursor are
+        requested (``startblock=cursor+1``); the first sync fetches from
+        ``start_block``. If a later sync asks for an earlier ``start_block``
+        than the stored history covers, the missing blocks are backfilled.
+        Normal and internal histories sync concurrently.
 
-        success_count = sum(
-            1 for tx in completed_txs if tx.status == TransactionStatus.SUCCESS
+        Args:
+            address: Ethereum address (0x...)
+            include_internal: Whether to sync internal transactions too
+            start_block: Oldest block the stored history must cover (None
+                keeps the stored range; a first sync then starts at block 0)
+
+        Returns:
+            Number of newly stored transactions per kind
+
+        Raises:
+            ValueError: If the client has no tx store
+        """
+        if self.tx_store is None:
+            raise ValueError("sync_transactions requires a tx_store")
+
+        kinds = [NORMAL, INTERNAL] if include_internal else [NORMAL]
+        counts = await asyncio.gather(
+            *(self._sync_kind(address.lower(), kind, start_block) for kind in kinds)
         )
+        return dict(zip(kinds, counts))
+
+    async def _sync_kind(self, address: str, kind: str, start_block: Optional[int]) -> int:
+        """Fetch and store one kind of transactions outside its synced range."""
+        cursor = await self.tx_store.get_cursor(self.chain_id, address, kind)
+        if cursor is None:
+            start_block = start_block or 0
+            return await self._sync_forward(
+                address, kind, start_block, first_block=start_block
+            )
+
+        syncs = [self._sync_forward(address, kind, cursor + 1)]
+        first_block = await self.tx_store.get_first_block(self.chain_id, address, kind)
+        if start_block is not None and first_block is not None and start_block < first_block:
+            syncs.append(
+                self._sync_backfill(address, kind, start_block, first_block - 1, cursor)
+            )
+        return sum(await asyncio.gather(*syncs))
+
+    async def _sync_forward(
+        self,
+        address: str,
+        kind: str,
+        start_block: int,
+        first_block: Optional[int] = None,
+    ) -> int:
+        """Store blocks from ``start_block`` onwards, advancing the cursor."""
+        stored = 0
+
+        # Walk oldest first so the cursor only covers fully stored blocks
+        async for page in self.iter_transaction_pages(
+            address, kind, start_block=start_block, sort="asc"
+        ):
+            txs = page.transactions
+            new_cursor = max((tx.block_number for tx in txs), default=start_block - 1)
+            if txs and not (page.last_page and not page.truncated):
+                # The last block seen may continue on the next page
+                new_cursor -= 1
+            stored += await self.tx_store.save_transactions(
+                self.chain_id,
+                address,
+                kind,
+                txs,
+                cursor=max(new_cursor, 0),
+                first_block=first_block,
+            )
+        return stored
+
+    async def _sync_backfill(
+        self,
+        address: str,
+        kind: str,
+        start_block: int,
+        end_block: int,
+        cursor: int,
+    ) -> int:
+        """Store blocks before the synced range, lowering its first block."""
+        stored = 0
+
+        # Walk newest first so the first block only covers fully stored blocks
+        async for page in self.iter_transaction_pages(
+            address, kind, start_block=start_block, end_block=end_block, sort="desc"
+        ):
+            txs = page.transactions
+            if page.last_page and not page.truncated:
+                first_block = start_block
+            elif txs:
+                # The oldest block seen may continue on the next page
+                first_block = min(tx.block_number for tx in txs) + 1
+            else:
+                break
+            stored += await self.tx_store.save_transactions(
+                self.chain_id, address, kind, txs, cursor=cursor, first_block=first_block
+            )
+        return stored
+
+    def calculate_success_rate(
+        self, transactions: Union[List[Transaction], TransactionBatch]
+    ) -> float:
+        """Calculate transaction success rate.
 
-        return (success_count / len(completed_txs)) * 100
+        Args:
+            transactions: List of Transaction objects or a TransactionBatch
+
+        Returns:
+            Success rate as percentage (0-100)
+        """
+        # Pending transactions are excluded from the rate
+        return tx_success_stats(transactions).success_rate
 
     def _normalize_score(self, success_rate: float) -> int:
         """Normalize success rate to a score (0-100).
@@ -367,18 +986,8 @@ class EtherscanClient:
         Returns:
             Normalized score (0-100)
         """
-        if success_rate >= 99:
-            return 100
-        elif success_rate >= 95:
-            return int(95 + (success_rate - 95) * 1.0)
-        elif success_rate >= 90:
-            return int(85 + (success_rate - 90) * 2.0)
-        elif success_rate >= 80:
-            return int(65 + (success_rate - 80) * 2.0)
-        elif success_rate >= 50:
-            return int(30 + (success_rate - 50) * 1.17)
-        else:
-            return int(success_rate * 0.6)
+        # Curve table shared with TxSuccessStats.score (tx_stats.SCORE_CURVE)
+        return normalize_success_rate(success_rate)
 
     async def get_agent_tx_success_score(
         self,
@@ -389,7 +998,13 @@ class EtherscanClient:
         """Calculate agent's txSuccess score.
 
         Fetches transactions from the last N days and calculates
-        success rate and normalized score.
+        success rate and normalized score. The window cutoff is resolved
+        to a start block first, so only in-window blocks are requested.
+        With a tx store configured the history is synced incrementally
+        (back to ``history_days`` if that is longer) and the window is read
+        locally; if the sync fails (e.g. the circuit
+        breaker is open) the stored history is scored and the result is
+        flagged ``"stale": True``.
 
         Args:
             address: Ethereum address (0x...)
@@ -410,41 +1025,64 @@ class EtherscanClient:
                 "analyzed_at": "2026-01-29T12:00:00Z"
             }
         """
-        # Fetch all transactions
-        all_txs = await self.get_all_transactions(
-            address=address,
-            include_internal=include_internal,
-        )
-
-        # Filter by time period
         cutoff_timestamp = int(
             (datetime.now(timezone.utc).timestamp()) - (days * 24 * 60 * 60)
         )
-        recent_txs = [tx for tx in all_txs if tx.timestamp >= cutoff_timestamp]
 
-        # Count by status
-        successful_txs = sum(
-            1 for tx in recent_txs if tx.status == TransactionStatus.SUCCESS
-        )
-        failed_txs = sum(
-            1 for tx in recent_txs if tx.status == TransactionStatus.FAILED
-        )
-        pending_txs = sum(
-            1 for tx in recent_txs if tx.status == TransactionStatus.PENDING
-        )
-
-        # Calculate rates
-        success_rate = self.calculate_success_rate(recent_txs)
-        score = self._normalize_score(success_rate)
-
-        return {
+        start_block = await self.resolve_start_block(cutoff_timestamp)
+        stale = False
+        window_start = None  # rows still to trim by timestamp
+
+        if self.tx_store is not None:
+            sync_start_block = start_block
+            if self.history_days and self.history_days > days:
+                sync_start_block = await self.resolve_start_block(
+                    cutoff_timestamp - (self.history_days - days) * 24 * 60 * 60
+                )
+            # Incremental sync, then read the window from the local history
+            try:
+                await self.sync_transactions(
+                    address, include_internal=include_internal, start_block=sync_start_block
+                )
+            except (EtherscanError, httpx.HTTPError) as e:
+                cursor = await self.tx_store.get_cursor(self.chain_id, address.lower(), NORMAL)
+                if cursor is None:
+                    raise
+                stale = True
+                self.stats["stale_served"] += 1
+                logger.warning(f"Serving stored history for {address} after sync failure: {e}")
+            transactions = await self.tx_store.get_batch(
+                self.chain_id,
+                address,
+                since_timestamp=cutoff_timestamp,
+                kinds=[NORMAL, INTERNAL] if include_internal else [NORMAL],
+            )
+        else:
+            # Fetch the window's blocks; the start block is conservative,
+            # so out-of-window rows are also dropped while parsing (and by
+            # timestamp below, for fetchers that do not filter)
+            transactions = await self.get_all_transactions(
+                address=address,
+                start_block=start_block or 0,
+                include_internal=include_internal,
+                since_timestamp=cutoff_timestamp,
+            )
+            window_start = cutoff_timestamp
+
+        # Windowed counts, success rate and score from the columns
+        stats = tx_success_stats(transactions, since=window_start)
+
+        result = {
             "address": address.lower(),
-            "total_txs": len(recent_txs),
-            "successful_txs": successful_txs,
-            "failed_txs": failed_txs,
-            "pending_txs": pending_txs,
-            "success_rate": round(success_rate, 2),
-            "score": score,
+            "total_txs": stats.total,
+            "successful_txs": stats.successful,
+            "failed_txs": stats.failed,
+            "pending_txs": stats.pending,
+            "success_rate": round(stats.success_rate, 2),
+            "score": stats.score,
             "period_days": days,
             "analyzed_at": datetime.now(timezone.utc).isoformat(),
         }
+        if stale:
+            result["stale"] = True
+        return result
@@ -0,0 +1,194 @@
+"""Incremental parsing of Etherscan JSON responses.
+
+Etherscan list endpoints wrap one large array in a small envelope::
+
+    {"status": "1", "message": "OK", "result": [{...}, {...}, ...]}
+
+``EnvelopeParser`` is fed the body as it arrives and returns each element
+of the ``result`` array as soon as it is complete, so neither the whole
+document nor the whole list of row dicts is held in memory. The other
+top-level fields (and ``result`` itself when it is not an array, e.g. an
+error message) are collected in ``fields``.
+
+Example:
+    >>> parser = EnvelopeParser()
+    >>> async for text in response.aiter_text():
+    ...     for row in parser.feed(text):
+    ...         handle(row)
+    >>> parser.close()
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_INCOMPLETE = object()
+
+# Parser states
+_START = 0  # expecting "{"
+_KEY = 1  # expecting a key or "}"
+_COLON = 2
+_VALUE = 3
+_FIRST_ITEM = 4  # just after "[": an element or "]"
+_ITEM = 5
+_ITEM_END = 6  # expecting "," or "]"
+_FIELD_END = 7  # expecting "," or "}"
+_DONE = 8
+
+
+class EnvelopeParser:
+    """Push parser for a JSON object holding one streamed array.
+
+    Args:
+        array_key: Top-level key whose array elements are streamed
+        max_pending: Largest unparsed text (characters) kept while waiting
+            for an element to complete; larger means the body is invalid
+
+    Attributes:
+        fields: Top-level fields other than the streamed array
+        has_array: True once ``array_key`` was found holding an array
+        rows: Number of array elements returned so far
+    """
+
+    MAX_PENDING = 16 * 1024 * 1024
+
+    def __init__(self, array_key: str = "result", max_pending: int = MAX_PENDING):
+        self.array_key = array_key
+        self.max_pending = max_pending
+        self.fields: Dict[str, Any] = {}
+        self.has_array = False
+        self.rows = 0
+        self._buffer = ""
+        self._state = _START
+        self._key = ""
+
+    @property
+    def done(self) -> bool:
+        """True once the closing brace of the envelope was parsed."""
+        return self._state == _DONE
+
+    def feed(self, text: str) -> List[Any]:
+        """Add body text and return the array elements it completed.
+
+        Raises:
+            ValueError: If the body is not a valid envelope
+        """
+        self._buffer += text
+        rows: List[Any] = []
+        pos = self._parse(rows, final=False)
+        self._buffer = self._buffer[pos:]
+        if len(self._buffer) > self.max_pending:
+            raise ValueError(
+                f"No complete JSON value in {len(self._buffer)} buffered characters"
+            )
+        self.rows += len(rows)
+        return rows
+
+    def close(self) -> List[Any]:
+        """Finish parsing once the body has been fully received.
+
+        Returns:
+            Array elements completed by the end of the body
+
+        Raises:
+            ValueError: If the envelope is incomplete or invalid
+        """
+        rows: List[Any] = []
+        pos = self._parse(rows, final=True)
+        self._buffer = self._buffer[pos:]
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON response")
+        self.rows += len(rows)
+        return rows
+
+    def _decode(self, pos: int, final: bool) -> Tuple[Any, int]:
+        """Decode one value at ``pos``, or return _INCOMPLETE to wait."""
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError(f"Invalid JSON at offset {pos}")
+            return _INCOMPLETE, pos
+        # A number (or literal) ending the buffer may continue in the next chunk
+        if end == len(self._buffer) and not final and not isinstance(value, (str, dict, list)):
+            return _INCOMPLETE, pos
+        return value, end
+
+    def _expect(self, pos: int, char: str) -> int:
+        if self._buffer[pos] != char:
+            raise ValueError(
+                f"Expected {char!r} at offset {pos}, got {self._buffer[pos]!r}"
+            )
+        return pos + 1
+
+    def _parse(self, rows: List[Any], final: bool) -> int:
+        """Consume as much of the buffer as possible; return the new offset."""
+        buffer = self._buffer
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                return pos
+            state = self._state
+            char = buffer[pos]
+
+            if state == _START:
+                pos = self._expect(pos, "{")
+                self._state = _KEY
+            elif state == _KEY:
+                if char == "}":
+                    pos += 1
+                    self._state = _DONE
+                    continue
+                key, end = self._decode(pos, final)
+                if key is _INCOMPLETE:
+                    return pos
+                if not isinstance(key, str):
+                    raise ValueError(f"Expected a key at offset {pos}")
+                self._key, pos = key, end
+                self._state = _COLON
+            elif state == _COLON:
+                pos = self._expect(pos, ":")
+                self._state = _VALUE
+            elif state == _VALUE:
+                if self._key == self.array_key and char == "[":
+                    pos += 1
+                    self.has_array = True
+                    self._state = _FIRST_ITEM
+                    continue
+                value, end = self._decode(pos, final)
+                if value is _INCOMPLETE:
+                    return pos
+                self.fields[self._key], pos = value, end
+                self._state = _FIELD_END
+            elif state == _FIRST_ITEM:
+                if char == "]":
+                    pos += 1
+                    self._state = _FIELD_END
+                else:
+                    self._state = _ITEM
+            elif state == _ITEM:
+                value, end = self._decode(pos, final)
+                if value is _INCOMPLETE:
+                    return pos
+                rows.append(value)
+                pos = end
+                self._state = _ITEM_END
+            elif state == _ITEM_END:
+                if char == "]":
+                    self._state = _FIELD_END
+                else:
+                    self._expect(pos, ",")
+                    self._state = _ITEM
+                pos += 1
+            elif state == _FIELD_END:
+                if char == "}":
+                    self._state = _DONE
+                else:
+                    self._expect(pos, ",")
+                    self._state = _KEY
+                pos += 1
+            else:
+                raise ValueError(f"Unexpected data after the JSON object at offset {pos}")
@@ -0,0 +1,193 @@
+"""Multi-chain transaction success source.
+
+Agents often operate on several chains at once. ``MultiChainTxSource``
+holds one ``EtherscanClient`` per chain (all on the Etherscan V2 API) and
+scores an agent on every chain concurrently, so latency is that of the
+slowest chain rather than the sum. The clients share one rate limiter
+(the V2 API key budget is per key, not per chain), one transaction store
+(histories are keyed by chain ID) and one block-time cache.
+
+Example:
+    >>> source = MultiChainTxSource.from_api_key("YOUR_API_KEY", ["ethereum", "base"])
+    >>> result = await source.get_agent_tx_success_score("0x123...")
+    >>> result["breakdown"]["base"]["success_rate"]
+    97.5
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Mapping, Optional
+
+from .block_time import BlockTimeCache
+from .etherscan import EtherscanClient
+from .rate_limiter import RateLimiter
+from .tx_stats import TxSuccessStats
+from .tx_store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+
+class MultiChainTxSource:
+    """Transaction success source aggregating an agent across chains.
+
+    Exposes the same ``get_agent_tx_success_score`` as ``EtherscanClient``,
+    so it can be passed to ``ScoreCalculator`` in its place.
+
+    Args:
+        clients: Etherscan clients keyed by chain name
+    """
+
+    def __init__(self, clients: Mapping[str, EtherscanClient]):
+        if not clients:
+            raise ValueError("MultiChainTxSource requires at least one chain")
+        self.clients: Dict[str, EtherscanClient] = dict(clients)
+
+    @classmethod
+    def from_api_key(
+        cls,
+        api_key: str,
+        chains: Optional[Iterable[str]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        tx_store: Optional[TransactionStore] = None,
+        block_times: Optional[BlockTimeCache] = None,
+        **client_kwargs,
+    ) -> "MultiChainTxSource":
+        """Create one client per chain sharing a limiter, store and cache.
+
+        Args:
+            api_key: Etherscan API key (V2 keys work on every chain)
+            chains: Chain names (default: every chain in ``CHAIN_IDS``)
+            rate_limiter: Shared limiter (default: ``api_key`` alone at
+                ``EtherscanClient.RATE_LIMIT`` calls/sec)
+            tx_store: Shared transaction store
+            block_times: Shared block-time cache
+            **client_kwargs: Passed to every ``EtherscanClient``
+
+        Raises:
+            ValueError: If a chain is not in ``EtherscanClient.CHAIN_IDS``
+        """
+        chains = list(chains or EtherscanClient.CHAIN_IDS)
+        unknown = [chain for chain in chains if chain not in EtherscanClient.CHAIN_IDS]
+        if unknown:
+            raise ValueError(f"Unknown chains: {', '.join(unknown)}")
+
+        rate_limiter = rate_limiter or RateLimiter(
+            [api_key], rate=EtherscanClient.RATE_LIMIT / EtherscanClient.RATE_WINDOW
+        )
+        if block_times is None:
+            block_times = BlockTimeCache()
+        return cls(
+            {
+                chain: EtherscanClient(
+                    api_key,
+                    chain=chain,
+                    tx_store=tx_store,
+                    rate_limiter=rate_limiter,
+                    block_times=block_times,
+                    **client_kwargs,
+                )
+                for chain in chains
+            }
+        )
+
+    @property
+    def chains(self) -> list:
+        """Configured chain names."""
+        return list(self.clients)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Key pool of the first chain's client (shared by ``from_api_key``)."""
+        return next(iter(self.clients.values())).rate_limiter
+
+    async def __aenter__(self) -> "MultiChainTxSource":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close every client's connection pool."""
+        await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+
+    async def get_agent_tx_success_score(
+        self,
+        address: str,
+        days: int = 30,
+        include_internal: bool = True,
+    ) -> dict:
+        """Calculate an agent's txSuccess score across all chains.
+
+        Every chain is scored concurrently. Counts are summed across
+        chains and the combined success rate and score are computed from
+        the totals; each chain's own result is kept under ``breakdown``.
+        A chain that fails is listed under ``errors`` and the result is
+        flagged ``partial``; if every chain fails the first error is raised.
+
+        Args:
+            address: Ethereum address (0x...)
+            days: Number of days to analyze (default: 30)
+            include_internal: Whether to include internal transactions
+
+        Returns:
+            Dictionary with the same keys as
+            ``EtherscanClient.get_agent_tx_success_score`` plus:
+            {
+                "chains": ["ethereum", "base"],
+                "breakdown": {"ethereum": {...}, "base": {...}},
+                "errors": {"sepolia": "..."},  # only when partial
+                "partial": True,  # only when a chain failed
+            }
+        """
+        chains = list(self.clients)
+        results = await asyncio.gather(
+            *(
+                self.clients[chain].get_agent_tx_success_score(
+                    address, days=days, include_internal=include_internal
+                )
+                for chain in chains
+            ),
+            return_exceptions=True,
+        )
+
+        breakdown: Dict[str, dict] = {}
+        errors: Dict[str, Exception] = {}
+        for chain, result in zip(chains, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                logger.warning(f"txSuccess failed on {chain} for {address}: {result}")
+                errors[chain] = result
+            else:
+                breakdown[chain] = result
+
+        if not breakdown:
+            raise next(iter(errors.values()))
+
+        stats = TxSuccessStats(
+            successful=sum(r["successful_txs"] for r in breakdown.values()),
+            failed=sum(r["failed_txs"] for r in breakdown.values()),
+            pending=sum(r["pending_txs"] for r in breakdown.values()),
+        )
+        result = {
+            "address": address.lower(),
+            "total_txs": stats.total,
+            "successful_txs": stats.successful,
+            "failed_txs": stats.failed,
+            "pending_txs": stats.pending,
+            "success_rate": round(stats.success_rate, 2),
+            "score": stats.score,
+            "period_days": days,
+            "analyzed_at": datetime.now(timezone.utc).isoformat(),
+            "chains": chains,
+            "breakdown": breakdown,
+        }
+        if errors:
+            result["partial"] = True
+            result["errors"] = {
+                chain: str(error) or type(error).__name__ for chain, error in errors.items()
+            }
+        if any(r.get("stale") for r in breakdown.values()):
+            result["stale"] = True
+        return result
@@ -0,0 +1,314 @@
+"""Token-bucket rate limiting for Etherscan API keys.
+
+Each API key owns a token bucket refilled at its per-key rate (calls per
+second) up to a burst capacity. A request takes one token from the key
+with the most budget left, so a pool of keys is used evenly and its
+combined rate is available to the client.
+
+Bucket state lives in a pluggable backend:
+- InMemoryBucketBackend: process-local
+- SQLiteBucketBackend: a small SQLite file shared by every process on the
+  host (e.g. several uvicorn workers), so the real per-key limit is not
+  overshot when the API runs multi-process
+
+Requests run in one of two priority lanes. Interactive calls (the
+default) preempt batch calls waiting in the same process, and batch calls
+never take a key's last ``batch_reserve`` tokens, which keeps headroom
+for interactive calls in other processes too.
+
+Example:
+    >>> limiter = RateLimiter({"KEY_A": 5, "KEY_B": 5})
+    >>> api_key = await limiter.acquire()
+    >>> with request_priority(Priority.BATCH):
+    ...     api_key = await limiter.acquire()
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+
+class Priority(IntEnum):
+    """Request priority lanes (lower value is served first)."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    """Return the priority lane of the current task."""
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed code (and tasks it starts) in a priority lane."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class KeyBudget:
+    """Token bucket parameters for one API key.
+
+    Attributes:
+        rate: Tokens added per second
+        capacity: Maximum tokens (burst size)
+    """
+
+    rate: float
+    capacity: float
+
+
+# key -> (tokens, updated_at)
+BucketState = Dict[str, Tuple[float, float]]
+
+
+def take_token(
+    state: BucketState,
+    budgets: Mapping[str, KeyBudget],
+    min_tokens: float,
+    now: float,
+) -> Tuple[Optional[str], float]:
+    """Refill buckets and take one token from the fullest eligible key.
+
+    ``state`` is updated in place; keys missing from it start full.
+
+    Args:
+        state: Current bucket levels
+        budgets: Per-key bucket parameters
+        min_tokens: Tokens a bucket must hold to be used (1 plus reserve)
+        now: Current time, in the clock the state was written with
+
+    Returns:
+        (key, 0.0) when a token was taken, otherwise (None, seconds until
+        the first key becomes eligible)
+    """
+    best_key = None
+    best_tokens = 0.0
+    wait = float("inf")
+
+    for key, budget in budgets.items():
+        tokens, updated = state.get(key, (budget.capacity, now))
+        tokens = min(budget.capacity, tokens + max(0.0, now - updated) * budget.rate)
+        state[key] = (tokens, now)
+
+        # A reserve never blocks a key whose whole burst is below it
+        needed = min(min_tokens, budget.capacity)
+        if tokens >= needed:
+            if best_key is None or tokens > best_tokens:
+                best_key, best_tokens = key, tokens
+        else:
+            wait = min(wait, (needed - tokens) / budget.rate)
+
+    if best_key is None:
+        return None, wait
+
+    state[best_key] = (best_tokens - 1.0, now)
+    return best_key, 0.0
+
+
+class BucketBackend(ABC):
+    """Storage interface for token bucket state."""
+
+    @abstractmethod
+    async def take(
+        self, budgets: Mapping[str, KeyBudget], min_tokens: float
+    ) -> Tuple[Optional[str], float]:
+        """Atomically take one token; see ``take_token``."""
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+
+
+class InMemoryBucketBackend(BucketBackend):
+    """Process-local bucket state."""
+
+    def __init__(self):
+        self._state: BucketState = {}
+
+    async def take(
+        self, budgets: Mapping[str, KeyBudget], min_tokens: float
+    ) -> Tuple[Optional[str], float]:
+        # No await between read and write, so this is atomic on the loop
+        return take_token(self._state, budgets, min_tokens, time.monotonic())
+
+
+class SQLiteBucketBackend(BucketBackend):
+    """Bucket state shared across processes through a SQLite file.
+
+    Every take runs in a ``BEGIN IMMEDIATE`` transaction, so concurrent
+    processes serialize on the file lock. Timestamps use wall-clock time
+    because monotonic clocks are not comparable between processes. Keys
+    are stored as hashes, never in clear text.
+
+    Args:
+        path: Database file path (parent directories are created)
+        busy_timeout: Seconds to wait for a lock held by another process
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            key_hash TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: Union[str, Path], busy_timeout: float = 5.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (lazy initialization)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=self.busy_timeout,
+                check_same_thread=False,
+                isolation_level=None,  # explicit transactions below
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def _take(
+        self, budgets: Mapping[str, KeyBudget], min_tokens: float
+    ) -> Tuple[Optional[str], float]:
+        hashes = {self._hash(key): key for key in budgets}
+        with self._conn_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT key_hash, tokens, updated_at FROM rate_buckets"
+                    f" WHERE key_hash IN ({', '.join('?' * len(hashes))})",
+                    list(hashes),
+                ).fetchall()
+                state = {hashes[row[0]]: (row[1], row[2]) for row in rows}
+                result = take_token(state, budgets, min_tokens, time.time())
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?)",
+                    [
+                        (self._hash(key), tokens, updated)
+                        for key, (tokens, updated) in state.items()
+                    ],
+                )
+                conn.execute("COMMIT")
+                return result
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    async def take(
+        self, budgets: Mapping[str, KeyBudget], min_tokens: float
+    ) -> Tuple[Optional[str], float]:
+        return await asyncio.to_thread(self._take, budgets, min_tokens)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RateLimiter:
+    """Token-bucket limiter over a pool of API keys.
+
+    Args:
+        keys: API keys, either a sequence (each gets ``rate``) or a
+            mapping of key to its own calls-per-second budget
+        rate: Default calls per second per key
+        burst: Bucket capacity per key (default: one second of calls)
+        backend: Bucket state backend (default: in-process)
+        batch_reserve: Tokens per key that batch calls leave untouched
+    """
+
+    DEFAULT_RATE = 5.0
+    DEFAULT_BATCH_RESERVE = 1.0
+
+    def __init__(
+        self,
+        keys: Union[Sequence[str], Mapping[str, float]],
+        rate: float = DEFAULT_RATE,
+        burst: Optional[float] = None,
+        backend: Optional[BucketBackend] = None,
+        batch_reserve: float = DEFAULT_BATCH_RESERVE,
+    ):
+        rates = dict(keys) if isinstance(keys, Mapping) else dict.fromkeys(keys, rate)
+        if not rates:
+            raise ValueError("RateLimiter requires at least one API key")
+
+        self.budgets: Dict[str, KeyBudget] = {
+            key: KeyBudget(rate=key_rate, capacity=burst or max(1.0, key_rate))
+            for key, key_rate in rates.items()
+        }
+        self.backend = backend or InMemoryBucketBackend()
+        self.batch_reserve = batch_reserve
+        self._waiting = {priority: 0 for priority in Priority}
+
+    @property
+    def keys(self) -> Sequence[str]:
+        """API keys in the pool."""
+        return list(self.budgets)
+
+    @property
+    def total_rate(self) -> float:
+        """Combined calls per second of every key."""
+        return sum(budget.rate for budget in self.budgets.values())
+
+    async def acquire(self, priority: Optional[Priority] = None) -> str:
+        """Wait for a token and return the API key to use.
+
+        Args:
+            priority: Lane to wait in (default: the current task's lane)
+
+        Returns:
+            API key whose budget was charged
+        """
+        if priority is None:
+            priority = current_priority()
+        min_tokens = 1.0 if priority == Priority.INTERACTIVE else 1.0 + self.batch_reserve
+        idle_wait = 1.0 / self.total_rate
+
+        self._waiting[priority] += 1
+        try:
+            while True:
+                if self._preempted(priority):
+                    wait = idle_wait
+                else:
+                    key, wait = await self.backend.take(self.budgets, min_tokens)
+                    if key is not None:
+                        return key
+                await asyncio.sleep(wait)
+        finally:
+            self._waiting[priority] -= 1
+
+    def _preempted(self, priority: Priority) -> bool:
+        """True while a higher-priority caller in this process is waiting."""
+        return any(self._waiting[p] for p in Priority if p < priority)
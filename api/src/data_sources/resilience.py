@@ -0,0 +1,125 @@
+"""Retry and circuit breaker primitives for upstream API calls.
+
+``RetryPolicy`` spaces retries with capped exponential backoff and full
+jitter (a random delay between 0 and the backoff ceiling), so clients
+that failed together do not retry together. A server-provided hint such
+as ``Retry-After`` takes precedence over the computed delay.
+
+``CircuitBreaker`` stops calling an upstream that keeps failing. After
+``failure_threshold`` consecutive transient failures it opens and
+rejects calls for ``recovery_timeout`` seconds. It then lets a single
+probe through each ``recovery_timeout`` (half-open) until one succeeds
+and closes it again.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Attributes:
+        max_attempts: Total attempts per call, including the first
+        base_delay: Backoff ceiling for the first retry (seconds)
+        max_delay: Upper bound for any single delay (seconds)
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 4.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based).
+
+        Args:
+            attempt: Number of retries already made
+            retry_after: Server hint, used instead of backoff when given
+
+        Returns:
+            Delay in seconds, never more than ``max_delay``
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        recovery_timeout: Seconds the circuit stays open before a probe
+        clock: Time source (monotonic seconds)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    DEFAULT_FAILURE_THRESHOLD = 5
+    DEFAULT_RECOVERY_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the next call is allowed (0 when not open)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be made now.
+
+        In the half-open state one caller is let through as a probe and
+        the timer restarts, so a probe that never reports back only delays
+        the next one.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            self._opened_at = self._clock()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> bool:
+        """Count a transient failure.
+
+        Returns:
+            True if this failure opened (or re-opened) the circuit
+        """
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            return True
+        return False
@@ -0,0 +1,200 @@
+"""Columnar aggregation of transaction success statistics.
+
+Works on the ``timestamps`` and ``statuses`` columns of a
+``TransactionBatch`` (or columns extracted from a list of transactions)
+and produces per-status counts, success rate and the normalized
+txSuccess score in a single vectorized pass per window.
+
+NumPy is used when installed: the array-backed columns are viewed
+without copying and counted with ``bincount``. Without NumPy the same
+results are computed with the pure-Python fallback.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..models.transaction import STATUS_CODES, Transaction, TransactionBatch, TransactionStatus
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# txSuccess curve: first (threshold, base, slope) with rate >= threshold
+# gives score = base + (rate - threshold) * slope
+SCORE_CURVE: Tuple[Tuple[float, float, float], ...] = (
+    (99.0, 100.0, 0.0),
+    (95.0, 95.0, 1.0),
+    (90.0, 85.0, 2.0),
+    (80.0, 65.0, 2.0),
+    (50.0, 30.0, 1.17),
+    (0.0, 0.0, 0.6),
+)
+
+_STATUS_COUNT = len(STATUS_CODES)
+_SUCCESS = STATUS_CODES[TransactionStatus.SUCCESS]
+_FAILED = STATUS_CODES[TransactionStatus.FAILED]
+_PENDING = STATUS_CODES[TransactionStatus.PENDING]
+
+SECONDS_PER_DAY = 86400
+
+
+def normalize_success_rate(success_rate: float) -> int:
+    """Map a success rate (0-100) to the txSuccess score (0-100)."""
+    for threshold, base, slope in SCORE_CURVE:
+        if success_rate >= threshold:
+            return int(base + (success_rate - threshold) * slope)
+    return 0
+
+
+@dataclass
+class TxSuccessStats:
+    """Transaction outcome counts for one window.
+
+    Attributes:
+        successful: Successful transactions
+        failed: Failed transactions
+        pending: Pending transactions (excluded from the success rate)
+    """
+
+    successful: int = 0
+    failed: int = 0
+    pending: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.successful + self.failed + self.pending
+
+    @property
+    def success_rate(self) -> float:
+        """Success rate (0-100) over completed transactions."""
+        completed = self.successful + self.failed
+        if not completed:
+            return 0.0
+        return (self.successful / completed) * 100
+
+    @property
+    def score(self) -> int:
+        """Normalized txSuccess score (0-100)."""
+        return normalize_success_rate(self.success_rate)
+
+
+def _columns(
+    transactions: Union[Iterable[Transaction], TransactionBatch],
+) -> Tuple[array, array]:
+    """Return (timestamps, statuses) columns."""
+    if isinstance(transactions, TransactionBatch):
+        return transactions.timestamps, transactions.statuses
+    transactions = list(transactions)
+    return (
+        array("q", [tx.timestamp for tx in transactions]),
+        array("b", [STATUS_CODES[tx.status] for tx in transactions]),
+    )
+
+
+def _stats(counts: Sequence[int]) -> TxSuccessStats:
+    return TxSuccessStats(
+        successful=int(counts[_SUCCESS]),
+        failed=int(counts[_FAILED]),
+        pending=int(counts[_PENDING]),
+    )
+
+
+def _as_numpy(column: Sequence[int], dtype) -> "np.ndarray":
+    """View an ``array`` column without copying (other sequences are converted)."""
+    if isinstance(column, array):
+        return np.frombuffer(column, dtype=dtype)
+    return np.asarray(column, dtype=dtype)
+
+
+def windowed_tx_success_stats(
+    timestamps: Sequence[int],
+    statuses: Sequence[int],
+    cutoffs: Sequence[Optional[int]],
+) -> List[TxSuccessStats]:
+    """Count outcomes for several windows over the same columns.
+
+    Args:
+        timestamps: Unix timestamp per row (``array('q')`` is zero-copy)
+        statuses: ``STATUS_CODES`` code per row (``array('b')`` is zero-copy)
+        cutoffs: Window starts; rows at or after a cutoff are counted
+            (None counts every row)
+
+    Returns:
+        One TxSuccessStats per cutoff, in order
+    """
+    if NUMPY_AVAILABLE:
+        ts = _as_numpy(timestamps, np.int64)
+        st = _as_numpy(statuses, np.int8)
+        results = []
+        for cutoff in cutoffs:
+            window = st if cutoff is None else st[ts >= cutoff]
+            results.append(_stats(np.bincount(window, minlength=_STATUS_COUNT)))
+        return results
+
+    results = []
+    for cutoff in cutoffs:
+        counts = [0] * _STATUS_COUNT
+        if cutoff is None:
+            for status in statuses:
+                counts[status] += 1
+        else:
+            for timestamp, status in zip(timestamps, statuses):
+                if timestamp >= cutoff:
+                    counts[status] += 1
+        results.append(_stats(counts))
+    return results
+
+
+def tx_success_stats(
+    transactions: Union[Iterable[Transaction], TransactionBatch],
+    since: Optional[int] = None,
+) -> TxSuccessStats:
+    """Count outcomes of transactions, optionally from ``since`` onwards.
+
+    Args:
+        transactions: Transactions or a TransactionBatch (preferred; its
+            columns are used without conversion)
+        since: Window start (Unix seconds), or None for every row
+
+    Returns:
+        TxSuccessStats for the window
+    """
+    timestamps, statuses = _columns(transactions)
+    return windowed_tx_success_stats(timestamps, statuses, [since])[0]
+
+
+def daily_tx_success_stats(
+    timestamps: Sequence[int],
+    statuses: Sequence[int],
+) -> Dict[int, TxSuccessStats]:
+    """Count outcomes per UTC day.
+
+    Args:
+        timestamps: Unix timestamp per row (``array('q')`` is zero-copy)
+        statuses: ``STATUS_CODES`` code per row (``array('b')`` is zero-copy)
+
+    Returns:
+        TxSuccessStats keyed by day number (``timestamp // 86400``), for
+        days with at least one row
+    """
+    if NUMPY_AVAILABLE:
+        days = _as_numpy(timestamps, np.int64) // SECONDS_PER_DAY
+        if not len(days):
+            return {}
+        unique_days, day_index = np.unique(days, return_inverse=True)
+        counts = np.bincount(
+            day_index * _STATUS_COUNT + _as_numpy(statuses, np.int8),
+            minlength=len(unique_days) * _STATUS_COUNT,
+        ).reshape(len(unique_days), _STATUS_COUNT)
+        return {int(day): _stats(row) for day, row in zip(unique_days, counts)}
+
+    per_day: Dict[int, List[int]] = {}
+    for timestamp, status in zip(timestamps, statuses):
+        counts = per_day.setdefault(timestamp // SECONDS_PER_DAY, [0] * _STATUS_COUNT)
+        counts[status] += 1
+    return {day: _stats(counts) for day, counts in per_day.items()}
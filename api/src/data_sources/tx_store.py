@@ -0,0 +1,428 @@
+"""Local transaction store for incremental Etherscan syncs.
+
+Keeps each agent's parsed transaction history together with a per-address
+synced block range: the cursor (the last block already fetched for normal
+and internal transactions), so repeat scorings only request
+``startblock=cursor+1``, and the first block covered, so a history that
+was synced for a short window can be backfilled when a longer one is
+requested.
+
+Two implementations are provided:
+- InMemoryTransactionStore: process-local, for tests and development
+- SQLiteTransactionStore: on-disk (WAL mode), shared by API restarts and
+  multiple uvicorn workers
+"""
+
+import asyncio
+import heapq
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ..models.transaction import STATUS_BY_CODE, STATUS_CODES, Transaction, TransactionBatch
+
+logger = logging.getLogger(__name__)
+
+# Transaction kinds tracked by separate cursors
+NORMAL = "normal"
+INTERNAL = "internal"
+TX_KINDS = (NORMAL, INTERNAL)
+
+
+def merge_transactions(*tx_lists: List[Transaction]) -> List[Transaction]:
+    """Merge transaction lists that are each sorted newest first.
+
+    Args:
+        *tx_lists: Lists of Transaction objects sorted by timestamp (desc)
+
+    Returns:
+        Single list sorted by timestamp (newest first)
+    """
+    return list(heapq.merge(*tx_lists, key=lambda tx: tx.timestamp, reverse=True))
+
+
+def transaction_key(tx: Transaction) -> Tuple[str, str, str, str, int]:
+    """Identity of a transaction row.
+
+    Internal transactions share their parent's hash, so the hash alone is
+    not unique; the trace id tells apart calls with the same sender,
+    recipient and value.
+    """
+    return (tx.hash, tx.trace_id, tx.from_address, tx.to_address, tx.value)
+
+
+class TransactionStore(ABC):
+    """Storage interface for synced transaction histories.
+
+    Histories are keyed by ``(chain_id, address, kind)`` where ``kind`` is
+    ``"normal"`` or ``"internal"``. Addresses are stored lowercase.
+    """
+
+    @abstractmethod
+    async def get_cursor(self, chain_id: int, address: str, kind: str) -> Optional[int]:
+        """Return the last synced block, or None if never synced."""
+        pass
+
+    @abstractmethod
+    async def get_first_block(self, chain_id: int, address: str, kind: str) -> Optional[int]:
+        """Return the first synced block, or None if never synced."""
+        pass
+
+    @abstractmethod
+    async def save_transactions(
+        self,
+        chain_id: int,
+        address: str,
+        kind: str,
+        transactions: List[Transaction],
+        cursor: int,
+        first_block: Optional[int] = None,
+    ) -> int:
+        """Merge fetched transactions into the history and widen the synced range.
+
+        The cursor never moves backwards and the first block never moves
+        forwards. A new history without ``first_block`` covers block 0.
+
+        Returns:
+            Number of transactions that were not stored before
+        """
+        pass
+
+    @abstractmethod
+    async def get_transactions(
+        self,
+        chain_id: int,
+        address: str,
+        since_timestamp: Optional[int] = None,
+        kinds: Iterable[str] = TX_KINDS,
+    ) -> List[Transaction]:
+        """Return stored transactions (newest first), optionally windowed."""
+        pass
+
+    async def get_batch(
+        self,
+        chain_id: int,
+        address: str,
+        since_timestamp: Optional[int] = None,
+        kinds: Iterable[str] = TX_KINDS,
+    ) -> TransactionBatch:
+        """Return stored transactions (newest first) as a columnar batch."""
+        return TransactionBatch.from_transactions(
+            await self.get_transactions(chain_id, address, since_timestamp, kinds)
+        )
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemoryTransactionStore(TransactionStore):
+    """Process-local transaction store backed by sorted lists."""
+
+    def __init__(self):
+        self._histories: Dict[Tuple[int, str, str], List[Transaction]] = {}
+        self._keys: Dict[Tuple[int, str, str], Set[Tuple[str, str, str, str, int]]] = {}
+        self._cursors: Dict[Tuple[int, str, str], int] = {}
+        self._first_blocks: Dict[Tuple[int, str, str], int] = {}
+        self._lock = asyncio.Lock()
+
+    async def get_cursor(self, chain_id: int, address: str, kind: str) -> Optional[int]:
+        return self._cursors.get((chain_id, address.lower(), kind))
+
+    async def get_first_block(self, chain_id: int, address: str, kind: str) -> Optional[int]:
+        return self._first_blocks.get((chain_id, address.lower(), kind))
+
+    async def save_transactions(
+        self,
+        chain_id: int,
+        address: str,
+        kind: str,
+        transactions: List[Transaction],
+        cursor: int,
+        first_block: Optional[int] = None,
+    ) -> int:
+        key = (chain_id, address.lower(), kind)
+        async with self._lock:
+            seen = self._keys.setdefault(key, set())
+            new_txs = []
+            for tx in transactions:
+                tx_key = transaction_key(tx)
+                if tx_key not in seen:
+                    seen.add(tx_key)
+                    new_txs.append(tx)
+
+            new_txs.sort(key=lambda tx: tx.timestamp, reverse=True)
+            self._histories[key] = merge_transactions(
+                new_txs, self._histories.get(key, [])
+            )
+            self._cursors[key] = max(cursor, self._cursors.get(key, cursor))
+            current = self._first_blocks.get(key)
+            if first_block is None:
+                first_block = 0 if current is None else current
+            self._first_blocks[key] = (
+                first_block if current is None else min(first_block, current)
+            )
+            return len(new_txs)
+
+    async def get_transactions(
+        self,
+        chain_id: int,
+        address: str,
+        since_timestamp: Optional[int] = None,
+        kinds: Iterable[str] = TX_KINDS,
+    ) -> List[Transaction]:
+        address = address.lower()
+        histories = []
+        for kind in kinds:
+            history = self._histories.get((chain_id, address, kind), [])
+            if since_timestamp is not None:
+                history = [tx for tx in history if tx.timestamp >= since_timestamp]
+            histories.append(history)
+        return merge_transactions(*histories)
+
+
+class SQLiteTransactionStore(TransactionStore):
+    """On-disk transaction store backed by SQLite in WAL mode.
+
+    Rows are keyed by chain id and address with indexes on
+    ``(address, timestamp)`` and ``(address, block_number)``, so scoring
+    windows are indexed range queries. WAL mode lets several processes
+    read concurrently while one writes. Blocking SQLite calls run in a
+    worker thread to keep the event loop responsive.
+
+    Args:
+        path: Database file path (parent directories are created)
+        busy_timeout: Seconds to wait for a lock held by another process
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS transactions (
+            chain_id INTEGER NOT NULL,
+            address TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            from_address TEXT NOT NULL,
+            to_address TEXT NOT NULL,
+            value TEXT NOT NULL,
+            gas_used INTEGER NOT NULL,
+            gas_price INTEGER NOT NULL,
+            status INTEGER NOT NULL,
+            timestamp INTEGER NOT NULL,
+            block_number INTEGER NOT NULL,
+            method_id TEXT,
+            trace_id TEXT NOT NULL,
+            PRIMARY KEY (
+                chain_id, address, kind, hash, trace_id, from_address, to_address, value
+            )
+        );
+        CREATE INDEX IF NOT EXISTS idx_transactions_address_timestamp
+            ON transactions (chain_id, address, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_transactions_address_block
+            ON transactions (chain_id, address, block_number);
+        CREATE TABLE IF NOT EXISTS sync_cursors (
+            chain_id INTEGER NOT NULL,
+            address TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            last_block INTEGER NOT NULL,
+            first_block INTEGER NOT NULL,
+            PRIMARY KEY (chain_id, address, kind)
+        );
+    """
+
+    def __init__(self, path: Union[str, Path], busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (lazy initialization)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=self.busy_timeout,
+                check_same_thread=False,
+                isolation_level=None,  # explicit transactions below
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened transaction store at {self.path}")
+        return self._conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database call in a worker thread."""
+
+        def _locked():
+            with self._conn_lock:
+                return fn(self._connect(), *args)
+
+        return await asyncio.to_thread(_locked)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get_cursor(self, chain_id: int, address: str, kind: str) -> Optional[int]:
+        def _get(conn):
+            row = conn.execute(
+                "SELECT last_block FROM sync_cursors"
+                " WHERE chain_id = ? AND address = ? AND kind = ?",
+                (chain_id, address.lower(), kind),
+            ).fetchone()
+            return row[0] if row else None
+
+        return await self._run(_get)
+
+    async def get_first_block(self, chain_id: int, address: str, kind: str) -> Optional[int]:
+        def _get(conn):
+            row = conn.execute(
+                "SELECT first_block FROM sync_cursors"
+                " WHERE chain_id = ? AND address = ? AND kind = ?",
+                (chain_id, address.lower(), kind),
+            ).fetchone()
+            return row[0] if row else None
+
+        return await self._run(_get)
+
+    async def save_transactions(
+        self,
+        chain_id: int,
+        address: str,
+        kind: str,
+        transactions: List[Transaction],
+        cursor: int,
+        first_block: Optional[int] = None,
+    ) -> int:
+        address = address.lower()
+        rows = [
+            (
+                chain_id,
+                address,
+                kind,
+                tx.hash,
+                tx.from_address,
+                tx.to_address,
+                str(tx.value),
+                tx.gas_used,
+                tx.gas_price,
+                STATUS_CODES[tx.status],
+                tx.timestamp,
+                tx.block_number,
+                tx.method_id,
+                tx.trace_id,
+            )
+            for tx in transactions
+        ]
+
+        def _save(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO transactions VALUES"
+                    " (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                inserted = conn.total_changes - before
+                conn.execute(
+                    "INSERT INTO sync_cursors"
+                    " (chain_id, address, kind, last_block, first_block)"
+                    " VALUES (?, ?, ?, ?, COALESCE(?, 0))"
+                    " ON CONFLICT (chain_id, address, kind)"
+                    " DO UPDATE SET last_block = MAX(last_block, excluded.last_block),"
+                    " first_block = MIN(first_block, COALESCE(?, first_block))",
+                    (chain_id, address, kind, cursor, first_block, first_block),
+                )
+                conn.execute("COMMIT")
+                return inserted
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return await self._run(_save)
+
+    async def _select(
+        self,
+        chain_id: int,
+        address: str,
+        since_timestamp: Optional[int],
+        kinds: Iterable[str],
+    ) -> List[tuple]:
+        """Fetch stored rows (newest first) in Transaction field order."""
+        kinds = list(kinds)
+        if not kinds:
+            return []
+
+        query = (
+            "SELECT hash, from_address, to_address, value, gas_used, gas_price,"
+            " status, timestamp, block_number, method_id, trace_id FROM transactions"
+            " WHERE chain_id = ? AND address = ?"
+            f" AND kind IN ({', '.join('?' * len(kinds))})"
+        )
+        params: list = [chain_id, address.lower(), *kinds]
+        if since_timestamp is not None:
+            query += " AND timestamp >= ?"
+            params.append(since_timestamp)
+        query += " ORDER BY timestamp DESC, block_number DESC"
+
+        def _get(conn):
+            return conn.execute(query, params).fetchall()
+
+        return await self._run(_get)
+
+    async def get_transactions(
+        self,
+        chain_id: int,
+        address: str,
+        since_timestamp: Optional[int] = None,
+        kinds: Iterable[str] = TX_KINDS,
+    ) -> List[Transaction]:
+        return [
+            Transaction(
+                hash=row[0],
+                from_address=row[1],
+                to_address=row[2],
+                value=int(row[3]),
+                gas_used=row[4],
+                gas_price=row[5],
+                status=STATUS_BY_CODE[row[6]],
+                timestamp=row[7],
+                block_number=row[8],
+                method_id=row[9],
+                trace_id=row[10],
+            )
+            for row in await self._select(chain_id, address, since_timestamp, kinds)
+        ]
+
+    async def get_batch(
+        self,
+        chain_id: int,
+        address: str,
+        since_timestamp: Optional[int] = None,
+        kinds: Iterable[str] = TX_KINDS,
+    ) -> TransactionBatch:
+        # Fill the columns straight from rows, without Transaction objects
+        batch = TransactionBatch()
+        for row in await self._select(chain_id, address, since_timestamp, kinds):
+            batch.add_row(
+                row[0],
+                row[1],
+                row[2],
+                int(row[3]),
+                row[4],
+                row[5],
+                row[6],
+                row[7],
+                row[8],
+                row[9],
+                row[10],
+            )
+        return batch
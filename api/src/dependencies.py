@@ -6,9 +6,26 @@ from functools import lru_cache
 from dotenv import load_dotenv
 
 from .calculator.score_calculator import ScoreCalculator
+from .data_sources.block_time import BlockTimeCache
 from .data_sources.etherscan import EtherscanClient
+from .data_sources.multichain import MultiChainTxSource
+from .data_sources.rate_limiter import (
+    BucketBackend,
+    InMemoryBucketBackend,
+    RateLimiter,
+    SQLiteBucketBackend,
+)
+from .data_sources.tx_store import SQLiteTransactionStore, TransactionStore
 from .data_sources.x402_nodata import X402NoDataSource
 from .data_sources.erc8004_nodata import ERC8004NoDataSource
+from .data_sources.erc8004_registry import list_all_agent_wallets
+from .services.anomaly_flags import AnomalyFlagStore, SQLiteAnomalyFlagStore
+from .services.anomaly_scan import AnomalyScanJob
+from .services.anti_gaming.config_loader import ConfigWatcher
+from .services.metrics_rollup import DailyMetricsRollup
+from .services.score_cache import ScoreCache
+from .services.score_history import ScoreHistoryStore, SQLiteScoreHistoryStore
+from .services.score_scheduler import ScoreRefreshScheduler
 
 # Load .env files (check multiple locations)
 import pathlib
@@ -21,12 +38,144 @@ load_dotenv(_root_dir / "contracts" / ".env", override=True)  # contracts/.env h
 
 
 @lru_cache
-def get_etherscan_client() -> EtherscanClient:
-    """Get Etherscan client singleton."""
+def get_tx_store() -> TransactionStore:
+    """Get the local transaction store (SQLite, shared across workers)."""
+    path = os.getenv("AGENTFICO_TX_STORE_PATH", str(_api_dir / "data" / "transactions.db"))
+    return SQLiteTransactionStore(path)
+
+
+@lru_cache
+def get_score_history_store() -> ScoreHistoryStore:
+    """Get the append-only score history store (SQLite, shared across workers)."""
+    path = os.getenv(
+        "AGENTFICO_SCORE_HISTORY_PATH", str(_api_dir / "data" / "score_history.db")
+    )
+    return SQLiteScoreHistoryStore(path)
+
+
+@lru_cache
+def get_anomaly_flag_store() -> AnomalyFlagStore:
+    """Get the anomaly flag store written by the batch scan (SQLite)."""
+    path = os.getenv(
+        "AGENTFICO_ANOMALY_FLAGS_PATH", str(_api_dir / "data" / "anomaly_flags.db")
+    )
+    return SQLiteAnomalyFlagStore(path)
+
+
+@lru_cache
+def get_rate_limit_backend() -> BucketBackend:
+    """Get the rate limit state backend (SQLite, shared across workers).
+
+    Set ETHERSCAN_RATE_LIMIT_PATH to an empty string for process-local
+    buckets.
+    """
+    path = os.getenv(
+        "ETHERSCAN_RATE_LIMIT_PATH", str(_api_dir / "data" / "rate_limits.db")
+    )
+    return SQLiteBucketBackend(path) if path else InMemoryBucketBackend()
+
+
+def _parse_api_keys(value: str) -> dict:
+    """Parse ``KEY[:RATE],KEY[:RATE]`` into a key -> calls/sec mapping."""
+    keys = {}
+    for item in value.split(","):
+        key, _, rate = item.strip().partition(":")
+        if key:
+            keys[key] = float(rate) if rate else RateLimiter.DEFAULT_RATE
+    return keys
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    """Get the Etherscan API key pool rate limiter singleton."""
     # V2 API uses same key for all chains (Etherscan, Basescan, etc.)
-    api_key = os.getenv("ETHERSCAN_API_KEY") or os.getenv("BASESCAN_API_KEY", "")
-    chain = os.getenv("ETHERSCAN_CHAIN", "ethereum")
-    return EtherscanClient(api_key, chain=chain)
+    keys = _parse_api_keys(os.getenv("ETHERSCAN_API_KEYS", "")) or {
+        os.getenv("ETHERSCAN_API_KEY") or os.getenv("BASESCAN_API_KEY", ""): float(
+            os.getenv("ETHERSCAN_RATE_LIMIT", RateLimiter.DEFAULT_RATE)
+        )
+    }
+    return RateLimiter(keys, backend=get_rate_limit_backend())
+
+
+@lru_cache
+def get_block_times() -> BlockTimeCache:
+    """Get the timestamp to block cache shared by all Etherscan clients."""
+    return BlockTimeCache()
+
+
+def _etherscan_client_kwargs() -> dict:
+    """Settings shared by every Etherscan client."""
+    limiter = get_rate_limiter()
+    return dict(
+        api_key=limiter.keys[0],
+        max_connections=int(
+            os.getenv("ETHERSCAN_MAX_CONNECTIONS", EtherscanClient.MAX_CONNECTIONS)
+        ),
+        max_keepalive_connections=int(
+            os.getenv(
+                "ETHERSCAN_MAX_KEEPALIVE_CONNECTIONS",
+                EtherscanClient.MAX_KEEPALIVE_CONNECTIONS,
+            )
+        ),
+        tx_store=get_tx_store(),
+        # Keep the rollup's window synced, not just the scoring window
+        history_days=_metrics_rollup_days(),
+        rate_limiter=limiter,
+        block_times=get_block_times(),
+    )
+
+
+def _tx_chains() -> list:
+    """Chains to score on, from ETHERSCAN_CHAINS.
+
+    A comma-separated list of chain names, or "all" for every mainnet in
+    ``EtherscanClient.CHAIN_IDS``. Testnets are only used when listed by
+    name, since free testnet transactions must not raise mainnet scores.
+    When unset, the single ETHERSCAN_CHAIN (default: ethereum) is used.
+    """
+    value = os.getenv("ETHERSCAN_CHAINS")
+    if value is None:
+        return [os.getenv("ETHERSCAN_CHAIN", "ethereum")]
+    if value.strip().lower() == "all":
+        return [
+            chain for chain in EtherscanClient.CHAIN_IDS
+            if chain not in EtherscanClient.TESTNETS
+        ]
+    return [chain.strip() for chain in value.split(",") if chain.strip()]
+
+
+@lru_cache
+def get_tx_source() -> MultiChainTxSource:
+    """Get the multi-chain transaction success source singleton.
+
+    All chains share the API key pool rate limiter, the transaction store
+    and the block-time cache.
+    """
+    kwargs = _etherscan_client_kwargs()
+    return MultiChainTxSource.from_api_key(
+        kwargs.pop("api_key"), chains=_tx_chains(), **kwargs
+    )
+
+
+def _metrics_rollup_days() -> int:
+    return int(os.getenv("METRICS_ROLLUP_DAYS", DailyMetricsRollup.DEFAULT_WINDOW_DAYS))
+
+
+def _new_metrics_rollup() -> DailyMetricsRollup:
+    return DailyMetricsRollup(
+        get_tx_store(),
+        chain_ids=[client.chain_id for client in get_tx_source().clients.values()],
+        window_days=_metrics_rollup_days(),
+        max_agents=int(
+            os.getenv("METRICS_ROLLUP_MAX_AGENTS", DailyMetricsRollup.DEFAULT_MAX_AGENTS)
+        ),
+    )
+
+
+@lru_cache
+def get_metrics_rollup() -> DailyMetricsRollup:
+    """Get the daily per-agent metrics rollup over the transaction store."""
+    return _new_metrics_rollup()
 
 
 @lru_cache
@@ -54,14 +203,103 @@ def get_score_calculator() -> ScoreCalculator:
     """Get score calculator singleton.
     
     Current scoring:
-    - txSuccess: Real data from Etherscan (40%)
+    - txSuccess: Real data from Etherscan, combined across chains (40%)
     - x402Profitability: 0 (no data) - will be added when protocol is ready
     - erc8004Stability: 0 (no data) - will be added when agents register
     
     Effective score = txSuccess only until other data sources are available.
     """
     return ScoreCalculator(
-        etherscan_client=get_etherscan_client(),
+        etherscan_client=get_tx_source(),
         x402_source=get_x402_source(),
         erc8004_source=get_erc8004_source(),
+        history_store=get_score_history_store(),
+        metrics_rollup=get_metrics_rollup(),
+        anomaly_flags=get_anomaly_flag_store(),
+    )
+
+
+@lru_cache
+def get_score_cache() -> ScoreCache:
+    """Get score cache singleton (in-memory LRU with TTL)."""
+    return ScoreCache(
+        get_score_calculator(),
+        ttl=float(os.getenv("SCORE_CACHE_TTL", ScoreCache.DEFAULT_TTL)),
+        stale_ttl=float(os.getenv("SCORE_CACHE_STALE_TTL", ScoreCache.DEFAULT_STALE_TTL)),
+        max_entries=int(os.getenv("SCORE_CACHE_MAX_ENTRIES", ScoreCache.DEFAULT_MAX_ENTRIES)),
+        degraded_ttl=float(
+            os.getenv("SCORE_CACHE_DEGRADED_TTL", ScoreCache.DEFAULT_DEGRADED_TTL)
+        ),
+    )
+
+
+def score_scheduler_enabled() -> bool:
+    """Whether the lifespan starts the background score scheduler.
+
+    Off by default: every uvicorn worker runs its own lifespan, and each
+    scheduler would claim SCORE_SCHEDULER_BUDGET of the shared key pool.
+    Enable it in exactly one process.
+    """
+    return os.getenv("SCORE_SCHEDULER_ENABLED", "0").lower() not in ("0", "false", "no", "")
+
+
+@lru_cache
+def get_score_scheduler() -> ScoreRefreshScheduler:
+    """Get the background score precomputation scheduler singleton.
+
+    Tracks every ERC-8004 registered agent wallet and spends at most
+    SCORE_SCHEDULER_BUDGET (default: half) of the API key pool's rate.
+    """
+    budget_share = float(
+        os.getenv("SCORE_SCHEDULER_BUDGET", ScoreRefreshScheduler.DEFAULT_BUDGET_SHARE)
     )
+    return ScoreRefreshScheduler(
+        get_score_cache(),
+        agent_source=list_all_agent_wallets,
+        interval=float(
+            os.getenv("SCORE_SCHEDULER_INTERVAL", ScoreRefreshScheduler.DEFAULT_INTERVAL)
+        ),
+        rate_budget=get_rate_limiter().total_rate * budget_share,
+        calls_per_score=ScoreRefreshScheduler.DEFAULT_CALLS_PER_SCORE
+        * len(get_tx_source().chains),
+    )
+
+
+def anomaly_scan_enabled() -> bool:
+    """Whether the lifespan starts the batch anomaly scan.
+
+    Off by default like the score scheduler: every uvicorn worker would
+    scan the whole registry and write the same flags. Enable it in
+    exactly one process.
+    """
+    return os.getenv("ANOMALY_SCAN_ENABLED", "0").lower() not in ("0", "false", "no", "")
+
+
+@lru_cache
+def get_anomaly_scan() -> AnomalyScanJob:
+    """Get the batch anomaly scan singleton (every ERC-8004 registered agent).
+
+    The scan gets its own rollup so it does not evict the agents that
+    live scoring keeps in ``get_metrics_rollup()``.
+    """
+    return AnomalyScanJob(
+        _new_metrics_rollup(),
+        get_anomaly_flag_store(),
+        agent_source=list_all_agent_wallets,
+        interval=float(os.getenv("ANOMALY_SCAN_INTERVAL", AnomalyScanJob.DEFAULT_INTERVAL)),
+    )
+
+
+def _config_poll_interval() -> float:
+    return float(os.getenv("AG_CONFIG_POLL_INTERVAL", ConfigWatcher.DEFAULT_INTERVAL))
+
+
+def config_watch_enabled() -> bool:
+    """Whether the lifespan polls the anti-gaming config for changes."""
+    return _config_poll_interval() > 0
+
+
+@lru_cache
+def get_config_watcher() -> ConfigWatcher:
+    """Get the anti-gaming config hot-reload watcher singleton."""
+    return ConfigWatcher(interval=_config_poll_interval())
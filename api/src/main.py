@@ -1,17 +1,71 @@
 """AgentFICO API main entry point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .dependencies import (
+    anomaly_scan_enabled,
+    config_watch_enabled,
+    get_anomaly_flag_store,
+    get_anomaly_scan,
+    get_config_watcher,
+    get_rate_limit_backend,
+    get_score_history_store,
+    get_score_scheduler,
+    get_tx_source,
+    get_tx_store,
+    score_scheduler_enabled,
+)
 from .routes import contract_router, score_router
 from .routes.agents import router as agents_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan.
+
+    Starts the background score scheduler, anomaly scan and config
+    watcher, then stops them and releases pooled connections and stores
+    on shutdown.
+    """
+    scheduler = get_score_scheduler() if score_scheduler_enabled() else None
+    if scheduler is not None:
+        scheduler.start()
+    anomaly_scan = get_anomaly_scan() if anomaly_scan_enabled() else None
+    if anomaly_scan is not None:
+        anomaly_scan.start()
+    config_watcher = get_config_watcher() if config_watch_enabled() else None
+    if config_watcher is not None:
+        config_watcher.start()
+    yield
+    if config_watcher is not None:
+        await config_watcher.stop()
+    if anomaly_scan is not None:
+        await anomaly_scan.stop()
+    if scheduler is not None:
+        await scheduler.stop()
+    # Release only what was created; building a singleton now could raise
+    if get_tx_source.cache_info().currsize:
+        await get_tx_source().aclose()
+    for get_store in (
+        get_tx_store,
+        get_score_history_store,
+        get_anomaly_flag_store,
+        get_rate_limit_backend,
+    ):
+        if get_store.cache_info().currsize:
+            get_store().close()
+
+
 app = FastAPI(
     title="AgentFICO API",
     description="AI Agent Credit Scoring System",
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS configuration
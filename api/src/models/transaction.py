@@ -1,8 +1,10 @@
 """Transaction model for blockchain transactions."""
 
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from array import array
 from enum import Enum
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 
 class TransactionStatus(Enum):
@@ -13,10 +15,38 @@ class TransactionStatus(Enum):
     PENDING = "pending"
 
 
-@dataclass
+# Byte codes for the status column of batches and the transaction store.
+# They follow Etherscan's ``txreceipt_status`` (0 failed, 1 success).
+STATUS_CODES: Dict[TransactionStatus, int] = {
+    TransactionStatus.FAILED: 0,
+    TransactionStatus.SUCCESS: 1,
+    TransactionStatus.PENDING: 2,
+}
+STATUS_BY_CODE = tuple(sorted(STATUS_CODES, key=STATUS_CODES.__getitem__))
+
+
+@lru_cache(maxsize=65536)
+def intern_address(address: str) -> str:
+    """Lowercase and intern an address.
+
+    Histories repeat the same few addresses (the agent and its
+    counterparties) on every row, so interning stores each once and the
+    cache skips re-lowercasing strings already seen.
+    """
+    return sys.intern(address.lower())
+
+
+def _lower(value: str) -> str:
+    """Lowercase without allocating when the value already is."""
+    return value if value.islower() or not value else value.lower()
+
+
 class Transaction:
     """Represents a blockchain transaction.
 
+    Slotted (no per-instance ``__dict__``) with interned addresses, since
+    large histories hold tens of thousands of rows.
+
     Attributes:
         hash: Transaction hash (0x...)
         from_address: Sender address
@@ -28,25 +58,64 @@ class Transaction:
         timestamp: Unix timestamp of block
         block_number: Block number containing this transaction
         method_id: Contract method ID (first 4 bytes of input data)
+        trace_id: Etherscan ``traceId`` of an internal transaction (empty
+            for normal transactions)
     """
 
-    hash: str
-    from_address: str
-    to_address: str
-    value: int  # wei
-    gas_used: int
-    gas_price: int
-    status: TransactionStatus
-    timestamp: int
-    block_number: int
-    method_id: Optional[str] = None
-
-    def __post_init__(self):
-        """Validate and normalize addresses."""
-        self.from_address = self.from_address.lower()
-        if self.to_address:
-            self.to_address = self.to_address.lower()
-        self.hash = self.hash.lower()
+    __slots__ = (
+        "hash",
+        "from_address",
+        "to_address",
+        "value",  # wei
+        "gas_used",
+        "gas_price",
+        "status",
+        "timestamp",
+        "block_number",
+        "method_id",
+        "trace_id",
+    )
+
+    def __init__(
+        self,
+        hash: str,
+        from_address: str,
+        to_address: str,
+        value: int,
+        gas_used: int,
+        gas_price: int,
+        status: TransactionStatus,
+        timestamp: int,
+        block_number: int,
+        method_id: Optional[str] = None,
+        trace_id: str = "",
+    ):
+        # Normalize addresses and hash to lowercase
+        self.hash = _lower(hash)
+        self.from_address = intern_address(from_address)
+        self.to_address = intern_address(to_address) if to_address else to_address
+        self.value = value
+        self.gas_used = gas_used
+        self.gas_price = gas_price
+        self.status = status
+        self.timestamp = timestamp
+        self.block_number = block_number
+        self.method_id = sys.intern(method_id) if method_id else method_id
+        self.trace_id = trace_id
+
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Transaction({fields})"
 
     @property
     def gas_cost_wei(self) -> int:
@@ -66,3 +135,185 @@ class Transaction:
     def is_contract_interaction(self) -> bool:
         """Check if this is a contract interaction (has method_id)."""
         return self.method_id is not None and self.method_id != "0x"
+
+
+class TransactionBatch:
+    """Columnar, array-backed container of transactions.
+
+    Numeric columns live in typed ``array`` buffers (8 bytes per value,
+    1 byte per status), hashes are packed as 32 raw bytes each, and
+    addresses are interned strings, so a batch costs a small fraction of
+    the equivalent list of ``Transaction`` objects. Values stay Python
+    ints because wei amounts overflow 64 bits. Hashes that are not 32-byte
+    hex (e.g. test fixtures) are kept aside as strings.
+
+    Rows can be read back as ``Transaction`` objects, but scoring code
+    should use the column helpers (``status_counts``, ``since``) directly.
+
+    Example:
+        >>> batch = TransactionBatch.from_transactions(txs)
+        >>> batch.status_counts()[TransactionStatus.SUCCESS]
+        142
+    """
+
+    __slots__ = (
+        "timestamps",
+        "block_numbers",
+        "gas_used",
+        "gas_prices",
+        "statuses",
+        "values",
+        "from_addresses",
+        "to_addresses",
+        "method_ids",
+        "trace_ids",
+        "_hashes",
+        "_odd_hashes",
+    )
+
+    HASH_SIZE = 32
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.block_numbers = array("q")
+        self.gas_used = array("q")
+        self.gas_prices = array("q")
+        self.statuses = array("b")
+        self.values: List[int] = []
+        self.from_addresses: List[str] = []
+        self.to_addresses: List[str] = []
+        self.method_ids: List[Optional[str]] = []
+        self.trace_ids: List[str] = []
+        self._hashes = bytearray()
+        self._odd_hashes: Dict[int, str] = {}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionBatch":
+        """Build a batch from Transaction objects."""
+        batch = cls()
+        for tx in transactions:
+            batch.append(tx)
+        return batch
+
+    def append(self, tx: Transaction) -> None:
+        """Add one transaction as a row."""
+        self.add_row(
+            tx.hash,
+            tx.from_address,
+            tx.to_address,
+            tx.value,
+            tx.gas_used,
+            tx.gas_price,
+            STATUS_CODES[tx.status],
+            tx.timestamp,
+            tx.block_number,
+            tx.method_id,
+            tx.trace_id,
+        )
+
+    def add_row(
+        self,
+        hash: str,
+        from_address: str,
+        to_address: str,
+        value: int,
+        gas_used: int,
+        gas_price: int,
+        status: int,
+        timestamp: int,
+        block_number: int,
+        method_id: Optional[str] = None,
+        trace_id: str = "",
+    ) -> None:
+        """Add one row from raw column values (no Transaction allocated)."""
+        self._append_hash(hash)
+        self.from_addresses.append(intern_address(from_address))
+        self.to_addresses.append(intern_address(to_address) if to_address else to_address)
+        self.values.append(value)
+        self.gas_used.append(gas_used)
+        self.gas_prices.append(gas_price)
+        self.statuses.append(status)
+        self.timestamps.append(timestamp)
+        self.block_numbers.append(block_number)
+        self.method_ids.append(sys.intern(method_id) if method_id else method_id)
+        self.trace_ids.append(trace_id)
+
+    def _append_hash(self, tx_hash: str) -> None:
+        try:
+            raw = bytes.fromhex(tx_hash[2:] if tx_hash[:2] in ("0x", "0X") else tx_hash)
+        except ValueError:
+            raw = b""
+        if len(raw) != self.HASH_SIZE:
+            self._odd_hashes[len(self.timestamps)] = _lower(tx_hash)
+            raw = bytes(self.HASH_SIZE)
+        self._hashes += raw
+
+    def hash_at(self, index: int) -> str:
+        """Return the hash of a row as a 0x-prefixed hex string."""
+        odd = self._odd_hashes.get(index)
+        if odd is not None:
+            return odd
+        start = index * self.HASH_SIZE
+        return "0x" + self._hashes[start:start + self.HASH_SIZE].hex()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: int) -> Transaction:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TransactionBatch index out of range")
+        return Transaction(
+            hash=self.hash_at(index),
+            from_address=self.from_addresses[index],
+            to_address=self.to_addresses[index],
+            value=self.values[index],
+            gas_used=self.gas_used[index],
+            gas_price=self.gas_prices[index],
+            status=STATUS_BY_CODE[self.statuses[index]],
+            timestamp=self.timestamps[index],
+            block_number=self.block_numbers[index],
+            method_id=self.method_ids[index],
+            trace_id=self.trace_ids[index],
+        )
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def status_counts(self) -> Dict[TransactionStatus, int]:
+        """Count rows per status."""
+        return {status: self.statuses.count(code) for status, code in STATUS_CODES.items()}
+
+    def since(self, timestamp: int) -> "TransactionBatch":
+        """Return the rows at or after ``timestamp`` as a new batch."""
+        batch = TransactionBatch()
+        for index, row_timestamp in enumerate(self.timestamps):
+            if row_timestamp >= timestamp:
+                batch.add_row(
+                    self.hash_at(index),
+                    self.from_addresses[index],
+                    self.to_addresses[index],
+                    self.values[index],
+                    self.gas_used[index],
+                    self.gas_prices[index],
+                    self.statuses[index],
+                    row_timestamp,
+                    self.block_numbers[index],
+                    self.method_ids[index],
+                    self.trace_ids[index],
+                )
+        return batch
+
+
+def count_statuses(
+    transactions: Union[Iterable[Transaction], TransactionBatch],
+) -> Dict[TransactionStatus, int]:
+    """Count transactions per status, using the status column of a batch."""
+    if isinstance(transactions, TransactionBatch):
+        return transactions.status_counts()
+    counts = dict.fromkeys(TransactionStatus, 0)
+    for tx in transactions:
+        counts[tx.status] += 1
+    return counts
@@ -1,23 +1,37 @@
 """Score API endpoints."""
 
+import json
+import math
 import re
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
 
-from ..dependencies import get_score_calculator
+from ..calculator.score_calculator import AgentFICOScore
+from ..data_sources.etherscan import EtherscanCircuitOpenError, EtherscanRateLimitError
+from ..dependencies import get_score_cache, get_score_history_store
 from ..schemas.score import (
+    BatchScoreError,
+    BatchScoreRequest,
+    BatchScoreResponse,
     ErrorResponse,
     ScoreHistoryItem,
     ScoreHistoryResponse,
     ScoreResponse,
+    StreamBatchScoreRequest,
 )
 
 router = APIRouter(prefix="/score", tags=["score"])
 
+ADDRESS_PATTERN = re.compile(r"^0x[a-fA-F0-9]{40}$")
+
 
 def validate_address(address: str) -> str:
     """Validate Ethereum address format."""
-    if not re.match(r"^0x[a-fA-F0-9]{40}$", address):
+    if not ADDRESS_PATTERN.match(address):
         raise HTTPException(
             status_code=400,
             detail={"error": "invalid_address", "message": f"Invalid Ethereum address: {address}"},
@@ -25,12 +39,40 @@ def validate_address(address: str) -> str:
     return address.lower()
 
 
+def upstream_unavailable(error: Exception) -> HTTPException:
+    """Map an exhausted rate limit or open circuit to a 503 with Retry-After."""
+    retry_after = getattr(error, "retry_after", None)
+    headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after else None
+    return HTTPException(
+        status_code=503,
+        detail={"error": "upstream_unavailable", "message": str(error)},
+        headers=headers,
+    )
+
+
+def to_score_response(result: AgentFICOScore) -> ScoreResponse:
+    """Convert a calculator result into the API response model."""
+    return ScoreResponse(
+        agent_address=result.agent_address,
+        overall=result.overall,
+        tx_success=result.tx_success,
+        x402_profitability=result.x402_profitability,
+        erc8004_stability=result.erc8004_stability,
+        risk_level=result.risk_level.value,
+        risk_level_name=result.risk_level.name.lower(),
+        confidence=result.confidence,
+        timestamp=result.timestamp,
+        breakdown=result.breakdown,
+    )
+
+
 @router.get(
     "/{agent_address}",
     response_model=ScoreResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid address"},
         404: {"model": ErrorResponse, "description": "Agent not registered"},
+        503: {"model": ErrorResponse, "description": "Etherscan temporarily unavailable"},
     },
     summary="Get agent score",
     description="Get the AgentFICO score for an agent.",
@@ -54,22 +96,13 @@ async def get_score(
     """
     address = validate_address(agent_address)
 
-    calculator = get_score_calculator()
+    cache = get_score_cache()
 
     try:
-        result = await calculator.calculate_score(address, days)
-        return ScoreResponse(
-            agent_address=result.agent_address,
-            overall=result.overall,
-            tx_success=result.tx_success,
-            x402_profitability=result.x402_profitability,
-            erc8004_stability=result.erc8004_stability,
-            risk_level=result.risk_level.value,
-            risk_level_name=result.risk_level.name.lower(),
-            confidence=result.confidence,
-            timestamp=result.timestamp,
-            breakdown=result.breakdown,
-        )
+        result = await cache.get_score(address, days)
+        return to_score_response(result)
+    except (EtherscanRateLimitError, EtherscanCircuitOpenError) as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -77,41 +110,239 @@ async def get_score(
         )
 
 
+@router.post(
+    "/batch",
+    response_model=BatchScoreResponse,
+    summary="Get scores for many agents",
+    description="Score a list of agents in one request with bounded concurrency.",
+)
+async def get_batch_scores(request: BatchScoreRequest) -> BatchScoreResponse:
+    """Score a list of agents in one request.
+
+    - **addresses**: Agent Ethereum addresses (max 500, duplicates ignored)
+    - **days**: Analysis period (default 30 days, max 365 days)
+
+    Invalid addresses and per-agent calculation failures are reported in
+    `errors` without failing the whole batch.
+    """
+    errors = []
+    valid = []
+    for address in dict.fromkeys(a.lower() for a in request.addresses):
+        if ADDRESS_PATTERN.match(address):
+            valid.append(address)
+        else:
+            errors.append(
+                BatchScoreError(
+                    agent_address=address,
+                    error="invalid_address",
+                    message=f"Invalid Ethereum address: {address}",
+                )
+            )
+
+    batch = await get_score_cache().get_scores(valid, request.days)
+
+    results = [
+        to_score_response(batch.scores[address])
+        for address in valid
+        if address in batch.scores
+    ]
+    errors.extend(
+        BatchScoreError(agent_address=address, error="calculation_error", message=message)
+        for address, message in batch.errors.items()
+    )
+
+    return BatchScoreResponse(
+        results=results,
+        errors=errors,
+        total_count=len(results) + len(errors),
+        success_count=len(results),
+        error_count=len(errors),
+    )
+
+
+@router.post(
+    "/batch/stream",
+    response_class=StreamingResponse,
+    summary="Stream scores for many agents",
+    description="Score a list of agents, streaming NDJSON lines as each completes.",
+)
+async def stream_batch_scores(request: StreamBatchScoreRequest) -> StreamingResponse:
+    """Score a list of agents, streaming results as NDJSON.
+
+    - **addresses**: Agent Ethereum addresses (max 10,000, duplicates ignored)
+    - **days**: Analysis period (default 30 days, max 365 days)
+
+    Each line is a JSON object with a `type` field:
+    - `result`: a score (same fields as `GET /score/{address}`), in completion order
+    - `error`: `agentAddress`, `error` and `message` for a failed address
+    - `summary`: final line with counts and elapsed time
+    """
+    return StreamingResponse(
+        _stream_batch_lines(request.addresses, request.days),
+        media_type="application/x-ndjson",
+    )
+
+
+def _ndjson(payload: dict) -> str:
+    return json.dumps(payload, separators=(",", ":")) + "\n"
+
+
+async def _stream_batch_lines(addresses: List[str], days: int) -> AsyncIterator[str]:
+    """Yield NDJSON lines for a streaming batch score job."""
+    started = time.monotonic()
+    success_count = 0
+    error_count = 0
+
+    valid = []
+    for address in dict.fromkeys(a.lower() for a in addresses):
+        if ADDRESS_PATTERN.match(address):
+            valid.append(address)
+            continue
+        error_count += 1
+        yield _ndjson({
+            "type": "error",
+            "agentAddress": address,
+            "error": "invalid_address",
+            "message": f"Invalid Ethereum address: {address}",
+        })
+
+    async for address, score, error in get_score_cache().iter_scores(valid, days):
+        if error is None:
+            success_count += 1
+            yield _ndjson({
+                "type": "result",
+                **to_score_response(score).model_dump(mode="json", by_alias=True),
+            })
+        else:
+            error_count += 1
+            yield _ndjson({
+                "type": "error",
+                "agentAddress": address,
+                "error": "calculation_error",
+                "message": error,
+            })
+
+    yield _ndjson({
+        "type": "summary",
+        "totalCount": success_count + error_count,
+        "successCount": success_count,
+        "errorCount": error_count,
+        "elapsedMs": int((time.monotonic() - started) * 1000),
+    })
+
+
 @router.get(
     "/{agent_address}/history",
     response_model=ScoreHistoryResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid address or cursor"},
+        503: {"model": ErrorResponse, "description": "Etherscan temporarily unavailable"},
+    },
     summary="Get score history",
-    description="Get the score history for an agent.",
+    description="Get the score history for an agent, newest first.",
 )
 async def get_score_history(
     agent_address: str = Path(..., description="Agent Ethereum address"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to retrieve"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    since: Optional[datetime] = Query(None, description="Oldest record time (ISO 8601)"),
+    until: Optional[datetime] = Query(None, description="Newest record time (ISO 8601)"),
+    days: Optional[int] = Query(None, ge=1, le=365, description="Analysis period filter"),
+    resolution: Optional[int] = Query(
+        None, ge=60, description="Downsample into buckets of this many seconds"
+    ),
 ) -> ScoreHistoryResponse:
     """Get the score history for an agent.
 
-    Currently returns mock data.
-    In production, this will query the database for historical records.
+    Every computed score is recorded. Pages are read newest first; pass
+    `nextCursor` back as `cursor` for the next page; `totalCount` is only
+    returned on the first page. With `resolution`,
+    records are averaged into time buckets (useful for long ranges).
+    An agent without history is scored first, so the response always
+    holds at least the current score.
     """
     address = validate_address(agent_address)
+    store = get_score_history_store()
 
-    # TODO: Implement actual DB query
-    # Currently returns only the current score
-    calculator = get_score_calculator()
-    result = await calculator.calculate_score(address)
+    async def _page():
+        try:
+            return await store.get_history(
+                address,
+                limit=limit,
+                cursor=cursor,
+                since=_to_ms(since),
+                until=_to_ms(until),
+                days=days,
+                resolution=resolution,
+                # Counting scans the whole range: only on the first page
+                include_total=cursor is None,
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={"error": "invalid_cursor", "message": f"Invalid cursor: {cursor}"},
+            )
 
-    return ScoreHistoryResponse(
-        agent_address=address,
-        history=[
+    page = await _page()
+    current = None
+    if not page.records and cursor is None and since is None and until is None:
+        # First request for this agent: computing the score records it
+        try:
+            current = await get_score_cache().get_score(address, days or 30)
+        except (EtherscanRateLimitError, EtherscanCircuitOpenError) as e:
+            raise upstream_unavailable(e)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail={"error": "calculation_error", "message": str(e)},
+            )
+        page = await _page()
+
+    if page.records:
+        history = [
+            ScoreHistoryItem(
+                overall=record.overall,
+                risk_level=record.risk_level,
+                timestamp=datetime.fromtimestamp(record.recorded_at / 1000, timezone.utc),
+                tx_success=record.tx_success,
+                confidence=record.confidence,
+                samples=record.samples,
+            )
+            for record in page.records
+        ]
+        total_count = page.total_count
+    elif current is not None:
+        # Served from the cache (computed before history was recorded)
+        history = [
             ScoreHistoryItem(
-                overall=result.overall,
-                risk_level=result.risk_level.value,
-                timestamp=result.timestamp,
+                overall=current.overall,
+                risk_level=current.risk_level.value,
+                timestamp=current.timestamp,
+                tx_success=current.tx_success,
+                confidence=current.confidence,
             )
-        ],
-        total_count=1,
+        ]
+        total_count = 1
+    else:
+        history, total_count = [], page.total_count
+
+    return ScoreHistoryResponse(
+        agent_address=address,
+        history=history,
+        total_count=total_count,
+        next_cursor=page.next_cursor,
     )
 
 
+def _to_ms(value: Optional[datetime]) -> Optional[int]:
+    """Convert a query datetime (naive means UTC) to Unix milliseconds."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
 @router.post(
     "/{agent_address}/refresh",
     response_model=ScoreResponse,
@@ -124,23 +355,12 @@ async def refresh_score(
 ) -> ScoreResponse:
     """Force recalculate the agent's score.
 
-    Bypasses the cache and recalculates with fresh data.
+    Evicts the cached score and recalculates with fresh data.
     """
     address = validate_address(agent_address)
 
-    calculator = get_score_calculator()
-
-    # TODO: Add cache invalidation logic
-    result = await calculator.calculate_score(address, days)
-    return ScoreResponse(
-        agent_address=result.agent_address,
-        overall=result.overall,
-        tx_success=result.tx_success,
-        x402_profitability=result.x402_profitability,
-        erc8004_stability=result.erc8004_stability,
-        risk_level=result.risk_level.value,
-        risk_level_name=result.risk_level.name.lower(),
-        confidence=result.confidence,
-        timestamp=result.timestamp,
-        breakdown=result.breakdown,
-    )
+    try:
+        result = await get_score_cache().refresh(address, days)
+    except (EtherscanRateLimitError, EtherscanCircuitOpenError) as e:
+        raise upstream_unavailable(e)
+    return to_score_response(result)
@@ -1,17 +1,25 @@
 """API schemas for request/response models."""
 
 from .score import (
+    BatchScoreError,
+    BatchScoreRequest,
+    BatchScoreResponse,
     ErrorResponse,
     RiskLevelEnum,
     ScoreHistoryItem,
     ScoreHistoryResponse,
     ScoreResponse,
+    StreamBatchScoreRequest,
 )
 
 __all__ = [
+    "BatchScoreError",
+    "BatchScoreRequest",
+    "BatchScoreResponse",
     "ErrorResponse",
     "RiskLevelEnum",
     "ScoreHistoryItem",
     "ScoreHistoryResponse",
     "ScoreResponse",
+    "StreamBatchScoreRequest",
 ]
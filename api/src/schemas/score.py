@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from enum import IntEnum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -49,13 +49,16 @@ class ScoreResponse(BaseModel):
 
 
 class ScoreHistoryItem(BaseModel):
-    """Score history item."""
+    """Score history item (a bucket average when downsampled)."""
 
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
     overall: int
     risk_level: int
     timestamp: datetime
+    tx_success: Optional[int] = None
+    confidence: Optional[int] = None
+    samples: int = 1
 
 
 class ScoreHistoryResponse(BaseModel):
@@ -65,7 +68,47 @@ class ScoreHistoryResponse(BaseModel):
 
     agent_address: str
     history: list[ScoreHistoryItem]
+    total_count: Optional[int] = None  # first page only
+    next_cursor: Optional[str] = None
+
+
+class BatchScoreRequest(BaseModel):
+    """Batch score request."""
+
+    addresses: List[str] = Field(
+        ..., min_length=1, max_length=500, description="Agent Ethereum addresses"
+    )
+    days: int = Field(30, ge=1, le=365, description="Analysis period (days)")
+
+
+class StreamBatchScoreRequest(BatchScoreRequest):
+    """Streaming batch score request (results are emitted as NDJSON)."""
+
+    addresses: List[str] = Field(
+        ..., min_length=1, max_length=10_000, description="Agent Ethereum addresses"
+    )
+
+
+class BatchScoreError(BaseModel):
+    """Per-address error in a batch score response."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    agent_address: str
+    error: str
+    message: str
+
+
+class BatchScoreResponse(BaseModel):
+    """Batch score response."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    results: List[ScoreResponse]
+    errors: List[BatchScoreError]
     total_count: int
+    success_count: int
+    error_count: int
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,218 @@
+"""Stored anomaly flags for AgentFICO agents.
+
+The batch anomaly scan (see ``anomaly_scan``) flags agents whose daily
+activity is anomalous. A flag carries the penalty factor to apply and
+stays active for the configured ``flag_duration_days``; the score
+calculator applies active flags to every score computed meanwhile.
+Only the latest flag per agent is kept.
+
+Two implementations are provided:
+- InMemoryAnomalyFlagStore: process-local, for tests and development
+- SQLiteAnomalyFlagStore: on-disk (WAL mode), shared by API restarts and
+  multiple uvicorn workers
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+@dataclass
+class AnomalyFlag:
+    """An agent flagged as anomalous.
+
+    Attributes:
+        address: Agent address (lowercase)
+        flagged_at: When the flag was raised (Unix milliseconds)
+        expires_at: When the flag stops applying (Unix milliseconds)
+        anomaly_score: Average score of the checks that fired (0-1)
+        penalty_factor: Multiplier applied to the agent's score
+        types: Checks that fired (e.g. "z_score", "tx_burst")
+    """
+
+    address: str
+    flagged_at: int
+    expires_at: int
+    anomaly_score: float
+    penalty_factor: float
+    types: List[str] = field(default_factory=list)
+
+    def active(self, at: Optional[int] = None) -> bool:
+        return (now_ms() if at is None else at) < self.expires_at
+
+
+class AnomalyFlagStore(ABC):
+    """Storage interface for anomaly flags, keyed by lowercase address."""
+
+    @abstractmethod
+    async def save_flags(self, flags: Iterable[AnomalyFlag]) -> int:
+        """Store flags, replacing each agent's previous flag.
+
+        Returns:
+            Number of flags stored
+        """
+        pass
+
+    @abstractmethod
+    async def get_flag(self, address: str, at: Optional[int] = None) -> Optional[AnomalyFlag]:
+        """Return the agent's flag if it is active at ``at`` (default: now)."""
+        pass
+
+    @abstractmethod
+    async def purge_expired(self, at: Optional[int] = None) -> int:
+        """Delete flags that expired before ``at``; return how many."""
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemoryAnomalyFlagStore(AnomalyFlagStore):
+    """Process-local anomaly flag store."""
+
+    def __init__(self):
+        self._flags: Dict[str, AnomalyFlag] = {}
+
+    async def save_flags(self, flags: Iterable[AnomalyFlag]) -> int:
+        count = 0
+        for flag in flags:
+            flag = replace(flag, address=flag.address.lower(), types=list(flag.types))
+            self._flags[flag.address] = flag
+            count += 1
+        return count
+
+    async def get_flag(self, address: str, at: Optional[int] = None) -> Optional[AnomalyFlag]:
+        flag = self._flags.get(address.lower())
+        return flag if flag is not None and flag.active(at) else None
+
+    async def purge_expired(self, at: Optional[int] = None) -> int:
+        expired = [address for address, flag in self._flags.items() if not flag.active(at)]
+        for address in expired:
+            del self._flags[address]
+        return len(expired)
+
+
+class SQLiteAnomalyFlagStore(AnomalyFlagStore):
+    """On-disk anomaly flag store backed by SQLite in WAL mode.
+
+    A nightly scan writes all flags in one transaction. Blocking SQLite
+    calls run in a worker thread to keep the event loop responsive.
+
+    Args:
+        path: Database file path (parent directories are created)
+        busy_timeout: Seconds to wait for a lock held by another process
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS anomaly_flags (
+            address TEXT PRIMARY KEY,
+            flagged_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            anomaly_score REAL NOT NULL,
+            penalty_factor REAL NOT NULL,
+            types TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Union[str, Path], busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (lazy initialization)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=self.busy_timeout,
+                check_same_thread=False,
+                isolation_level=None,  # explicit transactions below
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened anomaly flags at {self.path}")
+        return self._conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database call in a worker thread."""
+
+        def _locked():
+            with self._conn_lock:
+                return fn(self._connect(), *args)
+
+        return await asyncio.to_thread(_locked)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def save_flags(self, flags: Iterable[AnomalyFlag]) -> int:
+        rows = [
+            (
+                flag.address.lower(),
+                flag.flagged_at,
+                flag.expires_at,
+                flag.anomaly_score,
+                flag.penalty_factor,
+                ",".join(flag.types),
+            )
+            for flag in flags
+        ]
+
+        def _save(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO anomaly_flags VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return len(rows)
+
+        return await self._run(_save)
+
+    async def get_flag(self, address: str, at: Optional[int] = None) -> Optional[AnomalyFlag]:
+        at = now_ms() if at is None else at
+
+        def _get(conn):
+            return conn.execute(
+                "SELECT address, flagged_at, expires_at, anomaly_score, penalty_factor,"
+                " types FROM anomaly_flags WHERE address = ? AND expires_at > ?",
+                (address.lower(), at),
+            ).fetchone()
+
+        row = await self._run(_get)
+        if row is None:
+            return None
+        return AnomalyFlag(*row[:5], types=row[5].split(",") if row[5] else [])
+
+    async def purge_expired(self, at: Optional[int] = None) -> int:
+        at = now_ms() if at is None else at
+
+        def _purge(conn):
+            return conn.execute(
+                "DELETE FROM anomaly_flags WHERE expires_at <= ?", (at,)
+            ).rowcount
+
+        return await self._run(_purge)
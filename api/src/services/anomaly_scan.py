@@ -0,0 +1,183 @@
+"""Periodic anomaly scan over every tracked agent.
+
+``AnomalyScanJob`` runs as a long-lived asyncio task (started in the
+FastAPI lifespan), by default once a day. Each run:
+
+1. Loads the tracked agents (e.g. every ERC-8004 registered wallet)
+2. In chunks of at most ``rollup.max_agents`` agents, refreshes their
+   daily metrics from the local transaction store and runs
+   ``detect_anomalies_batch`` on the chunk's agents × days matrix in one
+   vectorized sweep (in a worker thread)
+3. Stores a flag for every anomalous agent; the score calculator applies
+   active flags until they expire
+
+Chunking keeps every agent of a chunk in the rollup's LRU until its row
+is read, however large the registry. The job should own its rollup
+rather than share the one live scoring uses, so a scan does not evict
+the agents being scored.
+
+Only the local transaction store is read; no Etherscan calls are made.
+
+Example:
+    >>> job = AnomalyScanJob(rollup, flag_store, agent_source=list_all_agent_wallets)
+    >>> report = await job.run_once()
+    >>> report.flagged
+    3
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from .anomaly_flags import AnomalyFlag, AnomalyFlagStore
+from .anti_gaming import detect_anomalies_batch
+from .metrics_rollup import DailyMetricsRollup
+from .score_scheduler import AgentSource
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86400 * 1000
+
+
+@dataclass
+class AnomalyScanReport:
+    """Outcome of one scan.
+
+    Attributes:
+        agents: Agents scanned
+        flagged: Agents flagged as anomalous
+        refresh_errors: Agents whose metrics could not be refreshed
+        seconds: Wall time of the scan
+    """
+
+    agents: int = 0
+    flagged: int = 0
+    refresh_errors: int = 0
+    seconds: float = 0.0
+
+
+class AnomalyScanJob:
+    """Flags anomalous agents across the whole tracked population.
+
+    Args:
+        rollup: Daily metrics rollup over the transaction store (owned
+            by the job; its ``max_agents`` sets the chunk size)
+        flag_store: Store the flags are written to
+        agent_source: Coroutine function returning the agents to scan
+        interval: Seconds between the starts of two scans
+        max_concurrency: Agents refreshed from the store at once
+    """
+
+    DEFAULT_INTERVAL = 86400.0
+    DEFAULT_MAX_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        rollup: DailyMetricsRollup,
+        flag_store: AnomalyFlagStore,
+        agent_source: AgentSource,
+        interval: float = DEFAULT_INTERVAL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.rollup = rollup
+        self.flag_store = flag_store
+        self.agent_source = agent_source
+        self.interval = interval
+        self.max_concurrency = max(1, max_concurrency)
+        self.stats: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run_once(self, now: Optional[int] = None) -> AnomalyScanReport:
+        """Scan every tracked agent once.
+
+        Args:
+            now: Current Unix time (default: the wall clock)
+        """
+        started = time.monotonic()
+        now = int(time.time()) if now is None else now
+        addresses = list(dict.fromkeys(a.lower() for a in await self.agent_source()))
+        report = AnomalyScanReport(agents=len(addresses))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _refresh(address: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.rollup.refresh(address, now)
+                    return True
+                except Exception as e:
+                    logger.warning(f"Could not refresh daily metrics for {address}: {e}")
+                    return False
+
+        flagged_at = now * 1000
+        flags = []
+        chunk_size = max(1, self.rollup.max_agents)
+        for start in range(0, len(addresses), chunk_size):
+            chunk = addresses[start:start + chunk_size]
+            refreshed = await asyncio.gather(*(_refresh(a) for a in chunk))
+            report.refresh_errors += refreshed.count(False)
+
+            matrix = self.rollup.daily_matrix(chunk, now)
+            results = await asyncio.to_thread(
+                detect_anomalies_batch,
+                matrix.tx_counts,
+                matrix.success_rates,
+                matrix.current_tx_counts,
+                matrix.current_success_rates,
+            )
+            flags.extend(
+                AnomalyFlag(
+                    address=address,
+                    flagged_at=flagged_at,
+                    expires_at=flagged_at + result.get("flag_duration_days", 0) * DAY_MS,
+                    anomaly_score=result["anomaly_score"],
+                    penalty_factor=result["penalty_factor"],
+                    types=[flag["type"] for flag in result["flags"]],
+                )
+                for address, result in zip(chunk, results)
+                if result["is_anomaly"]
+            )
+
+        if flags:
+            await self.flag_store.save_flags(flags)
+        await self.flag_store.purge_expired(flagged_at)
+
+        report.flagged = len(flags)
+        report.seconds = time.monotonic() - started
+        self.stats["scans"] += 1
+        self.stats["flagged"] += report.flagged
+        logger.info(
+            f"Anomaly scan flagged {report.flagged} of {report.agents} agents"
+            f" in {report.seconds:.1f}s"
+        )
+        return report
+
+    async def run(self) -> None:
+        """Scan forever, one run every ``interval`` seconds."""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Anomaly scan failed")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> asyncio.Task:
+        """Start the background task (no-op if already running)."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -1,18 +1,42 @@
 # Anti-Gaming Scoring System
 # 게이밍 방지를 위한 점수 보정 모듈
 
-from .config_loader import load_config, get_coefficient, is_feature_enabled
-from .time_decay import apply_time_decay
-from .anomaly_detector import detect_anomaly
+from .config_loader import (
+    ConfigSnapshot,
+    ConfigWatcher,
+    get_snapshot,
+    load_config,
+    get_coefficient,
+    get_config_version,
+    is_feature_enabled,
+    reload_configs,
+    reload_if_changed,
+)
+from .time_decay import apply_time_decay, apply_time_decay_columns
+from .anomaly_detector import detect_anomalies_batch, detect_anomaly, get_ewm_alpha
+from .running_stats import EWMStats, MetricsBaseline, RunningStats
 from .consistency import calculate_consistency_bonus
-from .tx_quality import assess_transaction_quality
+from .tx_quality import assess_transaction_quality, assess_transaction_quality_columns
 
 __all__ = [
+    "ConfigSnapshot",
+    "ConfigWatcher",
+    "get_snapshot",
     "load_config",
     "get_coefficient",
+    "get_config_version",
     "is_feature_enabled",
+    "reload_configs",
+    "reload_if_changed",
     "apply_time_decay",
+    "apply_time_decay_columns",
     "detect_anomaly",
+    "detect_anomalies_batch",
+    "get_ewm_alpha",
+    "RunningStats",
+    "EWMStats",
+    "MetricsBaseline",
     "calculate_consistency_bonus",
     "assess_transaction_quality",
+    "assess_transaction_quality_columns",
 ]
@@ -7,15 +7,21 @@ Anomaly Detection
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 import statistics
+from ...data_sources.tx_stats import NUMPY_AVAILABLE
 from .config_loader import load_config, is_feature_enabled
+from .running_stats import MetricsBaseline
+
+if NUMPY_AVAILABLE:
+    import numpy as np
 
 
 def detect_anomaly(
     agent_address: str,
     current_metrics: Dict[str, Any],
-    historical_metrics: List[Dict[str, Any]]
+    historical_metrics: List[Dict[str, Any]],
+    baseline: Optional[MetricsBaseline] = None
 ) -> Dict[str, Any]:
     """
     에이전트의 현재 메트릭이 이상한지 탐지합니다.
@@ -23,7 +29,9 @@ def detect_anomaly(
     Args:
         agent_address: 에이전트 주소
         current_metrics: 현재 기간의 메트릭
-        historical_metrics: 과거 메트릭 리스트
+        historical_metrics: 과거 메트릭 리스트 (오래된 순)
+        baseline: 미리 누적된 기준선 (있으면 historical_metrics 대신 사용,
+            검사 비용 O(1))
     
     Returns:
         {
@@ -34,12 +42,7 @@ def detect_anomaly(
         }
     """
     if not is_feature_enabled("anomaly"):
-        return {
-            "is_anomaly": False,
-            "anomaly_score": 0.0,
-            "flags": [],
-            "penalty_factor": 1.0
-        }
+        return _no_anomaly()
     
     config = load_config("anomaly")
     detection_methods = config.get("detection_methods", {})
@@ -49,11 +52,16 @@ def detect_anomaly(
     flags = []
     anomaly_scores = []
     
+    if baseline is None:
+        baseline = MetricsBaseline.from_history(
+            historical_metrics, alpha=_ewm_alpha(detection_methods)
+        )
+    
     # Z-Score 기반 탐지
     if detection_methods.get("z_score", {}).get("enabled", False):
         z_result = _check_z_score(
             current_metrics,
-            historical_metrics,
+            baseline,
             detection_methods["z_score"]
         )
         if z_result["is_anomaly"]:
@@ -64,7 +72,7 @@ def detect_anomaly(
     if detection_methods.get("rate_of_change", {}).get("enabled", False):
         roc_result = _check_rate_of_change(
             current_metrics,
-            historical_metrics,
+            baseline,
             detection_methods["rate_of_change"]
         )
         if roc_result["is_anomaly"]:
@@ -100,27 +108,34 @@ def detect_anomaly(
     }
 
 
+def get_ewm_alpha() -> float:
+    """설정된 지수가중 z-score의 alpha (일별 롤업의 기준선도 같은 값을 사용)"""
+    return _ewm_alpha(load_config("anomaly").get("detection_methods", {}))
+
+
+def _ewm_alpha(detection_methods: Dict) -> float:
+    return detection_methods.get("z_score", {}).get(
+        "ewm_alpha", MetricsBaseline.DEFAULT_EWM_ALPHA
+    )
+
+
 def _check_z_score(
     current: Dict,
-    historical: List[Dict],
+    baseline: MetricsBaseline,
     config: Dict
 ) -> Dict:
-    """Z-Score 기반 이상 탐지"""
+    """Z-Score 기반 이상 탐지 (weighting: "ewm"이면 지수가중 기준선 사용)"""
     threshold = config.get("threshold", 3.0)
     min_samples = config.get("min_samples", 10)
     
-    if len(historical) < min_samples:
+    stats = baseline.tx_count_ewm if config.get("weighting") == "ewm" else baseline.tx_count
+    if stats.count < max(min_samples, 2):
         return {"is_anomaly": False, "type": "z_score", "score": 0}
     
     # 트랜잭션 수 기준
-    historical_tx_counts = [m.get("tx_count", 0) for m in historical]
     current_tx_count = current.get("tx_count", 0)
-    
-    if len(historical_tx_counts) < 2:
-        return {"is_anomaly": False, "type": "z_score", "score": 0}
-    
-    mean = statistics.mean(historical_tx_counts)
-    stdev = statistics.stdev(historical_tx_counts)
+    mean = stats.mean
+    stdev = stats.stdev
     
     if stdev == 0:
         return {"is_anomaly": False, "type": "z_score", "score": 0}
@@ -142,19 +157,17 @@ def _check_z_score(
 
 def _check_rate_of_change(
     current: Dict,
-    historical: List[Dict],
+    baseline: MetricsBaseline,
     config: Dict
 ) -> Dict:
     """변화율 기반 이상 탐지"""
     max_weekly_increase = config.get("max_weekly_increase_percent", 30)
     
-    if not historical:
+    # 가장 최근 기록과 비교
+    prev_success_rate = baseline.last_success_rate
+    if prev_success_rate is None:
         return {"is_anomaly": False, "type": "rate_of_change", "score": 0}
     
-    # 가장 최근 historical과 비교
-    prev = historical[-1] if historical else {}
-    
-    prev_success_rate = prev.get("success_rate", 0.5)
     current_success_rate = current.get("success_rate", 0.5)
     
     if prev_success_rate > 0:
@@ -192,3 +205,202 @@ def _check_tx_burst(current: Dict, config: Dict) -> Dict:
         "threshold": max_tx_count,
         "window_hours": window_hours
     }
+
+
+def _no_anomaly(**extra) -> Dict[str, Any]:
+    return {
+        "is_anomaly": False,
+        "anomaly_score": 0.0,
+        "flags": [],
+        "penalty_factor": 1.0,
+        **extra
+    }
+
+
+def detect_anomalies_batch(
+    tx_counts: Sequence[Sequence[float]],
+    success_rates: Sequence[Sequence[float]],
+    current_tx_counts: Sequence[float],
+    current_success_rates: Optional[Sequence[float]] = None,
+    current_tx_counts_24h: Optional[Sequence[float]] = None
+) -> List[Dict[str, Any]]:
+    """
+    전체 에이전트의 이상 여부를 한 번에 탐지합니다.
+    
+    에이전트 × 일 행렬을 NumPy로 한 번에 계산하므로 에이전트마다
+    detect_anomaly를 호출하는 것보다 훨씬 빠릅니다. 결과는 각 행에
+    대해 detect_anomaly를 호출한 것과 같습니다.
+    
+    Args:
+        tx_counts: 일별 트랜잭션 수 (에이전트 × 일, 오래된 순, 기록 없는 날은 NaN)
+        success_rates: 일별 성공률 (0-1, tx_counts와 같은 모양)
+        current_tx_counts: 현재 기간 트랜잭션 수 (에이전트별)
+        current_success_rates: 현재 기간 성공률 (NaN이면 0.5로 간주)
+        current_tx_counts_24h: 최근 24시간 트랜잭션 수 (기본: current_tx_counts)
+    
+    Returns:
+        에이전트 순서대로 detect_anomaly와 같은 형식의 결과 리스트
+    """
+    if not NUMPY_AVAILABLE:
+        return _detect_anomalies_rows(
+            tx_counts, success_rates, current_tx_counts,
+            current_success_rates, current_tx_counts_24h
+        )
+    
+    current = np.asarray(current_tx_counts, dtype=np.float64)
+    agents = len(current)
+    if not agents:
+        return []
+    if not is_feature_enabled("anomaly"):
+        return [_no_anomaly() for _ in range(agents)]
+    
+    config = load_config("anomaly")
+    detection_methods = config.get("detection_methods", {})
+    penalties = config.get("penalties", {})
+    patterns = config.get("patterns", {})
+    
+    tx = np.asarray(tx_counts, dtype=np.float64).reshape(agents, -1)
+    rates = np.asarray(success_rates, dtype=np.float64).reshape(agents, -1)
+    valid = ~np.isnan(tx)
+    samples = valid.sum(axis=1)
+    current_rates = (
+        np.full(agents, np.nan) if current_success_rates is None
+        else np.asarray(current_success_rates, dtype=np.float64)
+    )
+    current_rates = np.where(np.isnan(current_rates), 0.5, current_rates)
+    current_24h = (
+        current if current_tx_counts_24h is None
+        else np.asarray(current_tx_counts_24h, dtype=np.float64)
+    )
+    
+    # 검사별 (플래그 여부, 점수, 결과 dict 생성 함수)
+    checks = []
+    
+    # Z-Score 기반 탐지
+    z_config = detection_methods.get("z_score", {})
+    if z_config.get("enabled", False):
+        threshold = z_config.get("threshold", 3.0)
+        min_samples = z_config.get("min_samples", 10)
+        if z_config.get("weighting") == "ewm":
+            samples_z, mean, variance = _ewm_columns(
+                tx, valid, _ewm_alpha(detection_methods)
+            )
+        else:
+            samples_z = samples
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.nansum(tx, axis=1) / samples
+                deviations = np.where(valid, tx - mean[:, None], 0.0)
+                variance = (deviations ** 2).sum(axis=1) / (samples - 1)
+        stdev = np.sqrt(np.where(samples_z > 1, variance, 0.0))
+        usable = (samples_z >= max(min_samples, 2)) & (stdev > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z_scores = np.where(usable, (current - mean) / stdev, 0.0)
+        flagged = usable & (np.abs(z_scores) > threshold)
+        score = np.where(flagged, np.minimum(1.0, np.abs(z_scores) / (threshold * 2)), 0.0)
+        checks.append((flagged, score, lambda i, z=z_scores, t=threshold: {
+            "type": "z_score", "z_score": float(z[i]), "threshold": t, "metric": "tx_count"
+        }))
+    
+    # 변화율 기반 탐지
+    roc_config = detection_methods.get("rate_of_change", {})
+    if roc_config.get("enabled", False):
+        max_increase = roc_config.get("max_weekly_increase_percent", 30)
+        has_history = samples > 0
+        prev = np.full(agents, 0.5)
+        if tx.shape[1]:
+            # 가장 최근 기록의 성공률 (없으면 0.5)
+            last_day = tx.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+            prev = rates[np.arange(agents), last_day]
+            prev = np.where(np.isnan(prev), 0.5, prev)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change = np.where(prev > 0, (current_rates - prev) / prev * 100, 0.0)
+        flagged = has_history & (change > max_increase)
+        score = np.where(flagged, np.minimum(1.0, change / (max_increase * 2)), 0.0)
+        checks.append((flagged, score, lambda i, c=change, t=max_increase: {
+            "type": "rate_of_change", "change_percent": float(c[i]), "threshold": t
+        }))
+    
+    # 패턴 기반 탐지
+    burst_config = patterns.get("tx_burst", {})
+    if burst_config:
+        max_tx_count = burst_config.get("max_tx_count", 100)
+        flagged = current_24h > max_tx_count
+        score = np.where(flagged, np.minimum(1.0, current_24h / (max_tx_count * 2)), 0.0)
+        checks.append((flagged, score, lambda i, t=max_tx_count: {
+            "type": "tx_burst",
+            "tx_count": int(current_24h[i]),
+            "threshold": t,
+            "window_hours": burst_config.get("window_hours", 24)
+        }))
+    
+    if not checks:
+        return [_no_anomaly(flag_duration_days=0) for _ in range(agents)]
+    
+    # 종합 판단
+    flag_matrix = np.stack([flagged for flagged, _, _ in checks])
+    score_matrix = np.stack([score for _, score, _ in checks])
+    flag_counts = flag_matrix.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        anomaly_scores = np.where(flag_counts > 0, score_matrix.sum(axis=0) / flag_counts, 0.0)
+    immediate_penalty = penalties.get("immediate_penalty_percent", 10) / 100
+    penalty_factors = np.maximum(0.5, 1.0 - immediate_penalty * anomaly_scores)
+    flag_duration = penalties.get("flag_duration_days", 14)
+    
+    results = []
+    for i in range(agents):
+        if not flag_counts[i]:
+            results.append(_no_anomaly(flag_duration_days=0))
+            continue
+        flags = []
+        for (flagged, score, details), row_flagged in zip(checks, flag_matrix[:, i]):
+            if row_flagged:
+                flags.append({"is_anomaly": True, "score": float(score[i]), **details(i)})
+        results.append({
+            "is_anomaly": True,
+            "anomaly_score": float(anomaly_scores[i]),
+            "flags": flags,
+            "penalty_factor": float(penalty_factors[i]),
+            "flag_duration_days": flag_duration
+        })
+    return results
+
+
+def _ewm_columns(tx: "np.ndarray", valid: "np.ndarray", alpha: float):
+    """행별 지수가중 평균/분산 (날짜 순으로 누적, NaN은 건너뜀)"""
+    agents = tx.shape[0]
+    count = np.zeros(agents, dtype=np.int64)
+    mean = np.zeros(agents)
+    variance = np.zeros(agents)
+    for day in range(tx.shape[1]):
+        has = valid[:, day]
+        values = np.where(has, tx[:, day], 0.0)
+        first = has & (count == 0)
+        update = has & (count > 0)
+        delta = values - mean
+        increment = alpha * delta
+        variance = np.where(update, (1 - alpha) * (variance + delta * increment), variance)
+        mean = np.where(first, values, np.where(update, mean + increment, mean))
+        count += has
+    return count, mean, variance
+
+
+def _detect_anomalies_rows(
+    tx_counts, success_rates, current_tx_counts,
+    current_success_rates, current_tx_counts_24h
+) -> List[Dict[str, Any]]:
+    """NumPy가 없을 때: 에이전트별로 detect_anomaly 호출"""
+    results = []
+    for i, current_tx_count in enumerate(current_tx_counts):
+        # NaN (x != x) 은 기록 없음
+        history = [
+            {"tx_count": count, **({"success_rate": rate} if rate == rate else {})}
+            for count, rate in zip(tx_counts[i], success_rates[i])
+            if count == count
+        ]
+        current = {"tx_count": current_tx_count}
+        if current_success_rates is not None and current_success_rates[i] == current_success_rates[i]:
+            current["success_rate"] = current_success_rates[i]
+        if current_tx_counts_24h is not None:
+            current["tx_count_24h"] = current_tx_counts_24h[i]
+        results.append(detect_anomaly("", current, history))
+    return results
@@ -4,16 +4,29 @@ Anti-Gaming Config Loader
 AgentFICO-Config (Private) 레포에서 계수를 로드합니다.
 계수는 비공개로 유지되어 게이밍을 방지합니다.
 
+JSON 계수는 불변(immutable) 스냅샷으로 컴파일됩니다:
+- 정렬된 감쇠 윈도우, 티어 테이블, 금액 구간 등 타입이 있는 섹션
+- 점(.) 경로가 미리 펼쳐진 계수 테이블 (get_coefficient O(1))
+- 환경 변수 우선순위가 반영된 기능 활성화 여부
+
+현재 스냅샷은 하나의 참조로 원자적으로 교체되며, ConfigWatcher가
+파일 mtime을 주기적으로 확인해 변경 시 다시 컴파일합니다 (hot reload).
+스냅샷 버전은 점수 캐시 키로 사용됩니다.
+
 사용법:
     config = load_config("time_decay")
     weight = get_coefficient("time_decay", "decay_windows.0.weight")
+    windows = get_snapshot().time_decay.windows
 """
 
+import asyncio
 import os
 import json
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
-from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -69,6 +82,73 @@ DEFAULT_COEFFICIENTS = {
 }
 
 
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class DecayWindow:
+    """시간 감쇠 윈도우 (days_from <= 경과일 < days_to)"""
+    name: str
+    days_from: float
+    days_to: float
+    weight: float
+
+
+@dataclass(frozen=True)
+class TimeDecayConfig:
+    windows: Tuple[DecayWindow, ...]  # days_from 오름차순
+    min_transactions_per_window: int
+    no_activity_penalty: float
+
+
+@dataclass(frozen=True)
+class ConsistencyTier:
+    name: str
+    required_days: int
+    min_success_rate: float
+    bonus_points: int
+
+
+@dataclass(frozen=True)
+class ConsistencyConfig:
+    tiers: Tuple[ConsistencyTier, ...]  # required_days 내림차순
+    max_total_bonus: int
+    streak_rules: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class TxQualityConfig:
+    # (상한 금액 USD, 가중치) 오름차순, 마지막 구간 상한은 inf
+    value_bands: Tuple[Tuple[float, float], ...]
+    interaction_weights: Mapping[str, float]
+    diversity_bonus: Mapping[str, Any]
+    repetition_penalty: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """컴파일된 Anti-Gaming 설정 (불변)
+
+    Attributes:
+        version: 설정 버전 (다시 로드될 때마다 증가, 캐시 키로 사용)
+        source: 설정 디렉토리 (없으면 기본값 사용)
+        configs: 설정 이름별 원본 계수 (읽기 전용)
+        enabled: 기능별 활성화 여부 (환경 변수 AG_<FEATURE>_ENABLED 우선)
+        coefficients: (설정 이름, 점 경로) → 값
+        time_decay, consistency, tx_quality: 타입이 있는 섹션
+        file_state: 컴파일 시점의 설정 파일 (경로, mtime, 크기)
+    """
+    version: int
+    source: Optional[Path]
+    configs: Mapping[str, Mapping[str, Any]]
+    enabled: Mapping[str, bool]
+    coefficients: Mapping[Tuple[str, str], Any]
+    time_decay: TimeDecayConfig
+    consistency: ConsistencyConfig
+    tx_quality: TxQualityConfig
+    file_state: Tuple[Tuple[str, int, int], ...]
+
+
 def _get_config_path() -> Optional[Path]:
     """설정 파일 경로를 찾습니다."""
     # 1. 환경 변수로 지정된 경로
@@ -88,33 +168,204 @@ def _get_config_path() -> Optional[Path]:
     return None
 
 
-@lru_cache(maxsize=10)
-def load_config(name: str) -> dict:
+def _config_files(config_path: Optional[Path]) -> Dict[str, Path]:
+    """설정 이름 → JSON 파일"""
+    if config_path is None:
+        return {}
+    directory = config_path / "coefficients"
+    if not directory.is_dir():
+        return {}
+    return {path.stem: path for path in sorted(directory.glob("*.json"))}
+
+
+def _file_state(config_path: Optional[Path]) -> Tuple[Tuple[str, int, int], ...]:
+    """변경 감지용 (경로, mtime, 크기) 목록"""
+    state = []
+    for path in _config_files(config_path).values():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        state.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(state)
+
+
+def _read_config(name: str, json_file: Optional[Path]) -> dict:
+    """JSON 설정을 읽습니다 (없거나 잘못되면 기본값)."""
+    if json_file is not None:
+        try:
+            with open(json_file, "r") as f:
+                config = json.load(f)
+                logger.info(f"Loaded anti-gaming config: {name} from {json_file}")
+                return config
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load {json_file}: {e}")
+    
+    # Fallback to defaults
+    logger.warning(f"Using default config for {name} (not production values)")
+    return DEFAULT_COEFFICIENTS.get(name, {})
+
+
+def _freeze(value: Any) -> Any:
+    """dict → 읽기 전용 매핑, list → 튜플 (재귀)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _flatten(name: str, value: Any, prefix: str, out: Dict[Tuple[str, str], Any]) -> None:
+    """모든 점 경로를 미리 펼칩니다 (중간 노드 포함)."""
+    if prefix:
+        out[(name, prefix)] = value
+    if isinstance(value, Mapping):
+        items = value.items()
+    elif isinstance(value, tuple):
+        items = enumerate(value)
+    else:
+        return
+    for key, item in items:
+        _flatten(name, item, f"{prefix}.{key}" if prefix else str(key), out)
+
+
+def _compile_time_decay(config: Mapping[str, Any]) -> TimeDecayConfig:
+    windows = sorted(
+        config.get("decay_windows", ()),
+        key=lambda window: window.get("days_from", 0)
+    )
+    return TimeDecayConfig(
+        windows=tuple(
+            DecayWindow(
+                name=window.get("name", f"window_{i}"),
+                days_from=window.get("days_from", 0),
+                days_to=float("inf") if window.get("days_to") is None else window["days_to"],
+                weight=window.get("weight", 1.0),
+            )
+            for i, window in enumerate(windows)
+        ),
+        min_transactions_per_window=config.get("min_transactions_per_window", 3),
+        no_activity_penalty=config.get("no_activity_penalty", 0.9),
+    )
+
+
+def _compile_consistency(config: Mapping[str, Any]) -> ConsistencyConfig:
+    tiers = sorted(
+        config.get("tiers", ()),
+        key=lambda tier: tier.get("required_days", 0),
+        reverse=True
+    )
+    return ConsistencyConfig(
+        tiers=tuple(
+            ConsistencyTier(
+                name=tier.get("name", f"{tier.get('required_days', 30)}d"),
+                required_days=tier.get("required_days", 30),
+                min_success_rate=tier.get("min_success_rate", 0.8),
+                bonus_points=tier.get("bonus_points", 0),
+            )
+            for tier in tiers
+        ),
+        max_total_bonus=config.get("max_total_bonus", 100),
+        streak_rules=config.get("streak_rules", _EMPTY),
+    )
+
+
+def _compile_tx_quality(config: Mapping[str, Any]) -> TxQualityConfig:
+    thresholds = config.get("value_thresholds", _EMPTY)
+    weights = config.get("value_weights", _EMPTY)
+    interaction_types = config.get("interaction_types", _EMPTY)
+    interaction_defaults = {
+        "self_transfer": 0.1,
+        "defi_interaction": 1.0,
+        "contract_interaction": 0.7,
+        "simple_transfer": 0.4,
+    }
+    return TxQualityConfig(
+        value_bands=(
+            (thresholds.get("dust_usd", 0.01), weights.get("dust", 0.05)),
+            (thresholds.get("low_usd", 1.0), weights.get("low", 0.3)),
+            (thresholds.get("medium_usd", 10.0), weights.get("medium", 0.7)),
+            (float("inf"), weights.get("high", 1.0)),
+        ),
+        interaction_weights=MappingProxyType({
+            kind: interaction_types.get(kind, _EMPTY).get("weight", default)
+            for kind, default in interaction_defaults.items()
+        }),
+        diversity_bonus=config.get("diversity_bonus", _EMPTY),
+        repetition_penalty=config.get("repetition_penalty", _EMPTY),
+    )
+
+
+def _env_enabled(feature: str) -> Optional[bool]:
+    env_value = os.getenv(f"AG_{feature.upper()}_ENABLED")
+    if env_value is None:
+        return None
+    return env_value.lower() in ("true", "1", "yes")
+
+
+def compile_snapshot(version: int = 0) -> ConfigSnapshot:
+    """설정 파일(또는 기본값)을 읽어 스냅샷으로 컴파일합니다."""
+    config_path = _get_config_path()
+    files = _config_files(config_path)
+    # 상태를 먼저 읽어, 읽는 도중 바뀐 파일은 다음 확인에서 다시 로드
+    file_state = _file_state(config_path)
+    
+    configs = {
+        name: _freeze(_read_config(name, files.get(name)))
+        for name in dict.fromkeys([*DEFAULT_COEFFICIENTS, *files])
+    }
+    enabled = {}
+    coefficients: Dict[Tuple[str, str], Any] = {}
+    for name, config in configs.items():
+        env_value = _env_enabled(name)
+        enabled[name] = config.get("enabled", False) if env_value is None else env_value
+        _flatten(name, config, "", coefficients)
+    
+    return ConfigSnapshot(
+        version=version,
+        source=config_path,
+        configs=MappingProxyType(configs),
+        enabled=MappingProxyType(enabled),
+        coefficients=MappingProxyType(coefficients),
+        time_decay=_compile_time_decay(configs["time_decay"]),
+        consistency=_compile_consistency(configs["consistency"]),
+        tx_quality=_compile_tx_quality(configs["tx_quality"]),
+        file_state=file_state,
+    )
+
+
+# 현재 스냅샷 (참조 교체로 원자적으로 갱신)
+_snapshot: Optional[ConfigSnapshot] = None
+_reload_lock = threading.Lock()
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """현재 설정 스냅샷을 반환합니다 (처음 호출 시 컴파일)."""
+    snapshot = _snapshot
+    if snapshot is None:
+        with _reload_lock:
+            if _snapshot is None:
+                _install(compile_snapshot())
+            snapshot = _snapshot
+    return snapshot
+
+
+def _install(snapshot: ConfigSnapshot) -> None:
+    global _snapshot
+    _snapshot = snapshot
+
+
+def load_config(name: str) -> Mapping[str, Any]:
     """
-    계수 설정을 로드합니다.
+    계수 설정을 반환합니다 (읽기 전용).
     
     Args:
         name: 설정 이름 (time_decay, anomaly, consistency, tx_quality, sybil)
     
     Returns:
-        설정 딕셔너리
+        설정 매핑
     """
-    config_path = _get_config_path()
-    
-    if config_path:
-        json_file = config_path / "coefficients" / f"{name}.json"
-        if json_file.exists():
-            try:
-                with open(json_file, "r") as f:
-                    config = json.load(f)
-                    logger.info(f"Loaded anti-gaming config: {name} from {json_file}")
-                    return config
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Failed to load {json_file}: {e}")
-    
-    # Fallback to defaults
-    logger.warning(f"Using default config for {name} (not production values)")
-    return DEFAULT_COEFFICIENTS.get(name, {})
+    return get_snapshot().configs.get(name, _EMPTY)
 
 
 def get_coefficient(config_name: str, key_path: str, default: Any = None) -> Any:
@@ -129,38 +380,84 @@ def get_coefficient(config_name: str, key_path: str, default: Any = None) -> Any
     Returns:
         계수 값
     """
-    config = load_config(config_name)
-    
-    keys = key_path.split(".")
-    value = config
-    
-    try:
-        for key in keys:
-            if isinstance(value, list):
-                value = value[int(key)]
-            elif isinstance(value, dict):
-                value = value[key]
-            else:
-                return default
-        return value
-    except (KeyError, IndexError, TypeError):
-        return default
+    return get_snapshot().coefficients.get((config_name, key_path), default)
 
 
 def is_feature_enabled(feature: str) -> bool:
-    """Anti-Gaming 기능이 활성화되어 있는지 확인합니다."""
-    # 환경 변수 우선
-    env_key = f"AG_{feature.upper()}_ENABLED"
-    env_value = os.getenv(env_key)
-    if env_value is not None:
-        return env_value.lower() in ("true", "1", "yes")
-    
-    # Config 파일에서 확인
-    config = load_config(feature)
-    return config.get("enabled", False)
+    """Anti-Gaming 기능이 활성화되어 있는지 확인합니다.
+
+    환경 변수 AG_<FEATURE>_ENABLED가 설정 파일보다 우선하며, 스냅샷을
+    컴파일할 때 반영됩니다.
+    """
+    enabled = get_snapshot().enabled.get(feature)
+    if enabled is None:
+        return bool(_env_enabled(feature))
+    return enabled
+
+
+def get_config_version() -> int:
+    """현재 설정 버전을 반환합니다 (설정이 다시 로드될 때마다 증가)."""
+    return get_snapshot().version
+
+
+def reload_configs() -> ConfigSnapshot:
+    """설정을 다시 컴파일하고 스냅샷을 교체합니다."""
+    with _reload_lock:
+        version = _snapshot.version + 1 if _snapshot is not None else 0
+        _install(compile_snapshot(version))
+    logger.info(f"Anti-gaming configs reloaded (version {version})")
+    return _snapshot
+
+
+def reload_if_changed() -> bool:
+    """설정 파일이 바뀌었으면 다시 로드합니다.
+
+    Returns:
+        다시 로드했으면 True
+    """
+    snapshot = get_snapshot()
+    config_path = _get_config_path()
+    if config_path == snapshot.source and _file_state(config_path) == snapshot.file_state:
+        return False
+    reload_configs()
+    return True
+
+
+class ConfigWatcher:
+    """설정 파일 mtime을 주기적으로 확인하는 백그라운드 작업
+
+    Args:
+        interval: 확인 주기 (초)
+    """
+
+    DEFAULT_INTERVAL = 30.0
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run(self) -> None:
+        """interval마다 변경을 확인합니다."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(reload_if_changed)
+            except Exception:
+                logger.exception("Anti-gaming config reload failed")
 
+    def start(self) -> asyncio.Task:
+        """백그라운드 작업을 시작합니다 (이미 실행 중이면 무시)."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+        return self._task
 
-def reload_configs():
-    """캐시를 클리어하고 설정을 다시 로드합니다."""
-    load_config.cache_clear()
-    logger.info("Anti-gaming configs reloaded")
+    async def stop(self) -> None:
+        """백그라운드 작업을 취소하고 종료를 기다립니다."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -8,8 +8,8 @@ Consistency Bonus
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from .config_loader import load_config, is_feature_enabled
+from typing import List, Dict, Any, Mapping, Optional
+from .config_loader import get_snapshot, is_feature_enabled
 
 
 def calculate_consistency_bonus(
@@ -44,10 +44,10 @@ def calculate_consistency_bonus(
             "details": {"enabled": False}
         }
     
-    config = load_config("consistency")
-    tiers = config.get("tiers", [])
-    streak_rules = config.get("streak_rules", {})
-    max_bonus = config.get("max_total_bonus", 100)
+    config = get_snapshot().consistency  # 티어는 required_days 내림차순
+    tiers = config.tiers
+    streak_rules = config.streak_rules
+    max_bonus = config.max_total_bonus
     
     if reference_date is None:
         reference_date = datetime.utcnow()
@@ -63,15 +63,11 @@ def calculate_consistency_bonus(
     achieved_tier = None
     bonus_points = 0
     
-    for tier in sorted(tiers, key=lambda t: t.get("required_days", 0), reverse=True):
-        required_days = tier.get("required_days", 30)
-        min_success_rate = tier.get("min_success_rate", 0.8)
-        tier_bonus = tier.get("bonus_points", 0)
-        
-        if streak_info["streak_days"] >= required_days:
-            if streak_info["avg_success_rate"] >= min_success_rate:
-                achieved_tier = tier.get("name", f"{required_days}d")
-                bonus_points = tier_bonus
+    for tier in tiers:
+        if streak_info["streak_days"] >= tier.required_days:
+            if streak_info["avg_success_rate"] >= tier.min_success_rate:
+                achieved_tier = tier.name
+                bonus_points = tier.bonus_points
                 break
     
     return {
@@ -90,7 +86,7 @@ def calculate_consistency_bonus(
 def _calculate_streak(
     history: List[Dict],
     reference_date: datetime,
-    rules: Dict
+    rules: Mapping[str, Any]
 ) -> Dict[str, Any]:
     """연속 성공 기간을 계산합니다."""
     break_tolerance = rules.get("break_tolerance_days", 3)
@@ -0,0 +1,126 @@
+"""
+Running Statistics
+
+이력 전체를 다시 계산하지 않고 평균/분산을 갱신하는 스트리밍 누산기입니다.
+
+- RunningStats: Welford 알고리즘 (count/mean/M2), 값 추가·제거 O(1)
+- EWMStats: 지수가중 평균/분산 (최근 값일수록 가중치가 큼)
+- MetricsBaseline: 이상 탐지가 참조하는 일별 기준선
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, Iterable, List, Optional
+
+
+class RunningStats:
+    """Welford 방식의 평균/표본분산 누산기"""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        stats = cls()
+        for value in values:
+            stats.push(value)
+        return stats
+
+    def push(self, value: float) -> None:
+        """값을 추가합니다."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        """이전에 추가한 값을 제거합니다 (슬라이딩 윈도우용)."""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 = max(0.0, self.m2 - (value - self.mean) * (value - mean))
+        self.mean = mean
+        self.count -= 1
+
+    @property
+    def variance(self) -> float:
+        """표본분산 (statistics.variance와 동일, 2개 미만이면 0)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class EWMStats:
+    """지수가중 평균/분산 누산기
+
+    Args:
+        alpha: 새 값의 가중치 (0-1, 클수록 최근 값에 민감)
+    """
+
+    __slots__ = ("alpha", "count", "mean", "variance")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def push(self, value: float) -> None:
+        """값을 추가합니다."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = float(value)
+            return
+        delta = value - self.mean
+        increment = self.alpha * delta
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + delta * increment)
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@dataclass
+class MetricsBaseline:
+    """에이전트의 일별 메트릭 기준선
+
+    Attributes:
+        tx_count: 일별 트랜잭션 수 (Welford)
+        tx_count_ewm: 일별 트랜잭션 수 (지수가중)
+        last_success_rate: 가장 최근 일의 성공률 (없으면 None)
+    """
+
+    DEFAULT_EWM_ALPHA: ClassVar[float] = 0.1
+
+    tx_count: RunningStats = field(default_factory=RunningStats)
+    tx_count_ewm: EWMStats = field(
+        default_factory=lambda: EWMStats(MetricsBaseline.DEFAULT_EWM_ALPHA)
+    )
+    last_success_rate: Optional[float] = None
+
+    @classmethod
+    def from_history(
+        cls,
+        history: List[Dict[str, Any]],
+        alpha: float = DEFAULT_EWM_ALPHA,
+    ) -> "MetricsBaseline":
+        """과거 메트릭 리스트(오래된 순)로 기준선을 만듭니다."""
+        baseline = cls(tx_count_ewm=EWMStats(alpha))
+        for metrics in history:
+            baseline.push(metrics.get("tx_count", 0))
+        if history:
+            baseline.last_success_rate = history[-1].get("success_rate", 0.5)
+        return baseline
+
+    def push(self, tx_count: float) -> None:
+        """하루치 트랜잭션 수를 추가합니다."""
+        self.tx_count.push(tx_count)
+        self.tx_count_ewm.push(tx_count)
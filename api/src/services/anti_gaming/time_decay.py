@@ -7,9 +7,20 @@ Time Decay Factor
 원칙: "지속적인 좋은 성과가 필요"
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from .config_loader import load_config, is_feature_enabled
+import bisect
+import math
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from ...data_sources.tx_stats import NUMPY_AVAILABLE
+from .config_loader import DecayWindow, get_snapshot, is_feature_enabled
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
 
 
 def apply_time_decay(
@@ -19,9 +30,12 @@ def apply_time_decay(
     """
     트랜잭션에 시간 기반 가중치를 적용합니다.
     
+    타임스탬프를 epoch 초 컬럼으로 변환한 뒤 apply_time_decay_columns에
+    위임합니다.
+    
     Args:
         transactions: 트랜잭션 리스트 (각각 timestamp 필드 포함)
-        reference_date: 기준 날짜 (기본: 현재)
+        reference_date: 기준 날짜 (기본: 현재, naive는 UTC로 간주)
     
     Returns:
         {
@@ -37,61 +51,84 @@ def apply_time_decay(
             "window_stats": {}
         }
     
-    config = load_config("time_decay")
-    decay_windows = config.get("decay_windows", [])
-    min_tx_per_window = config.get("min_transactions_per_window", 3)
-    no_activity_penalty = config.get("no_activity_penalty", 0.9)
+    timestamps = []
+    successes = []
+    for tx in transactions:
+        ts = _epoch_seconds(tx.get("timestamp"))
+        if ts is None:
+            continue
+        timestamps.append(ts)
+        successes.append(bool(tx.get("success", True)))
     
-    if reference_date is None:
-        reference_date = datetime.utcnow()
+    reference_ts = None if reference_date is None else _epoch_seconds(reference_date)
+    result = apply_time_decay_columns(timestamps, successes, reference_ts)
+    result["total_transactions"] = len(transactions)
+    return result
+
+
+def apply_time_decay_columns(
+    timestamps: Sequence[float],
+    successes: Sequence[bool],
+    reference_ts: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    컬럼 형식의 트랜잭션에 시간 기반 가중치를 적용합니다.
     
-    # 윈도우별로 트랜잭션 분류
-    window_txs = {i: [] for i in range(len(decay_windows))}
+    경과일을 컴파일된 윈도우 경계에 searchsorted로 한 번에 배정하고
+    윈도우별 건수/성공 수를 bincount로 집계합니다 (NumPy 없으면 bisect).
+    윈도우는 서로 겹치지 않는다고 가정합니다.
     
-    for tx in transactions:
-        tx_date = _parse_timestamp(tx.get("timestamp"))
-        if tx_date is None:
-            continue
-        
-        days_ago = (reference_date - tx_date).days
-        
-        for i, window in enumerate(decay_windows):
-            days_from = window.get("days_from", 0)
-            days_to = window.get("days_to")
-            
-            if days_to is None:
-                days_to = float("inf")
-            
-            if days_from <= days_ago < days_to:
-                window_txs[i].append(tx)
-                break
+    Args:
+        timestamps: 트랜잭션 시각 (Unix 초, NaN은 무시)
+        successes: 성공 여부 (timestamps와 같은 길이)
+        reference_ts: 기준 시각 (Unix 초, 기본: 현재)
+    
+    Returns:
+        apply_time_decay와 같은 형식의 결과
+    """
+    if not is_feature_enabled("time_decay"):
+        total = len(successes)
+        return {
+            "weighted_success_rate": sum(map(bool, successes)) / total if total else 0.0,
+            "decay_applied": False,
+            "window_stats": {}
+        }
+    
+    config = get_snapshot().time_decay  # days_from 순으로 정렬됨
+    if reference_ts is None:
+        reference_ts = time.time()
+    
+    count_windows = _window_counts_numpy if NUMPY_AVAILABLE else _window_counts_python
+    counts, success_counts = count_windows(
+        timestamps, successes, reference_ts, config.windows
+    )
+    
+    min_tx_per_window = config.min_transactions_per_window
+    no_activity_penalty = config.no_activity_penalty
     
     # 가중 평균 계산
     total_weighted_success = 0.0
     total_weight = 0.0
     window_stats = {}
     
-    for i, window in enumerate(decay_windows):
-        txs = window_txs[i]
-        weight = window.get("weight", 1.0)
-        window_name = window.get("name", f"window_{i}")
+    for window, tx_count, success_count in zip(config.windows, counts, success_counts):
+        weight = window.weight
         
-        if len(txs) >= min_tx_per_window:
-            success_count = sum(1 for tx in txs if tx.get("success", True))
-            success_rate = success_count / len(txs) if txs else 0
+        if tx_count >= min_tx_per_window:
+            success_rate = success_count / tx_count if tx_count else 0
             
-            total_weighted_success += success_rate * weight * len(txs)
-            total_weight += weight * len(txs)
+            total_weighted_success += success_rate * weight * tx_count
+            total_weight += weight * tx_count
             
-            window_stats[window_name] = {
-                "tx_count": len(txs),
+            window_stats[window.name] = {
+                "tx_count": tx_count,
                 "success_rate": success_rate,
                 "weight": weight,
                 "contribution": success_rate * weight
             }
         else:
-            window_stats[window_name] = {
-                "tx_count": len(txs),
+            window_stats[window.name] = {
+                "tx_count": tx_count,
                 "success_rate": None,
                 "weight": weight,
                 "contribution": 0,
@@ -99,8 +136,8 @@ def apply_time_decay(
             }
     
     # 최근 활동 없으면 페널티
-    recent_window = window_txs.get(0, [])
-    if len(recent_window) < min_tx_per_window:
+    recent_count = counts[0] if counts else 0
+    if recent_count < min_tx_per_window:
         total_weighted_success *= no_activity_penalty
         window_stats["penalty"] = {
             "type": "no_recent_activity",
@@ -113,10 +150,63 @@ def apply_time_decay(
         "weighted_success_rate": min(1.0, max(0.0, weighted_success_rate)),
         "decay_applied": True,
         "window_stats": window_stats,
-        "total_transactions": len(transactions)
+        "total_transactions": len(timestamps)
     }
 
 
+def _window_counts_numpy(
+    timestamps: Sequence[float],
+    successes: Sequence[bool],
+    reference_ts: float,
+    windows: Sequence[DecayWindow]
+) -> Tuple[List[int], List[int]]:
+    """윈도우별 (건수, 성공 수) - searchsorted + bincount"""
+    n = len(windows)
+    if not n:
+        return [], []
+    starts = np.array([w.days_from for w in windows], dtype=np.float64)
+    ends = np.array([w.days_to for w in windows], dtype=np.float64)
+    
+    days_ago = np.floor(
+        (reference_ts - np.asarray(timestamps, dtype=np.float64)) / SECONDS_PER_DAY
+    )
+    index = np.searchsorted(starts, days_ago, side="right") - 1
+    # 첫 윈도우 이전, 윈도우 사이 간격, NaN은 제외
+    with np.errstate(invalid="ignore"):
+        valid = (index >= 0) & (days_ago < ends[np.maximum(index, 0)])
+    index = index[valid]
+    success = np.asarray(successes, dtype=bool)[valid]
+    
+    counts = np.bincount(index, minlength=n)
+    success_counts = np.bincount(index[success], minlength=n)
+    return counts.tolist(), success_counts.tolist()
+
+
+def _window_counts_python(
+    timestamps: Sequence[float],
+    successes: Sequence[bool],
+    reference_ts: float,
+    windows: Sequence[DecayWindow]
+) -> Tuple[List[int], List[int]]:
+    """NumPy가 없을 때: bisect로 윈도우 배정"""
+    starts = [w.days_from for w in windows]
+    counts = [0] * len(windows)
+    success_counts = [0] * len(windows)
+    
+    for ts, success in zip(timestamps, successes):
+        if ts != ts:  # NaN
+            continue
+        days_ago = math.floor((reference_ts - ts) / SECONDS_PER_DAY)
+        i = bisect.bisect_right(starts, days_ago) - 1
+        if i < 0 or days_ago >= windows[i].days_to:
+            continue
+        counts[i] += 1
+        if success:
+            success_counts[i] += 1
+    
+    return counts, success_counts
+
+
 def _calculate_simple_success_rate(transactions: List[Dict]) -> float:
     """단순 성공률 계산 (Time Decay 없이)"""
     if not transactions:
@@ -139,3 +229,15 @@ def _parse_timestamp(ts: Any) -> Optional[datetime]:
         except ValueError:
             return None
     return None
+
+
+def _epoch_seconds(ts: Any) -> Optional[float]:
+    """타임스탬프를 Unix 초로 변환 (naive datetime은 UTC로 간주)"""
+    if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+        return float(ts)
+    parsed = _parse_timestamp(ts)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is not None:
+        return parsed.timestamp()
+    return (parsed - _EPOCH).total_seconds()
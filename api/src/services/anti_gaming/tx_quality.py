@@ -7,8 +7,12 @@ Transaction Quality Assessment
 원칙: "더스트 스팸 = 효과 없음"
 """
 
-from typing import List, Dict, Any
-from .config_loader import load_config, is_feature_enabled
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from ...data_sources.tx_stats import NUMPY_AVAILABLE
+from .config_loader import TxQualityConfig, get_snapshot, is_feature_enabled
+
+if NUMPY_AVAILABLE:
+    import numpy as np
 
 
 # 알려진 DeFi 프로토콜 컨트랙트 (샘플)
@@ -29,6 +33,9 @@ def assess_transaction_quality(
     """
     트랜잭션의 품질을 평가합니다.
     
+    주소를 인터닝해 컬럼으로 변환한 뒤
+    assess_transaction_quality_columns에 위임합니다.
+    
     Args:
         transactions: 트랜잭션 리스트
             [{
@@ -57,14 +64,69 @@ def assess_transaction_quality(
             "enabled": False
         }
     
-    config = load_config("tx_quality")
-    value_thresholds = config.get("value_thresholds", {})
-    value_weights = config.get("value_weights", {})
-    interaction_types = config.get("interaction_types", {})
-    diversity_config = config.get("diversity_bonus", {})
-    repetition_config = config.get("repetition_penalty", {})
+    values = []
+    from_ids = []
+    to_ids = []
+    has_input = []
+    successes = []
+    address_ids: Dict[str, int] = {}
     
-    if not transactions:
+    for tx in transactions:
+        input_data = tx.get("input")
+        values.append(tx.get("value", 0))
+        from_ids.append(_intern(address_ids, tx.get("from")))
+        to_ids.append(_intern(address_ids, tx.get("to")))
+        has_input.append(bool(input_data) and input_data != "0x")
+        successes.append(bool(tx.get("success", True)))
+    
+    return assess_transaction_quality_columns(
+        values, from_ids, to_ids, has_input, successes, list(address_ids)
+    )
+
+
+def assess_transaction_quality_columns(
+    values: Sequence[float],
+    from_ids: Sequence[int],
+    to_ids: Sequence[int],
+    has_input: Sequence[bool],
+    successes: Sequence[bool],
+    addresses: Sequence[str]
+) -> Dict[str, Any]:
+    """
+    컬럼 형식의 트랜잭션 품질을 평가합니다.
+    
+    주소는 정수 id로 인터닝되어 있으므로 DeFi 여부/프로토콜은 고유 주소마다
+    한 번만 확인하고, 금액 구간(searchsorted), 상호작용 유형(select),
+    컨트랙트별 반복 횟수(bincount)를 NumPy로 한 번에 계산합니다.
+    NumPy가 없으면 같은 결과를 행 단위로 계산합니다.
+    
+    Args:
+        values: 트랜잭션 금액 (USD)
+        from_ids: 보낸 주소 id
+        to_ids: 받는 주소 id
+        has_input: input data 유무 (컨트랙트 호출)
+        successes: 성공 여부
+        addresses: id → 소문자 주소 (인터닝 테이블)
+    
+    Returns:
+        assess_transaction_quality와 같은 형식의 결과
+    """
+    if not is_feature_enabled("tx_quality"):
+        total = len(successes)
+        return {
+            "quality_score": 50.0,  # 중립
+            "weighted_success_rate": sum(map(bool, successes)) / total if total else 0.0,
+            "diversity_bonus": 0,
+            "penalties": {},
+            "enabled": False
+        }
+    
+    config = get_snapshot().tx_quality
+    diversity_config = config.diversity_bonus
+    repetition_config = config.repetition_penalty
+    
+    tx_count = len(values)
+    if not tx_count:
         return {
             "quality_score": 0,
             "weighted_success_rate": 0,
@@ -72,50 +134,23 @@ def assess_transaction_quality(
             "penalties": {}
         }
     
-    total_quality_weight = 0.0
-    total_success_weight = 0.0
-    unique_protocols = set()
-    contract_counts = {}
+    # 고유 주소별 프로토콜 (없으면 None)
+    protocols = [KNOWN_DEFI_CONTRACTS.get(address) for address in addresses]
     
-    for tx in transactions:
-        # 1. 금액 기반 가중치
-        value_weight = _get_value_weight(
-            tx.get("value", 0),
-            value_thresholds,
-            value_weights
-        )
-        
-        # 2. 상호작용 유형 가중치
-        interaction_weight = _get_interaction_weight(
-            tx,
-            interaction_types
-        )
-        
-        # 3. 프로토콜 추적
-        protocol = _identify_protocol(tx)
-        if protocol:
-            unique_protocols.add(protocol)
-        
-        # 4. 반복 추적
-        contract = tx.get("to", "").lower()
-        contract_counts[contract] = contract_counts.get(contract, 0) + 1
-        
-        # 종합 가중치
-        tx_weight = value_weight * interaction_weight
-        total_quality_weight += tx_weight
-        
-        if tx.get("success", True):
-            total_success_weight += tx_weight
+    weigh = _weigh_numpy if NUMPY_AVAILABLE else _weigh_python
+    total_quality_weight, total_success_weight, unique_protocols, contract_counts = weigh(
+        values, from_ids, to_ids, has_input, successes, protocols, config
+    )
     
     # 다양성 보너스
     diversity_bonus = 0
     if diversity_config.get("enabled", False):
         min_protocols = diversity_config.get("min_unique_protocols", 3)
-        if len(unique_protocols) >= min_protocols:
+        if unique_protocols >= min_protocols:
             bonus_per = diversity_config.get("bonus_per_protocol", 2)
             max_bonus = diversity_config.get("max_bonus", 10)
             diversity_bonus = min(
-                (len(unique_protocols) - min_protocols + 1) * bonus_per,
+                (unique_protocols - min_protocols + 1) * bonus_per,
                 max_bonus
             )
     
@@ -126,14 +161,14 @@ def assess_transaction_quality(
         penalty_per = repetition_config.get("penalty_per_repeat", 0.05)
         max_penalty = repetition_config.get("max_penalty_percent", 30) / 100
         
-        for contract, count in contract_counts.items():
+        for count in contract_counts:
             if count > threshold:
                 repetition_penalty += (count - threshold) * penalty_per
         
         repetition_penalty = min(repetition_penalty, max_penalty)
     
     # 최종 점수 계산
-    base_quality = (total_quality_weight / len(transactions)) * 100 if transactions else 0
+    base_quality = (total_quality_weight / tx_count) * 100
     weighted_success = total_success_weight / total_quality_weight if total_quality_weight > 0 else 0
     
     quality_score = base_quality + diversity_bonus - (repetition_penalty * 100)
@@ -143,63 +178,131 @@ def assess_transaction_quality(
         "quality_score": quality_score,
         "weighted_success_rate": weighted_success,
         "diversity_bonus": diversity_bonus,
-        "unique_protocols": len(unique_protocols),
+        "unique_protocols": unique_protocols,
         "penalties": {
             "repetition": repetition_penalty * 100
         },
         "stats": {
-            "total_transactions": len(transactions),
-            "avg_value_weight": total_quality_weight / len(transactions) if transactions else 0
+            "total_transactions": tx_count,
+            "avg_value_weight": total_quality_weight / tx_count
         }
     }
 
 
+def _weigh_numpy(
+    values: Sequence[float],
+    from_ids: Sequence[int],
+    to_ids: Sequence[int],
+    has_input: Sequence[bool],
+    successes: Sequence[bool],
+    protocols: Sequence[Optional[str]],
+    config: TxQualityConfig
+) -> Tuple[float, float, int, List[int]]:
+    """(품질 가중치 합, 성공 가중치 합, 고유 프로토콜 수, 컨트랙트별 건수)"""
+    values = np.asarray(values, dtype=np.float64)
+    from_ids = np.asarray(from_ids, dtype=np.int64)
+    to_ids = np.asarray(to_ids, dtype=np.int64)
+    
+    # 1. 금액 기반 가중치: value < 상한인 첫 구간
+    uppers = np.array([upper for upper, _ in config.value_bands], dtype=np.float64)
+    band_weights = np.array([weight for _, weight in config.value_bands], dtype=np.float64)
+    bands = np.minimum(np.searchsorted(uppers, values, side="right"), len(uppers) - 1)
+    value_weights = band_weights[bands]
+    
+    # 2. 상호작용 유형 가중치 (self > DeFi > 컨트랙트 > 단순 전송)
+    codes: Dict[str, int] = {}
+    for protocol in protocols:
+        if protocol:
+            codes.setdefault(protocol, len(codes))
+    protocol_codes = np.array([codes[p] if p else -1 for p in protocols], dtype=np.int64)
+    to_protocols = protocol_codes[to_ids]
+    weights = config.interaction_weights
+    interaction_weights = np.select(
+        [from_ids == to_ids, to_protocols >= 0, np.asarray(has_input, dtype=bool)],
+        [weights["self_transfer"], weights["defi_interaction"], weights["contract_interaction"]],
+        default=weights["simple_transfer"]
+    )
+    
+    # 3. 프로토콜 다양성
+    unique_protocols = int(np.unique(to_protocols[to_protocols >= 0]).size)
+    
+    # 4. 컨트랙트(받는 주소)별 반복 횟수
+    contract_counts = np.bincount(to_ids)
+    
+    tx_weights = value_weights * interaction_weights
+    success_weight = tx_weights[np.asarray(successes, dtype=bool)].sum()
+    return (
+        float(tx_weights.sum()),
+        float(success_weight),
+        unique_protocols,
+        contract_counts[contract_counts > 0].tolist(),
+    )
+
+
+def _weigh_python(
+    values: Sequence[float],
+    from_ids: Sequence[int],
+    to_ids: Sequence[int],
+    has_input: Sequence[bool],
+    successes: Sequence[bool],
+    protocols: Sequence[Optional[str]],
+    config: TxQualityConfig
+) -> Tuple[float, float, int, List[int]]:
+    """NumPy가 없을 때: 행 단위로 계산"""
+    weights = config.interaction_weights
+    total_quality_weight = 0.0
+    total_success_weight = 0.0
+    unique_protocols = set()
+    contract_counts: Dict[int, int] = {}
+    
+    for value, from_id, to_id, called, success in zip(
+        values, from_ids, to_ids, has_input, successes
+    ):
+        protocol = protocols[to_id]
+        if from_id == to_id:
+            interaction_weight = weights["self_transfer"]
+        elif protocol:
+            interaction_weight = weights["defi_interaction"]
+        elif called:
+            interaction_weight = weights["contract_interaction"]
+        else:
+            interaction_weight = weights["simple_transfer"]
+        
+        if protocol:
+            unique_protocols.add(protocol)
+        contract_counts[to_id] = contract_counts.get(to_id, 0) + 1
+        
+        tx_weight = _get_value_weight(value, config.value_bands) * interaction_weight
+        total_quality_weight += tx_weight
+        if success:
+            total_success_weight += tx_weight
+    
+    return (
+        total_quality_weight,
+        total_success_weight,
+        len(unique_protocols),
+        list(contract_counts.values()),
+    )
+
+
+def _intern(address_ids: Dict[str, int], address: Optional[str]) -> int:
+    """소문자 주소를 정수 id로 인터닝"""
+    address = (address or "").lower()
+    address_id = address_ids.get(address)
+    if address_id is None:
+        address_id = address_ids[address] = len(address_ids)
+    return address_id
+
+
 def _get_value_weight(
     value_usd: float,
-    thresholds: Dict,
-    weights: Dict
+    value_bands: Sequence[Tuple[float, float]]
 ) -> float:
-    """금액 기반 가중치 반환"""
-    dust = thresholds.get("dust_usd", 0.01)
-    low = thresholds.get("low_usd", 1.0)
-    medium = thresholds.get("medium_usd", 10.0)
-    high = thresholds.get("high_usd", 100.0)
-    
-    if value_usd < dust:
-        return weights.get("dust", 0.05)
-    elif value_usd < low:
-        return weights.get("low", 0.3)
-    elif value_usd < medium:
-        return weights.get("medium", 0.7)
-    else:
-        return weights.get("high", 1.0)
-
-
-def _get_interaction_weight(tx: Dict, interaction_types: Dict) -> float:
-    """상호작용 유형 가중치 반환"""
-    from_addr = tx.get("from", "").lower()
-    to_addr = tx.get("to", "").lower()
-    
-    # 자기 자신에게 전송
-    if from_addr == to_addr:
-        return interaction_types.get("self_transfer", {}).get("weight", 0.1)
-    
-    # DeFi 프로토콜
-    if to_addr in KNOWN_DEFI_CONTRACTS:
-        return interaction_types.get("defi_interaction", {}).get("weight", 1.0)
-    
-    # 컨트랙트 상호작용 (input data 있음)
-    if tx.get("input") and tx.get("input") != "0x":
-        return interaction_types.get("contract_interaction", {}).get("weight", 0.7)
-    
-    # 단순 전송
-    return interaction_types.get("simple_transfer", {}).get("weight", 0.4)
-
-
-def _identify_protocol(tx: Dict) -> str:
-    """트랜잭션이 어떤 프로토콜과 상호작용하는지 식별"""
-    to_addr = tx.get("to", "").lower()
-    return KNOWN_DEFI_CONTRACTS.get(to_addr)
+    """금액 기반 가중치 반환 (구간: dust / low / medium / high)"""
+    for upper, weight in value_bands:
+        if value_usd < upper:
+            return weight
+    return value_bands[-1][1]
 
 
 def _simple_success_rate(transactions: List[Dict]) -> float:
@@ -0,0 +1,381 @@
+"""Daily per-agent transaction metrics for the anti-gaming checks.
+
+``detect_anomaly`` compares an agent's recent activity with its own past
+days, and ``calculate_consistency_bonus`` looks for long streaks of good
+days. Both need a per-day history, which ``DailyMetricsRollup`` derives
+from the local transaction store:
+
+- Each agent keeps per-chain daily outcome counts for the last
+  ``window_days`` days, plus the counts of the last 24 hours
+- A refresh only re-reads the store from the start of the last rolled
+  day, so repeat scorings read a day or two of rows instead of the
+  whole window. A chain whose synced range was widened backwards
+  (backfill) is rolled up again in full
+- Each agent also keeps a running baseline of its daily transaction
+  counts (Welford and exponentially weighted), updated as days become
+  final, so the anomaly checks do not rescan the history
+- At most ``max_agents`` agents are kept (least recently used first out)
+
+The rollup only sees what the store holds, so the transaction source
+must sync ``window_days`` of history rather than just the scoring window
+(``EtherscanClient(history_days=...)``); otherwise the longer
+consistency tiers never get enough days.
+
+Success rates are 0-1 fractions, as the consistency tiers expect
+(``TxSuccessStats.success_rate`` and the txSuccess result are 0-100).
+
+Example:
+    >>> rollup = DailyMetricsRollup(tx_store, chain_ids=[1, 8453])
+    >>> metrics = await rollup.get_metrics("0x123...")
+    >>> metrics.current["tx_count_24h"], len(metrics.history)
+    (12, 45)
+"""
+
+import time
+from collections import Counter, OrderedDict
+from copy import copy
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..data_sources.tx_stats import (
+    NUMPY_AVAILABLE,
+    SECONDS_PER_DAY,
+    TxSuccessStats,
+    daily_tx_success_stats,
+    windowed_tx_success_stats,
+)
+from ..data_sources.tx_store import TX_KINDS, TransactionStore
+from .anti_gaming.anomaly_detector import get_ewm_alpha
+from .anti_gaming.running_stats import EWMStats, MetricsBaseline
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+def _day_metrics(day: int, stats: TxSuccessStats) -> Dict[str, Any]:
+    """One day in the shape the anti-gaming functions expect (rate as 0-1)."""
+    return {
+        "date": datetime.fromtimestamp(day * SECONDS_PER_DAY, timezone.utc),
+        "tx_count": stats.total,
+        "tx_count_24h": stats.total,
+        "success_rate": stats.success_rate / 100,
+    }
+
+
+def _add(a: TxSuccessStats, b: TxSuccessStats) -> TxSuccessStats:
+    return TxSuccessStats(
+        successful=a.successful + b.successful,
+        failed=a.failed + b.failed,
+        pending=a.pending + b.pending,
+    )
+
+
+@dataclass
+class AgentMetrics:
+    """Metrics handed to the anti-gaming checks.
+
+    Attributes:
+        current: Last 24 hours (``tx_count``, ``tx_count_24h`` and, when
+            any transaction completed, ``success_rate`` as a 0-1 fraction)
+        history: Completed UTC days in the window, oldest first, from the
+            first day with activity (idle days included with zero counts)
+        baseline: Running daily statistics over the days of ``history``
+            (kept over the final days, with yesterday added on lookup) and
+            yesterday's success rate
+    """
+
+    current: Dict[str, Any]
+    history: List[Dict[str, Any]]
+    baseline: Optional[MetricsBaseline] = None
+
+
+@dataclass
+class DailyMetricsMatrix:
+    """Daily metrics of many agents, one row per agent.
+
+    Columns are the completed days of the window, oldest first; days
+    before an agent's first activity are NaN. Matrices are NumPy arrays
+    when NumPy is installed, nested lists otherwise.
+
+    Attributes:
+        addresses: Agent per row
+        tx_counts: Transactions per day
+        success_rates: Success rate per day (0-1)
+        current_tx_counts: Transactions in the last 24 hours
+        current_success_rates: Success rate in the last 24 hours (NaN
+            when nothing completed)
+    """
+
+    addresses: List[str]
+    tx_counts: Any
+    success_rates: Any
+    current_tx_counts: List[int]
+    current_success_rates: List[float]
+
+
+@dataclass
+class _ChainRollup:
+    """Rolled-up days of one agent on one chain."""
+
+    days: Dict[int, TxSuccessStats] = field(default_factory=dict)
+    last_day: Optional[int] = None  # re-read from this day on refresh
+    first_blocks: Tuple[Optional[int], ...] = ()
+    last_24h: TxSuccessStats = field(default_factory=TxSuccessStats)
+
+
+@dataclass
+class _AgentRollup:
+    """Rolled-up chains of one agent and the baseline of its final days."""
+
+    baseline: MetricsBaseline
+    chains: Dict[int, _ChainRollup] = field(default_factory=dict)
+    first_day: Optional[int] = None  # first day in the baseline
+    through_day: Optional[int] = None  # last day in the baseline
+
+
+class DailyMetricsRollup:
+    """Incrementally maintained daily metrics over a transaction store.
+
+    Args:
+        tx_store: Store the transaction source syncs histories into
+        chain_ids: Chains whose histories are combined per agent
+        window_days: Days of history kept per agent (the longest
+            consistency tier is 180 days; the tx source must sync as many)
+        max_agents: Agents kept in memory
+        ewm_alpha: Weight of the newest day in the exponentially weighted
+            baseline (default: the anomaly config's ``z_score.ewm_alpha``,
+            as used by ``detect_anomaly`` and ``detect_anomalies_batch``;
+            baselines are rebuilt when it changes on reload)
+    """
+
+    DEFAULT_WINDOW_DAYS = 180
+    DEFAULT_MAX_AGENTS = 10_000
+
+    def __init__(
+        self,
+        tx_store: TransactionStore,
+        chain_ids: Iterable[int],
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+        ewm_alpha: Optional[float] = None,
+    ):
+        self.tx_store = tx_store
+        self.chain_ids = list(chain_ids)
+        self.window_days = window_days
+        self.max_agents = max_agents
+        self.ewm_alpha = ewm_alpha
+        self.stats: Counter = Counter()
+        self._agents: "OrderedDict[str, _AgentRollup]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    async def refresh(self, address: str, now: Optional[int] = None) -> None:
+        """Roll up transactions stored since the last refresh of ``address``.
+
+        Args:
+            address: Agent address
+            now: Current Unix time (default: the wall clock)
+        """
+        address = address.lower()
+        now = int(time.time()) if now is None else now
+        today = now // SECONDS_PER_DAY
+        first_window_day = today - self.window_days + 1
+
+        alpha = get_ewm_alpha() if self.ewm_alpha is None else self.ewm_alpha
+        agent = self._agents.get(address) or _AgentRollup(self._new_baseline(alpha))
+        chains = agent.chains
+        # Drop days leaving the window while their counts are still rolled up
+        self._slide_baseline(agent, first_window_day)
+
+        rebuild = False
+        for chain_id in self.chain_ids:
+            first_blocks = tuple(
+                [
+                    await self.tx_store.get_first_block(chain_id, address, kind)
+                    for kind in TX_KINDS
+                ]
+            )
+            rollup = chains.get(chain_id)
+            if rollup is None or rollup.first_blocks != first_blocks:
+                # New agent, or the synced range grew backwards: roll up again
+                rollup = _ChainRollup(first_blocks=first_blocks)
+                self.stats["full_rollups"] += 1
+                rebuild = True
+            else:
+                self.stats["incremental_rollups"] += 1
+
+            start_day = min(
+                rollup.last_day if rollup.last_day is not None else first_window_day,
+                (now - SECONDS_PER_DAY) // SECONDS_PER_DAY,
+            )
+            start_day = max(start_day, first_window_day)
+            batch = await self.tx_store.get_batch(
+                chain_id, address, since_timestamp=start_day * SECONDS_PER_DAY
+            )
+            self.stats["rows_read"] += len(batch)
+
+            # Swap in the re-read days without awaiting in between
+            days = {
+                day: stats for day, stats in rollup.days.items()
+                if first_window_day <= day < start_day
+            }
+            days.update(daily_tx_success_stats(batch.timestamps, batch.statuses))
+            rollup.days = days
+            rollup.last_day = today
+            rollup.last_24h = windowed_tx_success_stats(
+                batch.timestamps, batch.statuses, [now - SECONDS_PER_DAY]
+            )[0]
+            chains[chain_id] = rollup
+
+        if rebuild or agent.baseline.tx_count_ewm.alpha != alpha:
+            agent.baseline = self._new_baseline(alpha)
+            agent.first_day = agent.through_day = None
+        # Days before yesterday are never re-read by later refreshes
+        self._extend_baseline(agent, today - 2)
+
+        self._agents[address] = agent
+        self._agents.move_to_end(address)
+        while len(self._agents) > self.max_agents:
+            self._agents.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def lookup(self, address: str, now: Optional[int] = None) -> Optional[AgentMetrics]:
+        """Metrics from the last refresh, or None if ``address`` is not rolled up.
+
+        Args:
+            address: Agent address
+            now: Current Unix time (default: the wall clock)
+        """
+        agent = self._agents.get(address.lower())
+        if agent is None:
+            return None
+        now = int(time.time()) if now is None else now
+        today = now // SECONDS_PER_DAY
+        first_window_day = today - self.window_days + 1
+
+        combined: Dict[int, TxSuccessStats] = {}
+        last_24h = TxSuccessStats()
+        for rollup in agent.chains.values():
+            last_24h = _add(last_24h, rollup.last_24h)
+            for day, stats in rollup.days.items():
+                if first_window_day <= day < today:
+                    combined[day] = _add(combined.get(day, TxSuccessStats()), stats)
+
+        current: Dict[str, Any] = {
+            "tx_count": last_24h.total,
+            "tx_count_24h": last_24h.total,
+        }
+        if last_24h.successful + last_24h.failed:
+            current["success_rate"] = last_24h.success_rate / 100
+
+        history = []
+        if combined:
+            history = [
+                _day_metrics(day, combined.get(day, TxSuccessStats()))
+                for day in range(min(combined), today)
+            ]
+        baseline = replace(
+            agent.baseline,
+            tx_count=copy(agent.baseline.tx_count),
+            tx_count_ewm=copy(agent.baseline.tx_count_ewm),
+            last_success_rate=history[-1]["success_rate"] if history else None,
+        )
+        # Add yesterday (not final yet) to a copy, so the baseline covers
+        # the same days as ``history`` and the batch scan's matrix
+        if agent.through_day is not None:
+            start = agent.through_day + 1
+        else:
+            start = min(combined, default=today)
+        for day in range(start, today):
+            baseline.push(self._day_total(agent, day))
+        return AgentMetrics(current=current, history=history, baseline=baseline)
+
+    @staticmethod
+    def _new_baseline(alpha: float) -> MetricsBaseline:
+        return MetricsBaseline(tx_count_ewm=EWMStats(alpha))
+
+    @staticmethod
+    def _day_total(agent: _AgentRollup, day: int) -> int:
+        return sum(
+            rollup.days[day].total for rollup in agent.chains.values() if day in rollup.days
+        )
+
+    def _slide_baseline(self, agent: _AgentRollup, first_window_day: int) -> None:
+        """Remove days before the window, then leading idle days, from the baseline.
+
+        The exponentially weighted baseline cannot forget single days; old
+        days fade out of it on their own.
+        """
+        while agent.first_day is not None and agent.first_day <= agent.through_day:
+            total = self._day_total(agent, agent.first_day)
+            if agent.first_day >= first_window_day and total:
+                return
+            agent.baseline.tx_count.remove(total)
+            agent.first_day += 1
+        if agent.first_day is not None:
+            agent.baseline = self._new_baseline(agent.baseline.tx_count_ewm.alpha)
+            agent.first_day = agent.through_day = None
+
+    def _extend_baseline(self, agent: _AgentRollup, last_day: int) -> None:
+        """Add the days up to ``last_day`` not yet in the baseline."""
+        if agent.through_day is not None:
+            start = agent.through_day + 1
+        else:
+            active = [
+                day
+                for rollup in agent.chains.values()
+                for day in rollup.days
+                if day <= last_day
+            ]
+            if not active:
+                return
+            start = agent.first_day = min(active)
+        for day in range(start, last_day + 1):
+            agent.baseline.push(self._day_total(agent, day))
+            agent.through_day = day
+
+    def daily_matrix(
+        self, addresses: Sequence[str], now: Optional[int] = None
+    ) -> DailyMetricsMatrix:
+        """Metrics of the last refresh of every address as one matrix.
+
+        Addresses that are not rolled up get an empty row.
+        """
+        columns = self.window_days - 1
+        if NUMPY_AVAILABLE:
+            tx_counts = np.full((len(addresses), columns), np.nan)
+            success_rates = np.full((len(addresses), columns), np.nan)
+        else:
+            tx_counts = [[float("nan")] * columns for _ in addresses]
+            success_rates = [[float("nan")] * columns for _ in addresses]
+        current_tx_counts = []
+        current_success_rates = []
+
+        for row, address in enumerate(addresses):
+            metrics = self.lookup(address, now)
+            if metrics is None:
+                current_tx_counts.append(0)
+                current_success_rates.append(float("nan"))
+                continue
+            current_tx_counts.append(metrics.current["tx_count"])
+            current_success_rates.append(metrics.current.get("success_rate", float("nan")))
+            # History is dense up to yesterday, i.e. the last column
+            offset = columns - len(metrics.history)
+            for column, day in enumerate(metrics.history, offset):
+                tx_counts[row][column] = day["tx_count"]
+                success_rates[row][column] = day["success_rate"]
+
+        return DailyMetricsMatrix(
+            addresses=list(addresses),
+            tx_counts=tx_counts,
+            success_rates=success_rates,
+            current_tx_counts=current_tx_counts,
+            current_success_rates=current_success_rates,
+        )
+
+    async def get_metrics(self, address: str, now: Optional[int] = None) -> AgentMetrics:
+        """Refresh ``address`` from the store and return its metrics."""
+        await self.refresh(address, now)
+        return self.lookup(address, now)
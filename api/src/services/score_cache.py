@@ -0,0 +1,406 @@
+"""Score result cache for AgentFICO scores.
+
+Sits in front of ``ScoreCalculator.calculate_score`` so that repeated
+requests for the same agent are served from memory instead of hitting
+Etherscan again. Entries are keyed by
+``(address, days, weights version, anti-gaming config version)`` and go
+through three states:
+
+- fresh (age < ttl): served directly
+- stale (ttl <= age < ttl + stale_ttl): served immediately while a
+  background task recomputes the score (stale-while-revalidate)
+- expired: recomputed before responding
+
+Degraded scores (a source missing from a partial score, or txSuccess
+built from stale stored history after a failed sync) are only kept for
+the short ``degraded_ttl`` and never served stale, so one upstream blip
+does not pin a degraded score for every caller.
+
+Storage is pluggable via ``ScoreCacheBackend``; the default backend is a
+bounded in-memory LRU.
+
+Lookups are also counted per address (``queries``) so a background
+refresher can prioritize popular agents (see ``score_scheduler``). The
+counter is bounded: once it tracks more than ``max_entries`` addresses
+it is trimmed to the most queried ones.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from ..calculator.score_calculator import (
+    AgentFICOScore,
+    BatchScoreResult,
+    ScoreCalculator,
+)
+
+logger = logging.getLogger(__name__)
+
+# (address, days, cache version)
+CacheKey = Tuple[str, int, str]
+
+
+def is_degraded(score: AgentFICOScore) -> bool:
+    """Whether a score was built from partial or stale source data."""
+    breakdown = score.breakdown or {}
+    if breakdown.get("partial"):
+        return True
+    tx_result = breakdown.get("sources", {}).get("txSuccess") or {}
+    return bool(tx_result.get("partial") or tx_result.get("stale"))
+
+
+@dataclass
+class CacheEntry:
+    """A cached score and when it was stored (monotonic seconds)."""
+
+    score: AgentFICOScore
+    stored_at: float
+    degraded: bool = False
+
+
+class ScoreCacheBackend(ABC):
+    """Storage interface for cached scores.
+
+    Subclasses implement plain synchronous key/value operations; expiry
+    and revalidation are handled by ``ScoreCache``.
+    """
+
+    @abstractmethod
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: CacheKey) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_address(self, address: str) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class LRUCacheBackend(ScoreCacheBackend):
+    """Bounded in-memory LRU backend.
+
+    Args:
+        max_entries: Maximum number of cached scores before the least
+            recently used entry is evicted
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: CacheKey) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def delete_address(self, address: str) -> int:
+        keys = [key for key in self._entries if key[0] == address]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ScoreCache:
+    """TTL + stale-while-revalidate cache in front of a ScoreCalculator.
+
+    Example:
+        >>> cache = ScoreCache(calculator, ttl=300)
+        >>> score = await cache.get_score("0x123...", days=30)
+        >>> score = await cache.refresh("0x123...", days=30)  # evict + recompute
+    """
+
+    DEFAULT_TTL = 300.0  # 5 minutes fresh
+    DEFAULT_STALE_TTL = 900.0  # then up to 15 minutes served stale
+    DEFAULT_DEGRADED_TTL = 30.0  # partial/stale scores: fresh only, briefly
+    DEFAULT_MAX_ENTRIES = 10_000
+
+    def __init__(
+        self,
+        calculator: ScoreCalculator,
+        backend: Optional[ScoreCacheBackend] = None,
+        ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        degraded_ttl: float = DEFAULT_DEGRADED_TTL,
+    ):
+        """Initialize the score cache.
+
+        Args:
+            calculator: Calculator used to compute missing/expired scores
+            backend: Storage backend (default: in-memory LRU)
+            ttl: Seconds a score is served without recomputation
+            stale_ttl: Extra seconds a score may be served while it is
+                being recomputed in the background
+            max_entries: Size bound for the default LRU backend
+            degraded_ttl: Seconds a partial or stale score is served; it
+                is recomputed (not served stale) afterwards
+        """
+        self.calculator = calculator
+        self.backend = backend or LRUCacheBackend(max_entries)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.degraded_ttl = degraded_ttl
+        self.stats: Counter = Counter()
+        # address -> recent lookups (aged by decay_queries, bounded)
+        self.queries: Counter = Counter()
+        self.max_tracked_queries = max_entries
+        self._revalidating: Dict[CacheKey, asyncio.Task] = {}
+
+    def _key(self, address: str, days: int) -> CacheKey:
+        return (address.lower(), days, self.calculator.cache_version)
+
+    async def get_score(self, address: str, days: int = 30) -> AgentFICOScore:
+        """Return a cached score, computing or revalidating as needed.
+
+        Args:
+            address: Agent Ethereum address
+            days: Analysis period in days
+
+        Returns:
+            AgentFICOScore (possibly stale while a refresh is in flight)
+        """
+        key = self._key(address, days)
+        cached = self._lookup(key, address, days)
+        if cached is not None:
+            return cached
+        return await self._compute(key, address, days)
+
+    async def get_scores(
+        self,
+        addresses: Iterable[str],
+        days: int = 30,
+        max_concurrency: Optional[int] = None,
+    ) -> BatchScoreResult:
+        """Return scores for many agents, computing only cache misses.
+
+        Fresh and stale entries are served from the cache (stale ones are
+        revalidated in the background); the remaining addresses are scored
+        through ``ScoreCalculator.calculate_scores`` and stored.
+
+        Args:
+            addresses: Agent Ethereum addresses
+            days: Analysis period in days
+            max_concurrency: Maximum scores computed concurrently
+
+        Returns:
+            BatchScoreResult with scores and per-address errors
+        """
+        result = BatchScoreResult()
+        async for address, score, error in self.iter_scores(
+            addresses, days, max_concurrency=max_concurrency
+        ):
+            if error is None:
+                result.scores[address] = score
+            else:
+                result.errors[address] = error
+        return result
+
+    async def iter_scores(
+        self,
+        addresses: Iterable[str],
+        days: int = 30,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, Optional[AgentFICOScore], Optional[str]]]:
+        """Yield scores for many agents, cached ones first.
+
+        Cache hits are yielded immediately; misses are streamed from
+        ``ScoreCalculator.iter_scores`` in completion order and stored.
+
+        Args:
+            addresses: Agent Ethereum addresses
+            days: Analysis period in days
+            max_concurrency: Maximum scores computed concurrently
+
+        Yields:
+            Tuples of (address, score, error); exactly one of ``score`` and
+            ``error`` is set
+        """
+        misses = []
+        for address in dict.fromkeys(a.lower() for a in addresses):
+            cached = self._lookup(self._key(address, days), address, days)
+            if cached is not None:
+                yield address, cached, None
+            else:
+                misses.append(address)
+
+        if not misses:
+            return
+
+        async for address, score, error in self.calculator.iter_scores(
+            misses, days, max_concurrency=max_concurrency
+        ):
+            if error is None:
+                self._store(self._key(address, days), score)
+            yield address, score, error
+
+    async def refresh(self, address: str, days: int = 30) -> AgentFICOScore:
+        """Evict the cached score and repopulate it with fresh data.
+
+        Args:
+            address: Agent Ethereum address
+            days: Analysis period in days
+
+        Returns:
+            Freshly calculated AgentFICOScore
+        """
+        key = self._key(address, days)
+        self.backend.delete(key)
+        self.stats["refreshes"] += 1
+        return await self._compute(key, address, days)
+
+    async def warm(self, address: str, days: int = 30) -> AgentFICOScore:
+        """Recompute and store a score, serving the old entry meanwhile.
+
+        Unlike ``refresh`` the cached entry is not evicted first, so
+        requests arriving during the recomputation are still cache hits.
+
+        Args:
+            address: Agent Ethereum address
+            days: Analysis period in days
+
+        Returns:
+            Freshly calculated AgentFICOScore
+        """
+        score = await self._compute(self._key(address, days), address, days)
+        self.stats["warmed"] += 1
+        return score
+
+    def age(self, address: str, days: int = 30) -> Optional[float]:
+        """Seconds since the cached score was stored, or None if not cached."""
+        entry = self.backend.get(self._key(address, days))
+        if entry is None:
+            return None
+        return time.monotonic() - entry.stored_at
+
+    def decay_queries(self, factor: float = 0.5, floor: float = 0.1) -> None:
+        """Age the per-address lookup counts so they track recent traffic.
+
+        Args:
+            factor: Multiplier applied to every count
+            floor: Counts that fall below this are forgotten
+        """
+        self.queries = Counter(
+            {
+                address: count * factor
+                for address, count in self.queries.items()
+                if count * factor >= floor
+            }
+        )
+
+    def _count_query(self, address: str) -> None:
+        """Count a lookup, keeping at most ``max_tracked_queries`` addresses."""
+        self.queries[address] += 1
+        if len(self.queries) > self.max_tracked_queries:
+            # Keep the top half so trimming does not run on every new address
+            self.queries = Counter(
+                dict(self.queries.most_common(max(1, self.max_tracked_queries // 2)))
+            )
+            self.stats["query_trims"] += 1
+
+    def invalidate(self, address: str, days: Optional[int] = None) -> int:
+        """Drop cached scores for an address.
+
+        Args:
+            address: Agent Ethereum address
+            days: Only drop the entry for this period (default: all periods)
+
+        Returns:
+            Number of evicted entries
+        """
+        if days is not None:
+            return int(self.backend.delete(self._key(address, days)))
+        return self.backend.delete_address(address.lower())
+
+    def clear(self) -> None:
+        """Drop every cached score."""
+        self.backend.clear()
+
+    def _lookup(self, key: CacheKey, address: str, days: int) -> Optional[AgentFICOScore]:
+        """Return a fresh or stale cached score, or None on a miss.
+
+        Stale hits schedule a background revalidation.
+        """
+        self._count_query(key[0])
+        entry = self.backend.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if entry.degraded:
+                # Never served stale: recompute once the short TTL is over
+                if age < self.degraded_ttl:
+                    self.stats["degraded_hits"] += 1
+                    return entry.score
+            elif age < self.ttl:
+                self.stats["hits"] += 1
+                return entry.score
+            elif age < self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._schedule_revalidation(key, address, days)
+                return entry.score
+
+        self.stats["misses"] += 1
+        return None
+
+    async def _compute(self, key: CacheKey, address: str, days: int) -> AgentFICOScore:
+        score = await self.calculator.calculate_score(address, days)
+        self._store(key, score)
+        return score
+
+    def _store(self, key: CacheKey, score: AgentFICOScore) -> None:
+        degraded = is_degraded(score)
+        if degraded:
+            self.stats["degraded_stored"] += 1
+        self.backend.set(
+            key, CacheEntry(score=score, stored_at=time.monotonic(), degraded=degraded)
+        )
+
+    def _schedule_revalidation(self, key: CacheKey, address: str, days: int) -> None:
+        """Recompute a stale entry in the background (at most once per key)."""
+        if key in self._revalidating:
+            return
+        task = asyncio.create_task(self._revalidate(key, address, days))
+        self._revalidating[key] = task
+
+    async def _revalidate(self, key: CacheKey, address: str, days: int) -> None:
+        try:
+            await self._compute(key, address, days)
+            self.stats["revalidations"] += 1
+        except Exception as e:
+            self.stats["revalidation_errors"] += 1
+            logger.warning(f"Background score refresh failed for {address}: {e}")
+        finally:
+            self._revalidating.pop(key, None)
@@ -0,0 +1,430 @@
+"""Append-only score history for AgentFICO scores.
+
+Every computed score is appended as a ``ScoreRecord``. Records are read
+newest first with keyset pagination: a page ends with an opaque cursor
+naming its last ``(recorded_at, id)``, and the next page seeks past it in
+the ``(address, recorded_at, id)`` index, so every page costs an index
+seek instead of an OFFSET scan. Long ranges can be downsampled into
+fixed-width time buckets (average scores, latest risk level).
+
+Two implementations are provided:
+- InMemoryScoreHistoryStore: process-local, for tests and development
+- SQLiteScoreHistoryStore: on-disk (WAL mode), shared by API restarts and
+  multiple uvicorn workers
+"""
+
+import asyncio
+import bisect
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScoreRecord:
+    """One computed score (or a downsampled bucket of them).
+
+    Attributes:
+        address: Agent address (lowercase)
+        recorded_at: When the score was computed (Unix milliseconds); for
+            a bucket, its latest record
+        days: Analysis period of the score
+        overall: Overall score (0-1000); bucket average
+        tx_success: Transaction success score (0-100)
+        x402_profitability: Payment profitability score (0-100)
+        erc8004_stability: Registry stability score (0-100)
+        risk_level: Risk level (1-5); latest in a bucket
+        confidence: Confidence in the score (0-100)
+        tx_count: Transactions in the scoring window
+        success_rate: Transaction success rate (0-100)
+        id: Store-assigned sequence number
+        samples: Records merged into this one by downsampling
+    """
+
+    address: str
+    recorded_at: int
+    days: int
+    overall: int
+    tx_success: int
+    x402_profitability: int
+    erc8004_stability: int
+    risk_level: int
+    confidence: int
+    tx_count: int = 0
+    success_rate: float = 0.0
+    id: Optional[int] = None
+    samples: int = 1
+
+
+@dataclass
+class ScoreHistoryPage:
+    """One page of score history, newest first.
+
+    Attributes:
+        records: Records (or buckets) on this page
+        next_cursor: Cursor for the following page, None on the last one
+        total_count: Records in the requested range (before downsampling),
+            None unless ``include_total`` was requested
+    """
+
+    records: List[ScoreRecord]
+    next_cursor: Optional[str]
+    total_count: Optional[int] = None
+
+
+def now_ms() -> int:
+    """Current time in Unix milliseconds."""
+    return int(time.time() * 1000)
+
+
+def encode_cursor(recorded_at: int, record_id: int) -> str:
+    """Encode a keyset position."""
+    return f"{recorded_at}.{record_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Decode a keyset position.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    recorded_at, _, record_id = cursor.partition(".")
+    return int(recorded_at), int(record_id)
+
+
+def _downsample(records: List[ScoreRecord], resolution_ms: int) -> List[ScoreRecord]:
+    """Merge newest-first records into buckets of ``resolution_ms``."""
+    buckets: List[List[ScoreRecord]] = []
+    current = None
+    for record in records:
+        bucket = record.recorded_at // resolution_ms
+        if bucket != current:
+            buckets.append([])
+            current = bucket
+        buckets[-1].append(record)
+    return [_merge(bucket) for bucket in buckets]
+
+
+def _merge(bucket: List[ScoreRecord]) -> ScoreRecord:
+    """Average a bucket of records; identity and risk from the latest."""
+    n = len(bucket)
+
+    def avg(name: str) -> int:
+        return round(sum(getattr(r, name) for r in bucket) / n)
+
+    return replace(
+        bucket[0],
+        overall=avg("overall"),
+        tx_success=avg("tx_success"),
+        x402_profitability=avg("x402_profitability"),
+        erc8004_stability=avg("erc8004_stability"),
+        confidence=avg("confidence"),
+        tx_count=avg("tx_count"),
+        success_rate=round(sum(r.success_rate for r in bucket) / n, 2),
+        samples=sum(r.samples for r in bucket),
+    )
+
+
+class ScoreHistoryStore(ABC):
+    """Storage interface for score history."""
+
+    # Raw records read per query while downsampling, and at most per page
+    DOWNSAMPLE_CHUNK = 1000
+    MAX_DOWNSAMPLE_ROWS = 100_000
+
+    @abstractmethod
+    async def append(self, record: ScoreRecord) -> ScoreRecord:
+        """Append a record and return it with its ``id`` set."""
+        pass
+
+    @abstractmethod
+    async def _page(
+        self,
+        address: str,
+        limit: int,
+        before: Optional[Tuple[int, int]],
+        since: Optional[int],
+        until: Optional[int],
+        days: Optional[int],
+    ) -> List[ScoreRecord]:
+        """Up to ``limit`` records newest first, strictly before ``before``."""
+        pass
+
+    @abstractmethod
+    async def count(
+        self,
+        address: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        days: Optional[int] = None,
+    ) -> int:
+        """Number of records in a range."""
+        pass
+
+    async def get_history(
+        self,
+        address: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        days: Optional[int] = None,
+        resolution: Optional[int] = None,
+        include_total: bool = False,
+    ) -> ScoreHistoryPage:
+        """Read one page of an agent's history, newest first.
+
+        Args:
+            address: Agent address
+            limit: Records (or buckets) per page
+            cursor: ``next_cursor`` of the previous page
+            since: Oldest record time to include (Unix milliseconds)
+            until: Newest record time to include (Unix milliseconds)
+            days: Only records for this analysis period
+            resolution: Bucket width in seconds to downsample into
+            include_total: Also count the records in the range. The count
+                scans the whole range, so request it once (e.g. on the
+                first page) rather than on every page
+
+        Returns:
+            ScoreHistoryPage
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        address = address.lower()
+        before = decode_cursor(cursor) if cursor else None
+        total = await self.count(address, since, until, days) if include_total else None
+
+        if not resolution:
+            records = await self._page(address, limit + 1, before, since, until, days)
+            next_cursor = None
+            if len(records) > limit:
+                records = records[:limit]
+                next_cursor = encode_cursor(records[-1].recorded_at, records[-1].id)
+            return ScoreHistoryPage(records, next_cursor, total)
+
+        # Read chunks until limit + 1 buckets are seen: the first ``limit``
+        # are then complete and the extra one proves there is another page
+        resolution_ms = resolution * 1000
+        rows: List[ScoreRecord] = []
+        seen_buckets = set()
+        position = before
+        exhausted = False
+        while len(rows) < self.MAX_DOWNSAMPLE_ROWS:
+            chunk = await self._page(
+                address, self.DOWNSAMPLE_CHUNK, position, since, until, days
+            )
+            rows.extend(chunk)
+            seen_buckets.update(r.recorded_at // resolution_ms for r in chunk)
+            if len(chunk) < self.DOWNSAMPLE_CHUNK:
+                exhausted = True
+                break
+            if len(seen_buckets) > limit:
+                break
+            position = (rows[-1].recorded_at, rows[-1].id)
+        buckets = _downsample(rows, resolution_ms)
+        next_cursor = None
+        if len(buckets) > limit:
+            buckets = buckets[:limit]
+            # Continue before the start of the last bucket on this page
+            last_start = (buckets[-1].recorded_at // resolution_ms) * resolution_ms
+            next_cursor = encode_cursor(last_start, 0)
+        elif not exhausted and rows:
+            # Stopped at MAX_DOWNSAMPLE_ROWS inside the last bucket: continue
+            # after the last row read, so the rest of it is the next page
+            next_cursor = encode_cursor(rows[-1].recorded_at, rows[-1].id)
+        return ScoreHistoryPage(buckets, next_cursor, total)
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemoryScoreHistoryStore(ScoreHistoryStore):
+    """Process-local history kept in per-address lists sorted by time."""
+
+    def __init__(self):
+        self._records: Dict[str, List[ScoreRecord]] = {}
+        self._keys: Dict[str, List[Tuple[int, int]]] = {}
+        self._next_id = 1
+        self._lock = asyncio.Lock()
+
+    async def append(self, record: ScoreRecord) -> ScoreRecord:
+        async with self._lock:
+            record = replace(record, address=record.address.lower(), id=self._next_id)
+            self._next_id += 1
+            keys = self._keys.setdefault(record.address, [])
+            index = bisect.bisect(keys, (record.recorded_at, record.id))
+            keys.insert(index, (record.recorded_at, record.id))
+            self._records.setdefault(record.address, []).insert(index, record)
+            return record
+
+    def _range(self, address, before, since, until, days) -> List[ScoreRecord]:
+        """Matching records, newest first."""
+        keys = self._keys.get(address, [])
+        records = self._records.get(address, [])
+        end = len(keys)
+        if before is not None:
+            end = bisect.bisect_left(keys, before)
+        if until is not None:
+            end = min(end, bisect.bisect_right(keys, (until, float("inf"))))
+        start = 0 if since is None else bisect.bisect_left(keys, (since, -1))
+        selected = records[start:end][::-1]
+        if days is not None:
+            selected = [r for r in selected if r.days == days]
+        return selected
+
+    async def _page(self, address, limit, before, since, until, days) -> List[ScoreRecord]:
+        return self._range(address, before, since, until, days)[:limit]
+
+    async def count(self, address, since=None, until=None, days=None) -> int:
+        return len(self._range(address.lower(), None, since, until, days))
+
+
+class SQLiteScoreHistoryStore(ScoreHistoryStore):
+    """On-disk score history backed by SQLite in WAL mode.
+
+    Pages are index seeks on ``(address, recorded_at, id)``. Blocking
+    SQLite calls run in a worker thread to keep the event loop responsive.
+
+    Args:
+        path: Database file path (parent directories are created)
+        busy_timeout: Seconds to wait for a lock held by another process
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS score_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            address TEXT NOT NULL,
+            recorded_at INTEGER NOT NULL,
+            days INTEGER NOT NULL,
+            overall INTEGER NOT NULL,
+            tx_success INTEGER NOT NULL,
+            x402_profitability INTEGER NOT NULL,
+            erc8004_stability INTEGER NOT NULL,
+            risk_level INTEGER NOT NULL,
+            confidence INTEGER NOT NULL,
+            tx_count INTEGER NOT NULL DEFAULT 0,
+            success_rate REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_score_history_address_time
+            ON score_history (address, recorded_at, id);
+    """
+
+    COLUMNS = (
+        "address, recorded_at, days, overall, tx_success, x402_profitability,"
+        " erc8004_stability, risk_level, confidence, tx_count, success_rate, id"
+    )
+
+    def __init__(self, path: Union[str, Path], busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (lazy initialization)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=self.busy_timeout,
+                check_same_thread=False,
+                isolation_level=None,  # autocommit; appends are single statements
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened score history at {self.path}")
+        return self._conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database call in a worker thread."""
+
+        def _locked():
+            with self._conn_lock:
+                return fn(self._connect(), *args)
+
+        return await asyncio.to_thread(_locked)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def append(self, record: ScoreRecord) -> ScoreRecord:
+        record = replace(record, address=record.address.lower())
+
+        def _insert(conn):
+            cursor = conn.execute(
+                "INSERT INTO score_history"
+                " (address, recorded_at, days, overall, tx_success, x402_profitability,"
+                " erc8004_stability, risk_level, confidence, tx_count, success_rate)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.address,
+                    record.recorded_at,
+                    record.days,
+                    record.overall,
+                    record.tx_success,
+                    record.x402_profitability,
+                    record.erc8004_stability,
+                    record.risk_level,
+                    record.confidence,
+                    record.tx_count,
+                    record.success_rate,
+                ),
+            )
+            return cursor.lastrowid
+
+        return replace(record, id=await self._run(_insert))
+
+    @staticmethod
+    def _where(address, before, since, until, days) -> Tuple[str, list]:
+        clause = "address = ?"
+        params: list = [address]
+        if before is not None:
+            clause += " AND (recorded_at, id) < (?, ?)"
+            params.extend(before)
+        if since is not None:
+            clause += " AND recorded_at >= ?"
+            params.append(since)
+        if until is not None:
+            clause += " AND recorded_at <= ?"
+            params.append(until)
+        if days is not None:
+            clause += " AND days = ?"
+            params.append(days)
+        return clause, params
+
+    async def _page(self, address, limit, before, since, until, days) -> List[ScoreRecord]:
+        clause, params = self._where(address, before, since, until, days)
+        query = (
+            f"SELECT {self.COLUMNS} FROM score_history WHERE {clause}"
+            " ORDER BY recorded_at DESC, id DESC LIMIT ?"
+        )
+
+        def _get(conn):
+            return conn.execute(query, [*params, limit]).fetchall()
+
+        return [ScoreRecord(*row) for row in await self._run(_get)]
+
+    async def count(self, address, since=None, until=None, days=None) -> int:
+        clause, params = self._where(address.lower(), None, since, until, days)
+
+        def _get(conn):
+            return conn.execute(
+                f"SELECT COUNT(*) FROM score_history WHERE {clause}", params
+            ).fetchone()[0]
+
+        return await self._run(_get)
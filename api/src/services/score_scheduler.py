@@ -0,0 +1,211 @@
+"""Background precomputation of scores for tracked agents.
+
+``ScoreRefreshScheduler`` runs as a long-lived asyncio task (started in
+the FastAPI lifespan) and keeps the score cache warm, so most requests
+are answered from the cache instead of computing inside the request.
+
+Each cycle it:
+
+1. Reloads the tracked agent set (e.g. every ERC-8004 registered wallet)
+   every ``agent_refresh_interval`` seconds
+2. Picks candidates from the tracked set and the most queried addresses
+   whose cached score is missing or will go stale soon
+3. Ranks them by staleness weighted by recent query popularity
+4. Refreshes as many as the Etherscan call budget allows for one cycle,
+   in the batch priority lane so interactive requests go first
+
+Example:
+    >>> scheduler = ScoreRefreshScheduler(cache, agent_source=list_all_agent_wallets)
+    >>> scheduler.start()
+    >>> ...
+    >>> await scheduler.stop()
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from ..data_sources.rate_limiter import Priority, RateLimiter, request_priority
+from .score_cache import ScoreCache
+
+logger = logging.getLogger(__name__)
+
+AgentSource = Callable[[], Awaitable[Iterable[str]]]
+
+
+class ScoreRefreshScheduler:
+    """Keeps cached scores of tracked and popular agents fresh.
+
+    Args:
+        cache: Score cache to keep warm
+        agent_source: Coroutine function returning the tracked addresses
+        days: Analysis period of the precomputed scores
+        interval: Seconds between the starts of two cycles
+        refresh_ahead: Refresh entries older than this fraction of the
+            cache TTL, so they are replaced before requests see them stale
+        rate_budget: Etherscan calls per second the scheduler may spend
+            (default: half of one key's rate)
+        calls_per_score: Etherscan calls one score costs (about three per
+            chain: block lookup, normal and internal transactions)
+        max_concurrency: Scores computed at once
+        agent_refresh_interval: Seconds between reloads of the tracked set
+        popularity_decay: Per-cycle multiplier applied to query counts
+    """
+
+    DEFAULT_INTERVAL = 30.0
+    DEFAULT_REFRESH_AHEAD = 0.8
+    DEFAULT_BUDGET_SHARE = 0.5
+    DEFAULT_CALLS_PER_SCORE = 3
+    DEFAULT_MAX_CONCURRENCY = 2
+    DEFAULT_AGENT_REFRESH_INTERVAL = 600.0
+    DEFAULT_POPULARITY_DECAY = 0.9
+
+    # Most queried (untracked) addresses considered per cycle
+    MAX_POPULAR = 1000
+
+    def __init__(
+        self,
+        cache: ScoreCache,
+        agent_source: Optional[AgentSource] = None,
+        days: int = 30,
+        interval: float = DEFAULT_INTERVAL,
+        refresh_ahead: float = DEFAULT_REFRESH_AHEAD,
+        rate_budget: Optional[float] = None,
+        calls_per_score: int = DEFAULT_CALLS_PER_SCORE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        agent_refresh_interval: float = DEFAULT_AGENT_REFRESH_INTERVAL,
+        popularity_decay: float = DEFAULT_POPULARITY_DECAY,
+    ):
+        self.cache = cache
+        self.agent_source = agent_source
+        self.days = days
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.rate_budget = (
+            rate_budget
+            if rate_budget is not None
+            else RateLimiter.DEFAULT_RATE * self.DEFAULT_BUDGET_SHARE
+        )
+        self.calls_per_score = max(1, calls_per_score)
+        self.max_concurrency = max(1, max_concurrency)
+        self.agent_refresh_interval = agent_refresh_interval
+        self.popularity_decay = popularity_decay
+        self.tracked: List[str] = []
+        self.stats: Counter = Counter()
+        self._agents_loaded_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def per_cycle(self) -> int:
+        """Scores refreshed per cycle within the call budget."""
+        return max(1, int(self.rate_budget * self.interval / self.calls_per_score))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def track(self, addresses: Iterable[str]) -> None:
+        """Add addresses to the tracked set."""
+        self.tracked = list(dict.fromkeys([*self.tracked, *(a.lower() for a in addresses)]))
+
+    async def reload_agents(self) -> None:
+        """Replace the tracked set from ``agent_source`` (kept on failure)."""
+        if self.agent_source is None:
+            return
+        self._agents_loaded_at = time.monotonic()
+        try:
+            addresses = await self.agent_source()
+        except Exception as e:
+            self.stats["agent_reload_errors"] += 1
+            logger.warning(f"Could not reload tracked agents: {e}")
+            return
+        self.tracked = list(dict.fromkeys(a.lower() for a in addresses))
+        logger.info(f"Tracking {len(self.tracked)} agents for score precomputation")
+
+    def plan(self) -> List[str]:
+        """Addresses to refresh this cycle, most urgent first.
+
+        Urgency is staleness (cache age over TTL; missing or expired
+        entries count as fully expired) times ``1 + log1p(queries)``.
+        """
+        ttl = self.cache.ttl
+        expired = (ttl + self.cache.stale_ttl) / ttl
+        candidates = dict.fromkeys(self.tracked)
+        candidates.update(
+            dict.fromkeys(a for a, _ in self.cache.queries.most_common(self.MAX_POPULAR))
+        )
+
+        due = []
+        for address in candidates:
+            age = self.cache.age(address, self.days)
+            if age is not None and age < ttl * self.refresh_ahead:
+                continue
+            staleness = expired if age is None else min(age / ttl, expired)
+            urgency = staleness * (1 + math.log1p(self.cache.queries.get(address, 0)))
+            due.append((urgency, address))
+
+        return [address for _, address in heapq.nlargest(self.per_cycle, due)]
+
+    async def run_once(self) -> int:
+        """Run one refresh cycle.
+
+        Returns:
+            Number of scores refreshed
+        """
+        addresses = self.plan()
+        if not addresses:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _refresh(address: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.cache.warm(address, self.days)
+                    return True
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.warning(f"Scheduled score refresh failed for {address}: {e}")
+                    return False
+
+        # Tasks started here inherit the batch lane
+        with request_priority(Priority.BATCH):
+            results = await asyncio.gather(*(_refresh(a) for a in addresses))
+
+        refreshed = sum(results)
+        self.stats["refreshed"] += refreshed
+        self.stats["cycles"] += 1
+        return refreshed
+
+    async def run(self) -> None:
+        """Refresh forever, one cycle every ``interval`` seconds."""
+        while True:
+            started = time.monotonic()
+            try:
+                if (
+                    self._agents_loaded_at is None
+                    or started - self._agents_loaded_at >= self.agent_refresh_interval
+                ):
+                    await self.reload_agents()
+                await self.run_once()
+                self.cache.decay_queries(self.popularity_decay)
+            except Exception:
+                logger.exception("Score refresh cycle failed")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> asyncio.Task:
+        """Start the background task (no-op if already running)."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,20 @@
+"""Shared test fixtures."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.data_sources.tx_stats import NUMPY_AVAILABLE
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def engine(request):
+    """Run each test with and without the NumPy path.
+
+    Patches ``NUMPY_AVAILABLE`` on the module named by the test module's
+    ``NUMPY_MODULE``. The NumPy run is skipped when NumPy is not installed.
+    """
+    if request.param and not NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    with patch.object(request.module.NUMPY_MODULE, "NUMPY_AVAILABLE", request.param):
+        yield request.param
@@ -0,0 +1,254 @@
+"""Tests for batch anomaly detection, anomaly flags and the scan job."""
+
+import math
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.calculator.score_calculator import ScoreCalculator
+from src.data_sources.tx_store import InMemoryTransactionStore
+from src.services.anomaly_flags import (
+    AnomalyFlag,
+    InMemoryAnomalyFlagStore,
+    SQLiteAnomalyFlagStore,
+)
+from src.services.anomaly_scan import AnomalyScanJob
+from src.services.anti_gaming import anomaly_detector
+from src.services.anti_gaming.anomaly_detector import detect_anomalies_batch, detect_anomaly
+from src.services.metrics_rollup import DailyMetricsRollup
+
+from .test_tx_store import make_tx
+
+NUMPY_MODULE = anomaly_detector  # patched by the engine fixture
+
+DAY = 86400
+TODAY = 20_000
+NOW = TODAY * DAY + 12 * 3600
+NAN = float("nan")
+
+ANOMALY_CONFIG = {
+    "enabled": True,
+    "detection_methods": {
+        "z_score": {"enabled": True, "threshold": 2.5, "min_samples": 5},
+        "rate_of_change": {"enabled": True, "max_weekly_increase_percent": 30},
+    },
+    "patterns": {"tx_burst": {"max_tx_count": 40, "window_hours": 24}},
+    "penalties": {"immediate_penalty_percent": 20, "flag_duration_days": 7},
+}
+
+
+@pytest.fixture(params=[{}, {"weighting": "ewm", "ewm_alpha": 0.2}], ids=["uniform", "ewm"])
+def config(request):
+    """Enable every check, with uniform and exponentially weighted z-scores."""
+    config = {
+        **ANOMALY_CONFIG,
+        "detection_methods": {
+            **ANOMALY_CONFIG["detection_methods"],
+            "z_score": {**ANOMALY_CONFIG["detection_methods"]["z_score"], **request.param},
+        },
+    }
+    with patch.object(anomaly_detector, "load_config", return_value=config):
+        yield config
+
+
+def population(agents=60, days=30, seed=5):
+    """Random daily matrices; each agent starts on a random day."""
+    rng = random.Random(seed)
+    tx_counts, success_rates, current, current_rates = [], [], [], []
+    for _ in range(agents):
+        start = rng.randint(0, days)
+        level = rng.randint(1, 20)
+        tx_counts.append([NAN] * start + [rng.randint(0, 2 * level) for _ in range(days - start)])
+        success_rates.append(
+            [NAN] * start + [round(rng.uniform(0.4, 1.0), 2) for _ in range(days - start)]
+        )
+        current.append(rng.choice([level, 3 * level, rng.randint(0, 60)]))
+        current_rates.append(rng.choice([NAN, round(rng.uniform(0.4, 1.0), 2)]))
+    return tx_counts, success_rates, current, current_rates
+
+
+def assert_results_equal(batch, single):
+    assert batch.keys() == single.keys()
+    for key in batch:
+        if key == "flags":
+            assert len(batch[key]) == len(single[key])
+            for a, b in zip(batch[key], single[key]):
+                assert a == pytest.approx(b)
+        else:
+            assert batch[key] == pytest.approx(single[key])
+
+
+class TestDetectAnomaliesBatch:
+    """detect_anomalies_batch matches detect_anomaly row by row."""
+
+    def test_matches_single_agent_detection(self, config, engine):
+        tx_counts, success_rates, current, current_rates = population()
+
+        results = detect_anomalies_batch(tx_counts, success_rates, current, current_rates)
+
+        assert any(r["is_anomaly"] for r in results)
+        assert not all(r["is_anomaly"] for r in results)
+        for i, result in enumerate(results):
+            history = [
+                {"tx_count": count, "success_rate": rate}
+                for count, rate in zip(tx_counts[i], success_rates[i])
+                if not math.isnan(count)
+            ]
+            metrics = {"tx_count": current[i]}
+            if not math.isnan(current_rates[i]):
+                metrics["success_rate"] = current_rates[i]
+            assert_results_equal(result, detect_anomaly("0xagent", metrics, history))
+
+    def test_empty_inputs(self, config, engine):
+        assert detect_anomalies_batch([], [], []) == []
+        results = detect_anomalies_batch([[], []], [[], []], [500, 0])
+        assert [r["is_anomaly"] for r in results] == [True, False]  # tx burst
+
+    def test_disabled(self, engine):
+        with patch.object(anomaly_detector, "is_feature_enabled", return_value=False):
+            results = detect_anomalies_batch([[1.0, 2.0]], [[1.0, 1.0]], [500])
+
+        assert results == [
+            {"is_anomaly": False, "anomaly_score": 0.0, "flags": [], "penalty_factor": 1.0}
+        ]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def flag_store(request, tmp_path):
+    """Each test runs against both implementations."""
+    if request.param == "memory":
+        yield InMemoryAnomalyFlagStore()
+    else:
+        store = SQLiteAnomalyFlagStore(tmp_path / "flags.db")
+        yield store
+        store.close()
+
+
+def make_flag(address="0xAgent", flagged_at=1_000, expires_at=2_000, penalty=0.9):
+    return AnomalyFlag(
+        address=address,
+        flagged_at=flagged_at,
+        expires_at=expires_at,
+        anomaly_score=0.5,
+        penalty_factor=penalty,
+        types=["z_score", "tx_burst"],
+    )
+
+
+class TestAnomalyFlagStore:
+    """Tests shared by every AnomalyFlagStore."""
+
+    @pytest.mark.asyncio
+    async def test_active_until_expiry(self, flag_store):
+        assert await flag_store.save_flags([make_flag()]) == 1
+
+        flag = await flag_store.get_flag("0xagent", at=1_500)
+
+        assert flag == make_flag(address="0xagent")
+        assert await flag_store.get_flag("0xAGENT", at=2_000) is None
+
+    @pytest.mark.asyncio
+    async def test_latest_flag_wins_and_purge(self, flag_store):
+        await flag_store.save_flags([make_flag(), make_flag("0xother", expires_at=5_000)])
+        await flag_store.save_flags([make_flag(flagged_at=3_000, expires_at=4_000, penalty=0.8)])
+
+        assert (await flag_store.get_flag("0xagent", at=3_500)).penalty_factor == 0.8
+        assert await flag_store.purge_expired(at=4_500) == 1
+        assert await flag_store.get_flag("0xother", at=4_500) is not None
+
+
+class TestAnomalyScanJob:
+    """The scan flags anomalous agents from the transaction store."""
+
+    @staticmethod
+    async def make_rollup(agents=(("0xsteady", 5), ("0xburst", 90)), max_agents=10_000):
+        """Agents with 20 quiet days; by default one bursts today."""
+        store = InMemoryTransactionStore()
+        block = 0
+        for address, today_count in agents:
+            txs = []
+            for day in range(1, 21):
+                for n in range(4 + day % 3):
+                    block += 1
+                    txs.append(make_tx(f"0x{block}", block, (TODAY - day) * DAY + n * 60))
+            for n in range(today_count):
+                block += 1
+                txs.append(make_tx(f"0x{block}", block, TODAY * DAY + n))
+            await store.save_transactions(1, address, "normal", txs, cursor=block)
+        return DailyMetricsRollup(store, chain_ids=[1], max_agents=max_agents)
+
+    @pytest.mark.asyncio
+    async def test_run_once_flags_and_calculator_applies(self, config):
+        rollup = await self.make_rollup()
+        flags = InMemoryAnomalyFlagStore()
+        job = AnomalyScanJob(
+            rollup, flags, agent_source=AsyncMock(return_value=["0xSTEADY", "0xburst"])
+        )
+
+        report = await job.run_once(now=NOW)
+
+        assert (report.agents, report.flagged, report.refresh_errors) == (2, 1, 0)
+        assert await flags.get_flag("0xsteady", at=NOW * 1000) is None
+        flag = await flags.get_flag("0xburst", at=NOW * 1000)
+        assert "tx_burst" in flag.types
+        assert flag.expires_at == (NOW + 7 * DAY) * 1000
+
+        # The calculator applies the stored flag while it is active
+        etherscan = MagicMock()
+        etherscan.get_agent_tx_success_score = AsyncMock(
+            return_value={"score": 90, "total_txs": 10, "success_rate": 92.0}
+        )
+        zero = MagicMock()
+        zero.calculate_profitability = AsyncMock(return_value={"score": 0})
+        zero.calculate_stability_score = AsyncMock(return_value={"score": 0})
+        calculator = ScoreCalculator(etherscan, zero, zero, anomaly_flags=flags)
+
+        with patch.object(
+            flags, "get_flag", AsyncMock(return_value=flag)
+        ), patch(
+            "src.calculator.score_calculator.detect_anomaly",
+            return_value={"is_anomaly": False},
+        ):
+            score = await calculator.calculate_score("0xburst")
+
+        assert score.overall == int(360 * flag.penalty_factor)
+
+    @pytest.mark.asyncio
+    async def test_live_baseline_matches_batch_z_score(self, config, engine):
+        """Live scoring and the scan see the same z-score, with the configured alpha."""
+        rollup = await self.make_rollup(agents=[("0xagent", 30)])
+        z_config = config["detection_methods"]["z_score"]
+
+        metrics = await rollup.get_metrics("0xagent", now=NOW)
+        live = detect_anomaly("0xagent", metrics.current, metrics.history, metrics.baseline)
+        matrix = rollup.daily_matrix(["0xagent"], now=NOW)
+        [batch] = detect_anomalies_batch(
+            matrix.tx_counts,
+            matrix.success_rates,
+            matrix.current_tx_counts,
+            matrix.current_success_rates,
+        )
+
+        def z_score(result):
+            return next(f["z_score"] for f in result["flags"] if f["type"] == "z_score")
+
+        assert metrics.baseline.tx_count_ewm.alpha == z_config.get("ewm_alpha", 0.1)
+        assert z_score(live) == pytest.approx(z_score(batch))
+
+    @pytest.mark.asyncio
+    async def test_registry_larger_than_rollup_is_chunked(self, config):
+        """Agents past max_agents are scanned in chunks, none read after eviction."""
+        agents = [(f"0xburst{i}", 90) for i in range(5)] + [("0xsteady", 5)]
+        rollup = await self.make_rollup(agents, max_agents=2)
+        flags = InMemoryAnomalyFlagStore()
+        job = AnomalyScanJob(
+            rollup, flags, agent_source=AsyncMock(return_value=[a for a, _ in agents])
+        )
+
+        report = await job.run_once(now=NOW)
+
+        assert (report.agents, report.flagged) == (6, 5)
+        for address, _ in agents[:5]:
+            assert await flags.get_flag(address, at=NOW * 1000) is not None
+        assert len(rollup) == 2
@@ -1,11 +1,49 @@
 """Tests for FastAPI endpoints."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from src.main import app
+from src import dependencies
+from src.data_sources.etherscan import EtherscanCircuitOpenError
+from src.main import app, lifespan
+from src.services.score_history import InMemoryScoreHistoryStore, ScoreRecord
+
+
+STORE_PATHS = {
+    "AGENTFICO_TX_STORE_PATH": "transactions.db",
+    "AGENTFICO_SCORE_HISTORY_PATH": "score_history.db",
+    "AGENTFICO_ANOMALY_FLAGS_PATH": "anomaly_flags.db",
+    "ETHERSCAN_RATE_LIMIT_PATH": "rate_limits.db",
+}
+STORE_GETTERS = (
+    dependencies.get_tx_store,
+    dependencies.get_score_history_store,
+    dependencies.get_anomaly_flag_store,
+    dependencies.get_rate_limit_backend,
+)
+
+
+def clear_singletons():
+    """Close the stores the app opened and forget every cached singleton."""
+    for getter in STORE_GETTERS:
+        if getter.cache_info().currsize:
+            getter().close()
+    for getter in vars(dependencies).values():
+        if hasattr(getter, "cache_clear"):
+            getter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def store_paths(tmp_path, monkeypatch):
+    """Keep the app's SQLite stores in a temporary directory, not api/data."""
+    for name, filename in STORE_PATHS.items():
+        monkeypatch.setenv(name, str(tmp_path / filename))
+    clear_singletons()
+    yield tmp_path
+    clear_singletons()
 
 
 @pytest.fixture
@@ -145,6 +183,44 @@ async def test_get_score_history(mock_etherscan_response):
         assert data["totalCount"] >= 1
 
 
+@pytest.mark.anyio
+async def test_get_score_history_pages():
+    """History pages are chained with nextCursor."""
+    store = InMemoryScoreHistoryStore()
+    address = "0x2222222222222222222222222222222222222222"
+    for i in range(3):
+        await store.append(
+            ScoreRecord(
+                address=address,
+                recorded_at=1_700_000_000_000 + i,
+                days=30,
+                overall=700 + i,
+                tx_success=90,
+                x402_profitability=0,
+                erc8004_stability=0,
+                risk_level=2,
+                confidence=60,
+            )
+        )
+
+    with patch("src.routes.score.get_score_history_store", return_value=store):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get(f"/v1/score/{address}/history?limit=2")
+            cursor = first.json()["nextCursor"]
+            second = await client.get(
+                f"/v1/score/{address}/history", params={"limit": 2, "cursor": cursor}
+            )
+            invalid = await client.get(f"/v1/score/{address}/history?cursor=bogus")
+
+    assert [item["overall"] for item in first.json()["history"]] == [702, 701]
+    assert first.json()["totalCount"] == 3
+    assert [item["overall"] for item in second.json()["history"]] == [700]
+    assert second.json()["totalCount"] is None  # only counted on the first page
+    assert second.json()["nextCursor"] is None
+    assert invalid.status_code == 400
+
+
 @pytest.mark.anyio
 async def test_refresh_score(mock_etherscan_response):
     """Test score refresh endpoint."""
@@ -165,6 +241,102 @@ async def test_refresh_score(mock_etherscan_response):
         assert "riskLevel" in data
 
 
+@pytest.mark.anyio
+async def test_batch_scores(mock_etherscan_response):
+    """Test batch score endpoint with duplicates and invalid addresses."""
+    with patch(
+        "src.data_sources.etherscan.EtherscanClient.get_agent_tx_success_score",
+        new_callable=AsyncMock,
+    ) as mock_eth:
+        mock_eth.return_value = mock_etherscan_response
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/v1/score/batch",
+                json={
+                    "addresses": [
+                        "0x2222222222222222222222222222222222222222",
+                        "0x3333333333333333333333333333333333333333",
+                        "0x2222222222222222222222222222222222222222",
+                        "invalid",
+                    ],
+                    "days": 30,
+                },
+            )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["successCount"] == 2
+        assert data["errorCount"] == 1
+        assert data["totalCount"] == 3
+        assert {r["agentAddress"] for r in data["results"]} == {
+            "0x2222222222222222222222222222222222222222",
+            "0x3333333333333333333333333333333333333333",
+        }
+        assert data["errors"][0]["error"] == "invalid_address"
+
+
+@pytest.mark.anyio
+async def test_batch_scores_validation():
+    """Test batch request validation."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/v1/score/batch", json={"addresses": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_stream_batch_scores(mock_etherscan_response):
+    """Test NDJSON streaming batch endpoint."""
+    with patch(
+        "src.data_sources.etherscan.EtherscanClient.get_agent_tx_success_score",
+        new_callable=AsyncMock,
+    ) as mock_eth:
+        mock_eth.return_value = mock_etherscan_response
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/v1/score/batch/stream",
+                json={
+                    "addresses": [
+                        "0x4444444444444444444444444444444444444444",
+                        "0x5555555555555555555555555555555555555555",
+                        "0x123",
+                    ],
+                },
+            )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        types = [line["type"] for line in lines]
+
+        assert types.count("result") == 2
+        assert types.count("error") == 1
+        assert types[-1] == "summary"
+        assert lines[-1]["successCount"] == 2
+        assert lines[-1]["errorCount"] == 1
+        assert all("overall" in line for line in lines if line["type"] == "result")
+
+
+@pytest.mark.anyio
+async def test_get_score_upstream_unavailable():
+    """An open Etherscan circuit maps to 503 with Retry-After."""
+    with patch(
+        "src.data_sources.etherscan.EtherscanClient.get_agent_tx_success_score",
+        new_callable=AsyncMock,
+    ) as mock_eth:
+        mock_eth.side_effect = EtherscanCircuitOpenError("suspended", retry_after=12.5)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/v1/score/0x6666666666666666666666666666666666666666"
+            )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "13"
+        assert response.json()["detail"]["error"] == "upstream_unavailable"
+
+
 @pytest.mark.anyio
 async def test_days_param_validation():
     """Test days parameter validation."""
@@ -181,3 +353,16 @@ async def test_days_param_validation():
             "/v1/score/0x1111111111111111111111111111111111111111?days=400"
         )
         assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_shutdown_skips_unused_singletons(monkeypatch):
+    """Shutdown does not build the tx source (or stores) just to close them."""
+    monkeypatch.setenv("ETHERSCAN_CHAINS", "not-a-chain")
+    monkeypatch.setenv("AG_CONFIG_POLL_INTERVAL", "0")
+
+    async with lifespan(app):
+        pass
+
+    assert dependencies.get_tx_source.cache_info().currsize == 0
+    assert dependencies.get_tx_store.cache_info().currsize == 0
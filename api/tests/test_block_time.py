@@ -0,0 +1,61 @@
+"""Tests for the timestamp to block resolution cache."""
+
+from src.data_sources.block_time import BlockTimeCache
+
+
+class TestBlockTimeCache:
+    """Tests for BlockTimeCache anchors and estimates."""
+
+    def test_empty_cache_has_no_estimate(self):
+        """Nothing is known before anchors are recorded."""
+        assert BlockTimeCache().estimate(1, 1_700_000_000) is None
+
+    def test_exact_anchor(self):
+        """A recorded timestamp resolves to its block."""
+        cache = BlockTimeCache()
+        cache.record(1, 1_700_000_000, 18_000_000)
+
+        assert cache.estimate(1, 1_700_000_000) == 18_000_000
+
+    def test_interpolation_is_conservative(self):
+        """Interpolated blocks lean towards the earlier anchor."""
+        cache = BlockTimeCache(slack=0.1)
+        cache.record(1, 1_700_000_000, 18_000_000)
+        cache.record(1, 1_700_003_600, 18_000_300)
+
+        # Linear estimate is 18_000_150; 10% slack gives back 15 blocks
+        assert cache.estimate(1, 1_700_001_800) == 18_000_135
+
+    def test_wide_span_falls_back_to_gap_rule(self):
+        """Anchors too far apart are not interpolated."""
+        cache = BlockTimeCache(max_span=3600, max_gap=600)
+        cache.record(1, 1_700_000_000, 18_000_000)
+        cache.record(1, 1_700_086_400, 18_007_200)
+
+        assert cache.estimate(1, 1_700_000_300) == 18_000_000
+        assert cache.estimate(1, 1_700_043_200) is None
+
+    def test_before_first_anchor_is_unknown(self):
+        """Timestamps older than every anchor need a lookup."""
+        cache = BlockTimeCache()
+        cache.record(1, 1_700_000_000, 18_000_000)
+
+        assert cache.estimate(1, 1_699_999_999) is None
+
+    def test_chains_are_isolated(self):
+        """Anchors of one chain are not used for another."""
+        cache = BlockTimeCache()
+        cache.record(1, 1_700_000_000, 18_000_000)
+
+        assert cache.estimate(8453, 1_700_000_000) is None
+
+    def test_oldest_anchors_evicted(self):
+        """The cache keeps at most max_anchors per chain."""
+        cache = BlockTimeCache(max_anchors=2, max_gap=0)
+        cache.record(1, 100, 1)
+        cache.record(1, 200, 2)
+        cache.record(1, 300, 3)
+
+        assert len(cache) == 2
+        assert cache.estimate(1, 100) is None
+        assert cache.estimate(1, 300) == 3
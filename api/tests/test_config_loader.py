@@ -0,0 +1,164 @@
+"""Tests for the compiled anti-gaming config snapshot and hot reload."""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services.anti_gaming import config_loader
+from src.services.anti_gaming.config_loader import (
+    ConfigWatcher,
+    get_coefficient,
+    get_config_version,
+    get_snapshot,
+    is_feature_enabled,
+    load_config,
+    reload_configs,
+    reload_if_changed,
+)
+from src.services.anti_gaming.consistency import calculate_consistency_bonus
+from src.services.anti_gaming.tx_quality import assess_transaction_quality
+
+TIME_DECAY = {
+    "enabled": True,
+    "decay_windows": [
+        {"name": "old", "days_from": 30, "days_to": None, "weight": 0.2},
+        {"name": "recent", "days_from": 0, "days_to": 30, "weight": 1.0},
+    ],
+    "min_transactions_per_window": 2,
+}
+
+CONSISTENCY = {
+    "enabled": True,
+    "tiers": [
+        {"name": "bronze", "required_days": 5, "bonus_points": 10},
+        {"name": "gold", "required_days": 20, "min_success_rate": 0.9, "bonus_points": 40},
+    ],
+    "max_total_bonus": 30,
+}
+
+
+def write_config(directory, name, config):
+    """Write a coefficient file atomically, as a deploy would."""
+    path = directory / "coefficients" / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(config))
+    os.replace(tmp, path)
+    return path
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """Point the loader at a temporary config directory."""
+    write_config(tmp_path, "time_decay", TIME_DECAY)
+    write_config(tmp_path, "consistency", CONSISTENCY)
+    monkeypatch.setattr(config_loader, "DEFAULT_CONFIG_PATH", str(tmp_path))
+    monkeypatch.delenv("AG_SYBIL_ENABLED", raising=False)
+    reload_configs()
+    yield tmp_path
+    monkeypatch.undo()
+    reload_configs()
+
+
+class TestConfigSnapshot:
+    """The snapshot compiles files (or defaults) into typed, frozen sections."""
+
+    def test_sections_are_sorted(self, config_dir):
+        snapshot = get_snapshot()
+
+        assert snapshot.source == config_dir
+        assert [w.name for w in snapshot.time_decay.windows] == ["recent", "old"]
+        assert snapshot.time_decay.windows[1].days_to == float("inf")
+        assert snapshot.time_decay.min_transactions_per_window == 2
+        assert snapshot.time_decay.no_activity_penalty == 0.9
+        assert [t.name for t in snapshot.consistency.tiers] == ["gold", "bronze"]
+        assert snapshot.consistency.tiers[1].min_success_rate == 0.8
+        # Missing files fall back to the defaults
+        assert snapshot.tx_quality.value_bands[0] == (0.01, 0.05)
+        assert snapshot.tx_quality.interaction_weights["self_transfer"] == 0.1
+
+    def test_is_immutable(self, config_dir):
+        with pytest.raises(TypeError):
+            load_config("time_decay")["enabled"] = False
+        with pytest.raises(AttributeError):
+            get_snapshot().version = 99
+
+    def test_get_coefficient(self, config_dir):
+        assert get_coefficient("time_decay", "decay_windows.1.name") == "recent"
+        assert get_coefficient("consistency", "max_total_bonus") == 30
+        assert get_coefficient("consistency", "tiers.5.name", "none") == "none"
+        assert get_coefficient("missing", "x") is None
+
+    def test_env_overrides_file(self, config_dir, monkeypatch):
+        assert is_feature_enabled("time_decay")
+        assert not is_feature_enabled("sybil")
+
+        monkeypatch.setenv("AG_SYBIL_ENABLED", "true")
+        monkeypatch.setenv("AG_TIME_DECAY_ENABLED", "0")
+        reload_configs()
+
+        assert is_feature_enabled("sybil")
+        assert not is_feature_enabled("time_decay")
+
+    def test_consumers_use_compiled_sections(self, config_dir):
+        now = datetime(2026, 1, 31)
+        history = [
+            {"date": now - timedelta(days=i), "success_rate": 0.95, "tx_count": 5}
+            for i in range(25)
+        ]
+
+        bonus = calculate_consistency_bonus(history, reference_date=now)
+
+        assert bonus["achieved_tier"] == "gold"
+        assert bonus["bonus_points"] == 30  # capped by max_total_bonus
+
+        quality = assess_transaction_quality(
+            [{"from": "0xa", "to": "0xa", "value": 0.001, "success": True}]
+        )
+        assert quality["quality_score"] == pytest.approx(0.05 * 0.1 * 100)
+
+
+class TestHotReload:
+    """Changed files are recompiled and bump the version."""
+
+    def test_reload_if_changed(self, config_dir):
+        version = get_config_version()
+        assert not reload_if_changed()
+
+        path = write_config(config_dir, "consistency", {**CONSISTENCY, "max_total_bonus": 70})
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert reload_if_changed()
+        assert get_config_version() == version + 1
+        assert get_snapshot().consistency.max_total_bonus == 70
+        assert not reload_if_changed()
+
+    def test_new_file_is_picked_up(self, config_dir):
+        version = get_config_version()
+        write_config(config_dir, "anomaly", {"enabled": False})
+
+        assert reload_if_changed()
+        assert get_config_version() == version + 1
+        assert not is_feature_enabled("anomaly")
+
+    @pytest.mark.asyncio
+    async def test_watcher_reloads(self, config_dir):
+        version = get_config_version()
+        watcher = ConfigWatcher(interval=0.01)
+        watcher.start()
+        try:
+            write_config(config_dir, "tx_quality", {"enabled": False})
+            for _ in range(200):
+                if get_config_version() > version:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await watcher.stop()
+
+        assert not watcher.running
+        assert get_config_version() == version + 1
+        assert not is_feature_enabled("tx_quality")
@@ -1,17 +1,54 @@
 """Tests for Etherscan API client."""
 
 import asyncio
+import json
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from src.data_sources.etherscan import (
     EtherscanAPIError,
+    EtherscanCircuitOpenError,
     EtherscanClient,
     EtherscanRateLimitError,
+    merge_transactions,
 )
-from src.models.transaction import Transaction, TransactionStatus
+from src.data_sources.rate_limiter import RateLimiter
+from src.data_sources.resilience import CircuitBreaker, RetryPolicy
+from src.models.transaction import (
+    STATUS_BY_CODE,
+    STATUS_CODES,
+    Transaction,
+    TransactionBatch,
+    TransactionStatus,
+    count_statuses,
+)
+
+
+def serve(client, payload, chunk_size=None):
+    """Answer the client's requests with ``payload`` through a mock transport.
+
+    Returns the list of requests made. With ``chunk_size`` the body is sent
+    in chunks of that many bytes.
+    """
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body = json.dumps(payload).encode()
+        if chunk_size is None:
+            return httpx.Response(200, content=body)
+
+        async def chunks():
+            for i in range(0, len(body), chunk_size):
+                yield body[i:i + chunk_size]
+
+        return httpx.Response(200, content=chunks())
+
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return requests
 
 
 class TestTransaction:
@@ -102,6 +139,80 @@ class TestTransaction:
         assert contract_tx.is_contract_interaction()
 
 
+class TestCompactTransaction:
+    """Tests for the slotted Transaction and the columnar TransactionBatch."""
+
+    @staticmethod
+    def _tx(i: int, status=TransactionStatus.SUCCESS) -> Transaction:
+        return Transaction(
+            hash=f"0x{i:064X}",
+            from_address="0xAGENT0000000000000000000000000000000001",
+            to_address="0xReceiver000000000000000000000000000002",
+            value=10**20,  # exceeds 64-bit
+            gas_used=21000,
+            gas_price=20000000000,
+            status=status,
+            timestamp=1706536800 + i,
+            block_number=19000000 + i,
+            method_id="0xa9059cbb",
+        )
+
+    def test_slotted_with_interned_addresses(self):
+        """Rows carry no __dict__ and share one string per address."""
+        first, second = self._tx(1), self._tx(2)
+
+        assert not hasattr(first, "__dict__")
+        assert first.from_address is second.from_address
+        assert first.hash == f"0x{1:064x}"
+
+    def test_status_codes(self):
+        """Statuses keep their string values; batches store txreceipt_status codes."""
+        assert TransactionStatus.SUCCESS.value == "success"
+        assert STATUS_CODES[TransactionStatus.SUCCESS] == 1
+        assert STATUS_CODES[TransactionStatus.FAILED] == 0
+        assert all(STATUS_BY_CODE[code] is status for status, code in STATUS_CODES.items())
+
+    def test_equality_and_repr(self):
+        """Transactions compare by value like the former dataclass."""
+        assert self._tx(1) == self._tx(1)
+        assert self._tx(1) != self._tx(2)
+        assert repr(self._tx(1)).startswith("Transaction(hash=")
+
+    def test_batch_roundtrip(self):
+        """A batch returns the same rows it was built from."""
+        txs = [self._tx(i) for i in range(3)]
+        odd = Transaction(
+            hash="0xnot_hex",
+            from_address="0xagent",
+            to_address="",
+            value=0,
+            gas_used=0,
+            gas_price=0,
+            status=TransactionStatus.PENDING,
+            timestamp=1,
+            block_number=1,
+        )
+
+        batch = TransactionBatch.from_transactions(txs + [odd])
+
+        assert len(batch) == 4
+        assert list(batch) == txs + [odd]
+        assert batch[-1].hash == "0xnot_hex"
+        assert len(batch._hashes) == 4 * TransactionBatch.HASH_SIZE
+
+    def test_batch_columns_for_scoring(self):
+        """Status counts and windows come straight from the columns."""
+        txs = [self._tx(i) for i in range(4)] + [self._tx(4, TransactionStatus.FAILED)]
+        batch = TransactionBatch.from_transactions(txs)
+
+        assert count_statuses(batch) == count_statuses(txs)
+        assert count_statuses(batch)[TransactionStatus.FAILED] == 1
+        assert len(batch.since(1706536800 + 3)) == 2
+
+        client = EtherscanClient(api_key="test_key")
+        assert client.calculate_success_rate(batch) == client.calculate_success_rate(txs) == 80.0
+
+
 class TestEtherscanClientRateLimiting:
     """Tests for rate limiting functionality."""
 
@@ -132,13 +243,25 @@ class TestEtherscanClientRateLimiting:
 
         start_time = time.monotonic()
 
-        # 6th call should wait
+        # 6th call should wait for the bucket to refill one token
         await client._rate_limit()
 
         elapsed = time.monotonic() - start_time
 
-        # Should have waited approximately 1 second
-        assert elapsed >= 0.9
+        # Should have waited approximately 1/5 second
+        assert elapsed >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_requests_use_key_from_limiter(self):
+        """The API key comes from the limiter's key pool."""
+        client = EtherscanClient(
+            api_key="unused", rate_limiter=RateLimiter(["pool_key"])
+        )
+        requests = serve(client, {"status": "1", "message": "OK", "result": []})
+
+        await client.get_transactions("0xagent")
+
+        assert requests[0].url.params["apikey"] == "pool_key"
 
 
 class TestEtherscanClientTransactionParsing:
@@ -204,11 +327,13 @@ class TestEtherscanClientTransactionParsing:
             "blockNumber": "19000000",
             "isError": "0",
             "input": "0x",
+            "traceId": "0_1",
         }
 
         tx = client._parse_transaction(tx_data, is_internal=True)
 
         assert tx.status == TransactionStatus.SUCCESS
+        assert tx.trace_id == "0_1"
 
     def test_parse_internal_transaction_failed(self):
         """Test parsing failed internal transaction."""
@@ -413,14 +538,13 @@ class TestEtherscanClientAPIRequests:
             ],
         }
 
-        with patch.object(client, "_make_request", new_callable=AsyncMock) as mock_req:
-            mock_req.return_value = mock_response
+        serve(client, mock_response)
 
-            transactions = await client.get_transactions("0xtest_address")
+        transactions = await client.get_transactions("0xtest_address")
 
-            assert len(transactions) == 1
-            assert transactions[0].hash == "0xtest"
-            assert transactions[0].status == TransactionStatus.SUCCESS
+        assert len(transactions) == 1
+        assert transactions[0].hash == "0xtest"
+        assert transactions[0].status == TransactionStatus.SUCCESS
 
     @pytest.mark.asyncio
     async def test_get_transactions_no_results(self):
@@ -429,12 +553,11 @@ class TestEtherscanClientAPIRequests:
 
         mock_response = {"status": "1", "message": "OK", "result": []}
 
-        with patch.object(client, "_make_request", new_callable=AsyncMock) as mock_req:
-            mock_req.return_value = mock_response
+        serve(client, mock_response)
 
-            transactions = await client.get_transactions("0xnew_address")
+        transactions = await client.get_transactions("0xnew_address")
 
-            assert len(transactions) == 0
+        assert len(transactions) == 0
 
     @pytest.mark.asyncio
     async def test_get_agent_tx_success_score(self):
@@ -473,11 +596,16 @@ class TestEtherscanClientAPIRequests:
 
         with patch.object(
             client, "get_all_transactions", new_callable=AsyncMock
-        ) as mock_get:
+        ) as mock_get, patch.object(
+            client, "get_block_by_timestamp", new_callable=AsyncMock
+        ) as mock_block:
             mock_get.return_value = mock_txs
+            mock_block.return_value = 18990000
 
             result = await client.get_agent_tx_success_score("0xtest_agent")
 
+            assert mock_get.call_args.kwargs["start_block"] == 18990000
+
             assert result["total_txs"] == 10
             assert result["successful_txs"] == 9
             assert result["failed_txs"] == 1
@@ -560,3 +688,574 @@ class TestEtherscanClientErrorHandling:
             )
 
             assert result["result"] == []
+
+
+class TestEtherscanClientConnectionPool:
+    """Tests for the shared HTTP connection pool."""
+
+    @pytest.mark.asyncio
+    async def test_http_client_reused_across_requests(self):
+        """Consecutive requests should share one pooled AsyncClient."""
+        client = EtherscanClient(api_key="test_key")
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"status": "1", "message": "OK", "result": []}
+        mock_response.raise_for_status = MagicMock()
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.is_closed = False
+            mock_client.get.return_value = mock_response
+            mock_client_class.return_value = mock_client
+
+            await client._make_request({"module": "account", "action": "txlist"})
+            await client._make_request({"module": "account", "action": "txlistinternal"})
+
+            assert mock_client_class.call_count == 1
+            assert mock_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_releases_pool(self):
+        """aclose() should close the pool and allow lazy re-creation."""
+        client = EtherscanClient(api_key="test_key")
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.is_closed = False
+            mock_client_class.return_value = mock_client
+
+            assert client._get_client() is mock_client
+            await client.aclose()
+
+            mock_client.aclose.assert_awaited_once()
+            assert client._client is None
+
+            client._get_client()
+            assert mock_client_class.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_without_requests(self):
+        """aclose() on an unused client should be a no-op."""
+        async with EtherscanClient(api_key="test_key") as client:
+            pass
+        assert client._client is None
+
+
+class TestEtherscanClientAllTransactions:
+    """Tests for combined normal + internal transaction fetching."""
+
+    @staticmethod
+    def _tx(hash_: str, timestamp: int) -> Transaction:
+        return Transaction(
+            hash=hash_,
+            from_address="0xsender",
+            to_address="0xreceiver",
+            value=0,
+            gas_used=21000,
+            gas_price=20000000000,
+            status=TransactionStatus.SUCCESS,
+            timestamp=timestamp,
+            block_number=19000000,
+        )
+
+    def test_merge_transactions_newest_first(self):
+        """Sorted lists are merged into a single newest-first list."""
+        normal = [self._tx("0xn3", 300), self._tx("0xn1", 100)]
+        internal = [self._tx("0xi4", 400), self._tx("0xi2", 200), self._tx("0xi0", 50)]
+
+        merged = merge_transactions(normal, internal)
+
+        assert [tx.timestamp for tx in merged] == [400, 300, 200, 100, 50]
+
+    @pytest.mark.asyncio
+    async def test_normal_and_internal_fetched_concurrently(self):
+        """Both transaction lists should be requested in parallel."""
+        client = EtherscanClient(api_key="test_key")
+
+        async def slow_normal(**kwargs):
+            await asyncio.sleep(0.2)
+            return [self._tx("0xn", 200)]
+
+        async def slow_internal(**kwargs):
+            await asyncio.sleep(0.2)
+            return [self._tx("0xi", 100)]
+
+        with patch.object(client, "get_transactions", side_effect=slow_normal), \
+                patch.object(client, "get_internal_transactions", side_effect=slow_internal):
+            start = time.monotonic()
+            txs = await client.get_all_transactions("0xagent")
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.35
+        assert [tx.hash for tx in txs] == ["0xn", "0xi"]
+
+    @pytest.mark.asyncio
+    async def test_internal_skipped_when_disabled(self):
+        """include_internal=False should only fetch normal transactions."""
+        client = EtherscanClient(api_key="test_key")
+
+        with patch.object(
+            client, "get_transactions", new_callable=AsyncMock
+        ) as mock_normal, patch.object(
+            client, "get_internal_transactions", new_callable=AsyncMock
+        ) as mock_internal:
+            mock_normal.return_value = [self._tx("0xn", 200)]
+
+            txs = await client.get_all_transactions("0xagent", include_internal=False)
+
+        assert len(txs) == 1
+        mock_internal.assert_not_called()
+
+
+class TestEtherscanClientPagination:
+    """Tests for walking past the 10,000-row page cap."""
+
+    @staticmethod
+    def _fake_etherscan(rows):
+        """Mimic Etherscan: filter by block window, sort, return first page."""
+        calls = []
+
+        async def fetch(address, start_block=0, end_block=99999999, page=1,
+                        offset=100, sort="desc"):
+            calls.append((start_block, end_block))
+            window = [tx for tx in rows if start_block <= tx.block_number <= end_block]
+            window.sort(key=lambda tx: tx.block_number, reverse=(sort == "desc"))
+            return window[:offset]
+
+        return fetch, calls
+
+    @staticmethod
+    def _rows(blocks):
+        return [
+            Transaction(
+                hash=f"0x{i:064x}",
+                from_address="0xagent",
+                to_address="0xreceiver",
+                value=0,
+                gas_used=21000,
+                gas_price=1,
+                status=TransactionStatus.SUCCESS,
+                timestamp=1_700_000_000 + block,
+                block_number=block,
+            )
+            for i, block in enumerate(blocks)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_desc_walk_collects_every_row(self):
+        """Full pages are followed by block-range splits without duplicates."""
+        # 3 rows per block across 10 blocks; pages of 4 split blocks
+        rows = self._rows([b for b in range(1, 11) for _ in range(3)])
+        client = EtherscanClient(api_key="test_key")
+        fetch, calls = self._fake_etherscan(rows)
+
+        with patch.object(client, "get_transactions", side_effect=fetch):
+            pages = [
+                page async for page in client.iter_transaction_pages("0xagent", page_size=4)
+            ]
+
+        collected = [tx for page in pages for tx in page.transactions]
+        assert len(collected) == len(rows)
+        assert len({tx.hash for tx in collected}) == len(rows)
+        assert [tx.block_number for tx in collected] == sorted(
+            (tx.block_number for tx in rows), reverse=True
+        )
+        assert pages[-1].last_page
+        assert len(calls) > 1
+        assert client.stats["paginated_walks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_rows_cap_truncates(self):
+        """The walk stops at max_rows and flags truncation."""
+        rows = self._rows(range(1, 51))
+        client = EtherscanClient(api_key="test_key", max_rows=12)
+        fetch, _ = self._fake_etherscan(rows)
+
+        with patch.object(client, "get_transactions", side_effect=fetch):
+            pages = [
+                page async for page in client.iter_transaction_pages("0xagent", page_size=5)
+            ]
+
+        assert sum(len(page.transactions) for page in pages) == 12
+        assert pages[-1].truncated
+        assert client.stats["walks_truncated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_iter_transactions_yields_rows(self):
+        """iter_transactions flattens pages in walk order."""
+        rows = self._rows(range(1, 8))
+        client = EtherscanClient(api_key="test_key")
+        fetch, _ = self._fake_etherscan(rows)
+
+        with patch.object(client, "get_transactions", side_effect=fetch):
+            blocks = [
+                tx.block_number
+                async for tx in client.iter_transactions("0xagent", sort="asc")
+            ]
+
+        assert blocks == list(range(1, 8))
+
+    @pytest.mark.asyncio
+    async def test_sync_walks_all_pages_and_sets_cursor(self):
+        """Incremental sync pages through history and ends at the last block."""
+        from src.data_sources.tx_store import NORMAL, InMemoryTransactionStore
+
+        rows = self._rows([b for b in range(1, 21) for _ in range(2)])
+        client = EtherscanClient(api_key="test_key", tx_store=InMemoryTransactionStore())
+        client.PAGE_SIZE = 5
+        fetch, _ = self._fake_etherscan(rows)
+
+        with patch.object(client, "get_transactions", side_effect=fetch):
+            counts = await client.sync_transactions("0xagent", include_internal=False)
+
+        assert counts == {NORMAL: len(rows)}
+        assert await client.tx_store.get_cursor(client.chain_id, "0xagent", NORMAL) == 20
+
+
+class TestEtherscanClientBlockResolution:
+    """Tests for resolving window cutoffs to start blocks."""
+
+    @pytest.mark.asyncio
+    async def test_get_block_by_timestamp(self):
+        """getblocknobytime is requested with the closest-before block."""
+        client = EtherscanClient(api_key="test_key")
+
+        with patch.object(client, "_make_request", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {"status": "1", "message": "OK", "result": "19000000"}
+
+            block = await client.get_block_by_timestamp(1706536800)
+
+        assert block == 19000000
+        params = mock_request.call_args.args[0]
+        assert params["action"] == "getblocknobytime"
+        assert params["closest"] == "before"
+
+    @pytest.mark.asyncio
+    async def test_resolution_is_cached(self):
+        """Nearby cutoffs are answered from the anchor cache."""
+        client = EtherscanClient(api_key="test_key")
+
+        with patch.object(
+            client, "get_block_by_timestamp", new_callable=AsyncMock
+        ) as mock_block:
+            mock_block.return_value = 19000000
+
+            first = await client.resolve_start_block(1706536800)
+            second = await client.resolve_start_block(1706536800 + 60)
+
+        assert first == second == 19000000
+        assert mock_block.await_count == 1
+        assert client.stats["block_lookups_cached"] == 1
+
+    @pytest.mark.asyncio
+    async def test_resolution_failure_falls_back_to_genesis(self):
+        """A failed lookup degrades to fetching the full history."""
+        client = EtherscanClient(api_key="test_key")
+
+        with patch.object(
+            client, "get_block_by_timestamp", new_callable=AsyncMock
+        ) as mock_block, patch.object(
+            client, "get_all_transactions", new_callable=AsyncMock
+        ) as mock_get:
+            mock_block.side_effect = EtherscanAPIError("API error: NOTOK")
+            mock_get.return_value = []
+
+            assert await client.resolve_start_block(1706536800) is None
+            await client.get_agent_tx_success_score("0xagent")
+
+        assert mock_get.call_args.kwargs["start_block"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fetched_rows_become_anchors(self):
+        """Transactions seen during a walk seed the anchor cache."""
+        client = EtherscanClient(api_key="test_key")
+        tx = Transaction(
+            hash="0x1",
+            from_address="0xagent",
+            to_address="0xreceiver",
+            value=0,
+            gas_used=21000,
+            gas_price=1,
+            status=TransactionStatus.SUCCESS,
+            timestamp=1706536800,
+            block_number=19000000,
+        )
+
+        with patch.object(client, "get_transactions", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = [tx]
+            await client.get_all_transactions("0xagent", include_internal=False)
+
+        assert client.block_times.estimate(client.chain_id, 1706536800) == 19000000
+
+
+class TestEtherscanClientResilience:
+    """Tests for retries, the circuit breaker and stale fallback."""
+
+    @staticmethod
+    def _response(status_code, json=None, headers=None):
+        return httpx.Response(
+            status_code,
+            json=json,
+            headers=headers,
+            request=httpx.Request("GET", EtherscanClient.BASE_URL),
+        )
+
+    OK = {"status": "1", "message": "OK", "result": []}
+
+    def _client(self, responses, **kwargs):
+        client = EtherscanClient(api_key="test_key", **kwargs)
+        http = MagicMock()
+        http.is_closed = False
+        http.get = AsyncMock(side_effect=responses)
+        client._client = http
+        return client
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_retried(self):
+        """5xx responses are retried until the call succeeds."""
+        client = self._client(
+            [self._response(502), self._response(503), self._response(200, self.OK)]
+        )
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+            data = await client._make_request({"action": "txlist"})
+
+        assert data == self.OK
+        assert sleep.await_count == 2
+        assert client.stats["retries"] == 2
+        assert client.stats["recovered_after_retry"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_header_honoured(self):
+        """HTTP 429 waits for the server's Retry-After hint."""
+        client = self._client([
+            self._response(429, headers={"Retry-After": "2"}),
+            self._response(200, self.OK),
+        ])
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await client._make_request({"action": "txlist"})
+
+        sleep.assert_awaited_once_with(2.0)
+
+    @pytest.mark.asyncio
+    async def test_api_errors_not_retried(self):
+        """Request errors reported by the API fail immediately."""
+        client = self._client([
+            self._response(200, {"status": "0", "message": "NOTOK", "result": "Invalid address"}),
+        ])
+
+        with pytest.raises(EtherscanAPIError):
+            await client._make_request({"action": "txlist"})
+
+        assert client.stats["retries"] == 0
+        assert client.stats["requests_failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self):
+        """The last error is raised once attempts run out."""
+        client = self._client(
+            [self._response(500)] * 2,
+            retry_policy=RetryPolicy(max_attempts=2),
+        )
+
+        with patch("asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client._make_request({"action": "txlist"})
+
+        assert client.stats["retries_exhausted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_and_fails_fast(self):
+        """Sustained failures open the circuit and later calls skip the API."""
+        client = self._client(
+            [self._response(503)] * 2,
+            retry_policy=RetryPolicy(max_attempts=5),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=30),
+        )
+
+        with patch("asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(EtherscanCircuitOpenError):
+                await client._make_request({"action": "txlist"})
+            with pytest.raises(EtherscanCircuitOpenError) as exc_info:
+                await client._make_request({"action": "txlist"})
+
+        assert client._client.get.await_count == 2
+        assert client.stats["circuit_opened"] == 1
+        assert client.stats["circuit_rejected"] == 2
+        assert exc_info.value.retry_after > 0
+
+    @pytest.mark.asyncio
+    async def test_stored_history_served_when_sync_fails(self):
+        """Scoring falls back to the stored history, flagged stale."""
+        from src.data_sources.tx_store import NORMAL, InMemoryTransactionStore
+
+        store = InMemoryTransactionStore()
+        tx = Transaction(
+            hash="0x1",
+            from_address="0xagent",
+            to_address="0xreceiver",
+            value=0,
+            gas_used=21000,
+            gas_price=1,
+            status=TransactionStatus.SUCCESS,
+            timestamp=int(time.time()) - 100,
+            block_number=100,
+        )
+        client = EtherscanClient(api_key="test_key", tx_store=store)
+        await store.save_transactions(client.chain_id, "0xagent", NORMAL, [tx], cursor=100)
+
+        with patch.object(
+            client, "_make_request", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.side_effect = EtherscanCircuitOpenError("suspended", retry_after=5)
+            result = await client.get_agent_tx_success_score("0xagent")
+
+        assert result["stale"] is True
+        assert result["total_txs"] == 1
+        assert client.stats["stale_served"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_covers_history_days(self):
+        """The sync reaches back history_days, the score stays on its window."""
+        from src.data_sources.tx_store import InMemoryTransactionStore
+
+        client = EtherscanClient(
+            api_key="test_key", tx_store=InMemoryTransactionStore(), history_days=180
+        )
+        cutoffs = []
+
+        async def resolve(timestamp):
+            cutoffs.append(timestamp)
+            return timestamp // 12
+
+        with patch.object(client, "resolve_start_block", side_effect=resolve), patch.object(
+            client, "sync_transactions", new_callable=AsyncMock
+        ) as sync:
+            result = await client.get_agent_tx_success_score("0xagent", days=30)
+
+        window, history = cutoffs
+        assert window - history == 150 * 86400
+        assert sync.await_args.kwargs["start_block"] == history // 12
+        assert result["period_days"] == 30
+
+    @pytest.mark.asyncio
+    async def test_sync_failure_without_history_raises(self):
+        """With nothing stored there is no fallback."""
+        from src.data_sources.tx_store import InMemoryTransactionStore
+
+        client = EtherscanClient(api_key="test_key", tx_store=InMemoryTransactionStore())
+
+        with patch.object(
+            client, "_make_request", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.side_effect = EtherscanCircuitOpenError("suspended")
+            with pytest.raises(EtherscanCircuitOpenError):
+                await client.get_agent_tx_success_score("0xagent")
+
+
+class TestEtherscanClientStreaming:
+    """Tests for streamed parsing of transaction lists."""
+
+    @staticmethod
+    def _rows(timestamps, status="1"):
+        return [
+            {
+                "hash": f"0x{i:064x}",
+                "from": "0xAgent",
+                "to": "0xreceiver",
+                "value": "0",
+                "gasUsed": "21000",
+                "gasPrice": "1",
+                "timeStamp": str(timestamp),
+                "blockNumber": str(timestamp),
+                "txreceipt_status": status,
+                "input": "0x",
+            }
+            for i, timestamp in enumerate(timestamps)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_chunked_body_parsed_row_by_row(self):
+        """A body split mid-row yields the same transactions."""
+        client = EtherscanClient(api_key="test_key")
+        rows = self._rows([300, 200, 100])
+        serve(client, {"status": "1", "message": "OK", "result": rows}, chunk_size=17)
+
+        txs = await client.get_transactions("0xagent")
+
+        assert [tx.timestamp for tx in txs] == [300, 200, 100]
+        assert txs[0].from_address == "0xagent"
+        assert client.stats["rows_streamed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_desc_stream_stops_at_window(self):
+        """Newest-first listings stop reading at the first older row."""
+        client = EtherscanClient(api_key="test_key")
+        rows = self._rows([300, 200, 100, 50])
+        serve(client, {"status": "1", "message": "OK", "result": rows}, chunk_size=64)
+
+        txs = await client.get_transactions("0xagent", since_timestamp=150)
+
+        assert [tx.timestamp for tx in txs] == [300, 200]
+        assert client.stats["streams_stopped_early"] == 1
+
+    @pytest.mark.asyncio
+    async def test_asc_stream_drops_old_rows(self):
+        """Oldest-first listings skip older rows and keep reading."""
+        client = EtherscanClient(api_key="test_key")
+        rows = self._rows([50, 100, 200, 300])
+        serve(client, {"status": "1", "message": "OK", "result": rows})
+
+        txs = await client.get_transactions("0xagent", sort="asc", since_timestamp=150)
+
+        assert [tx.timestamp for tx in txs] == [200, 300]
+        assert client.stats["streams_stopped_early"] == 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_api_errors(self):
+        """Error envelopes are still reported on the streamed path."""
+        client = EtherscanClient(api_key="test_key")
+        serve(client, {"status": "0", "message": "NOTOK", "result": "Invalid API Key"})
+
+        with pytest.raises(EtherscanAPIError, match="Invalid API Key"):
+            await client.get_transactions("0xagent")
+
+    @pytest.mark.asyncio
+    async def test_malformed_body(self):
+        """A body that is not a JSON envelope is an API error."""
+        client = EtherscanClient(api_key="test_key")
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"<html>"))
+        )
+
+        with pytest.raises(EtherscanAPIError, match="Malformed response"):
+            await client.get_transactions("0xagent")
+
+    @pytest.mark.asyncio
+    async def test_window_ends_walk(self):
+        """get_all_transactions stops paging once rows leave the window."""
+        client = EtherscanClient(api_key="test_key")
+        requests = serve(
+            client,
+            {"status": "1", "message": "OK", "result": self._rows([300, 200, 100])},
+        )
+
+        txs = await client.get_all_transactions(
+            "0xagent", include_internal=False, since_timestamp=150
+        )
+
+        assert [tx.timestamp for tx in txs] == [300, 200]
+        assert len(requests) == 1
+        assert "since_timestamp" not in requests[0].url.params
+
+    @pytest.mark.asyncio
+    async def test_window_requires_desc_walk(self):
+        """Ascending walks cannot end at a lower time bound."""
+        client = EtherscanClient(api_key="test_key")
+
+        with pytest.raises(ValueError):
+            async for _ in client.iter_transaction_pages(
+                "0xagent", sort="asc", since_timestamp=150
+            ):
+                pass
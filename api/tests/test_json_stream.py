@@ -0,0 +1,87 @@
+"""Tests for incremental Etherscan envelope parsing."""
+
+import json
+
+import pytest
+
+from src.data_sources.json_stream import EnvelopeParser
+
+
+def parse_in_chunks(text, size):
+    """Feed ``text`` in chunks of ``size`` characters; return (parser, rows)."""
+    parser = EnvelopeParser()
+    rows = []
+    for i in range(0, len(text), size):
+        rows.extend(parser.feed(text[i:i + size]))
+    rows.extend(parser.close())
+    return parser, rows
+
+
+class TestEnvelopeParser:
+    """Tests for EnvelopeParser."""
+
+    PAYLOAD = {
+        "status": "1",
+        "message": "OK",
+        "result": [
+            {"hash": "0x1", "timeStamp": "100", "input": "0xa9059cbb"},
+            {"hash": "0x2", "timeStamp": "90", "nested": {"a": [1, 2, {"b": "]}"}]}},
+        ],
+        "count": 12345,
+    }
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 64, 10_000])
+    def test_any_chunking(self, size):
+        """Rows and fields come out the same however the body is split."""
+        text = json.dumps(self.PAYLOAD, indent=1)
+
+        parser, rows = parse_in_chunks(text, size)
+
+        assert rows == self.PAYLOAD["result"]
+        assert parser.fields == {"status": "1", "message": "OK", "count": 12345}
+        assert parser.has_array
+        assert parser.rows == 2
+        assert parser.done
+
+    def test_rows_returned_as_they_complete(self):
+        """A row is available before the rest of the body arrives."""
+        parser = EnvelopeParser()
+
+        assert parser.feed('{"status": "1", "result": [{"hash": "0x1"}, {"ha') == [
+            {"hash": "0x1"}
+        ]
+        assert parser.feed('sh": "0x2"}]}') == [{"hash": "0x2"}]
+
+    def test_scalar_result_kept_as_field(self):
+        """An error message in ``result`` is a plain field."""
+        parser, rows = parse_in_chunks(
+            '{"status":"0","message":"NOTOK","result":"Max rate limit reached"}', 5
+        )
+
+        assert rows == []
+        assert not parser.has_array
+        assert parser.fields["result"] == "Max rate limit reached"
+
+    def test_number_split_across_chunks(self):
+        """A number at the end of a chunk waits for its remaining digits."""
+        parser = EnvelopeParser()
+        parser.feed('{"count": 12')
+        parser.feed("34}")
+        parser.close()
+
+        assert parser.fields["count"] == 1234
+
+    @pytest.mark.parametrize(
+        "text", ['{"result": [{"a": 1}', '["not", "an", "object"]', '{"a": 1} trailing']
+    )
+    def test_invalid_bodies_rejected(self, text):
+        """Truncated or malformed bodies raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_in_chunks(text, 4)
+
+    def test_pending_text_bounded(self):
+        """Garbage that never completes a value does not buffer forever."""
+        parser = EnvelopeParser(max_pending=16)
+
+        with pytest.raises(ValueError):
+            parser.feed('{"result": [' + "x" * 32)
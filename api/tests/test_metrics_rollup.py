@@ -0,0 +1,212 @@
+"""Tests for the daily per-agent metrics rollup."""
+
+import random
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.calculator.score_calculator import ScoreCalculator
+from src.data_sources.tx_store import INTERNAL, NORMAL, InMemoryTransactionStore
+from src.models.transaction import TransactionStatus
+from src.services.anti_gaming.running_stats import MetricsBaseline
+from src.services.metrics_rollup import DailyMetricsRollup
+
+from .test_tx_store import make_tx
+
+DAY = 86400
+TODAY = 20_000  # day number of "now"
+NOW = TODAY * DAY + 12 * 3600  # noon
+CHAIN = 1
+
+
+async def save(store, txs, kind=NORMAL, first_block=None, chain_id=CHAIN):
+    await store.save_transactions(
+        chain_id,
+        "0xagent",
+        kind,
+        txs,
+        cursor=max(tx.block_number for tx in txs),
+        first_block=first_block,
+    )
+
+
+def at(day, hour=0):
+    """Timestamp ``day`` days before today at ``hour``."""
+    return (TODAY - day) * DAY + hour * 3600
+
+
+class TestDailyMetricsRollup:
+    """Tests for DailyMetricsRollup."""
+
+    @pytest.mark.asyncio
+    async def test_daily_history_and_last_24h(self):
+        """Completed days are dense from the first active day; today is separate."""
+        store = InMemoryTransactionStore()
+        await save(
+            store,
+            [
+                make_tx("0x1", 1, at(3)),
+                make_tx("0x2", 2, at(3), TransactionStatus.FAILED),
+                make_tx("0x3", 3, at(1, 18)),
+                make_tx("0x4", 4, at(0, 6)),
+            ],
+        )
+        rollup = DailyMetricsRollup(store, chain_ids=[CHAIN])
+
+        metrics = await rollup.get_metrics("0xAGENT", now=NOW)
+
+        assert [d["tx_count"] for d in metrics.history] == [2, 0, 1]
+        assert [d["success_rate"] for d in metrics.history] == [0.5, 0.0, 1.0]
+        assert metrics.history[0]["date"].timestamp() == at(3)
+        # 18:00 yesterday and 06:00 today are within 24 hours of noon
+        assert metrics.current == {"tx_count": 2, "tx_count_24h": 2, "success_rate": 1.0}
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental(self):
+        """Repeat refreshes only read from the last rolled day."""
+        store = InMemoryTransactionStore()
+        await save(store, [make_tx(f"0x{i}", i, at(30 - i)) for i in range(20)])
+        rollup = DailyMetricsRollup(store, chain_ids=[CHAIN])
+
+        await rollup.refresh("0xagent", now=NOW)
+        assert rollup.stats["rows_read"] == 20
+
+        await save(store, [make_tx("0xnew", 100, NOW - 60)])
+        metrics = await rollup.get_metrics("0xagent", now=NOW + 3600)
+
+        assert rollup.stats["incremental_rollups"] == 1
+        assert rollup.stats["rows_read"] == 21  # only the new row
+        assert len(metrics.history) == 30
+        assert metrics.current["tx_count_24h"] == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_rolls_up_again(self):
+        """A history widened backwards is rolled up in full."""
+        store = InMemoryTransactionStore()
+        await save(store, [make_tx("0x1", 100, at(2))], first_block=100)
+        rollup = DailyMetricsRollup(store, chain_ids=[CHAIN])
+        await rollup.refresh("0xagent", now=NOW)
+
+        await save(store, [make_tx("0x0", 50, at(10))], first_block=50)
+        metrics = await rollup.get_metrics("0xagent", now=NOW)
+
+        assert rollup.stats["full_rollups"] == 2
+        assert len(metrics.history) == 10
+        assert metrics.history[0]["tx_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_chains_and_kinds_are_combined(self):
+        """Days add up across chains and internal transactions."""
+        store = InMemoryTransactionStore()
+        await save(store, [make_tx("0x1", 1, at(1))])
+        await save(store, [make_tx("0x2", 2, at(1))], kind=INTERNAL)
+        await save(store, [make_tx("0x3", 3, at(1))], chain_id=8453)
+        rollup = DailyMetricsRollup(store, chain_ids=[CHAIN, 8453])
+
+        metrics = await rollup.get_metrics("0xagent", now=NOW)
+
+        assert [d["tx_count"] for d in metrics.history] == [3]
+
+    @pytest.mark.asyncio
+    async def test_window_and_agent_bounds(self):
+        """Old days fall out of the window; least recently used agents are evicted."""
+        store = InMemoryTransactionStore()
+        await save(store, [make_tx("0x1", 1, at(10)), make_tx("0x2", 2, at(3))])
+        rollup = DailyMetricsRollup(store, chain_ids=[CHAIN], window_days=5, max_agents=1)
+
+        metrics = await rollup.get_metrics("0xagent", now=NOW)
+        assert [d["tx_count"] for d in metrics.history] == [1, 0, 0]
+
+        await rollup.refresh("0xother", now=NOW)
+        assert rollup.lookup("0xagent") is None
+        assert len(rollup) == 1
+        assert rollup.stats["evictions"] == 1
+
+
+class TestScoreCalculatorMetrics:
+    """The calculator feeds rollup metrics to the anti-gaming checks."""
+
+    @pytest.fixture
+    def calculator(self):
+        etherscan = MagicMock()
+        etherscan.get_agent_tx_success_score = AsyncMock(
+            return_value={"score": 90, "total_txs": 40, "success_rate": 92.0}
+        )
+        x402 = MagicMock()
+        x402.calculate_profitability = AsyncMock(return_value={"score": 0})
+        erc8004 = MagicMock()
+        erc8004.calculate_stability_score = AsyncMock(return_value={"score": 0})
+        return ScoreCalculator(etherscan, x402, erc8004)
+
+    @pytest.mark.asyncio
+    async def test_history_reaches_consistency_bonus(self, calculator):
+        store = InMemoryTransactionStore()
+        await save(
+            store,
+            [make_tx(f"0x{i}", i, int(time.time()) - i * DAY) for i in range(1, 40)],
+        )
+        calculator.metrics_rollup = DailyMetricsRollup(store, chain_ids=[CHAIN])
+
+        with patch(
+            "src.calculator.score_calculator.calculate_consistency_bonus",
+            return_value={"bonus_points": 0},
+        ) as bonus, patch(
+            "src.calculator.score_calculator.detect_anomaly",
+            return_value={"is_anomaly": False},
+        ) as anomaly:
+            await calculator.calculate_score("0xagent")
+
+        history = bonus.call_args.args[0]
+        assert len(history) >= 39
+        assert anomaly.call_args.args[2] is history
+
+    @pytest.mark.asyncio
+    async def test_rollup_failure_falls_back(self, calculator):
+        calculator.metrics_rollup = MagicMock()
+        calculator.metrics_rollup.get_metrics = AsyncMock(side_effect=RuntimeError("db"))
+
+        with patch(
+            "src.calculator.score_calculator.detect_anomaly",
+            return_value={"is_anomaly": False},
+        ) as anomaly:
+            score = await calculator.calculate_score("0xagent")
+
+        assert score.overall == 360
+        current, history = anomaly.call_args.args[1:]
+        assert current == {"tx_count": 40, "success_rate": 0.92}
+        assert history == []
+
+
+class TestRollupBaseline:
+    """The incremental baseline matches one built from the history."""
+
+    @pytest.mark.asyncio
+    async def test_baseline_tracks_history(self):
+        rng = random.Random(11)
+        store = InMemoryTransactionStore()
+        rollup = DailyMetricsRollup(store, chain_ids=[CHAIN], window_days=20)
+        block = 0
+
+        # Refresh at irregular intervals while the window slides
+        for day in range(-40, 1, 3):
+            txs = []
+            for _ in range(rng.randint(0, 6)):
+                block += 1
+                ts = (TODAY + day) * DAY + rng.randint(0, DAY - 1)
+                txs.append(make_tx(f"0x{block}", block, ts))
+            if txs:
+                await save(store, txs)
+            now = (TODAY + day) * DAY + DAY - 1
+            metrics = await rollup.get_metrics("0xagent", now=now)
+
+            expected = MetricsBaseline.from_history(metrics.history)
+            assert metrics.baseline.tx_count.count == expected.tx_count.count
+            assert metrics.baseline.tx_count.mean == pytest.approx(expected.tx_count.mean)
+            assert metrics.baseline.tx_count.variance == pytest.approx(
+                expected.tx_count.variance
+            )
+            if metrics.history:
+                assert metrics.baseline.last_success_rate == metrics.history[-1]["success_rate"]
+
+        assert rollup.stats["full_rollups"] == 1
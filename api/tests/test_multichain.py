@@ -0,0 +1,158 @@
+"""Tests for the multi-chain transaction success source."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.data_sources.etherscan import EtherscanCircuitOpenError, EtherscanClient
+from src.data_sources.multichain import MultiChainTxSource
+from src.data_sources.tx_store import InMemoryTransactionStore
+from src.dependencies import _tx_chains
+
+
+def chain_result(successful, failed, pending=0, **extra):
+    """A per-chain result as returned by EtherscanClient."""
+    total = successful + failed + pending
+    rate = successful / (successful + failed) * 100 if successful + failed else 0.0
+    return {
+        "address": "0xagent",
+        "total_txs": total,
+        "successful_txs": successful,
+        "failed_txs": failed,
+        "pending_txs": pending,
+        "success_rate": round(rate, 2),
+        "score": 0,
+        "period_days": 30,
+        "analyzed_at": "2026-01-29T12:00:00+00:00",
+        **extra,
+    }
+
+
+def fake_scores(source, results, delay=0.0):
+    """Patch each chain's client to return (or raise) ``results[chain]``."""
+    patches = []
+    for chain, client in source.clients.items():
+
+        async def score(address, days=30, include_internal=True, _result=results[chain]):
+            await asyncio.sleep(delay)
+            if isinstance(_result, Exception):
+                raise _result
+            return _result
+
+        patches.append(patch.object(client, "get_agent_tx_success_score", side_effect=score))
+    return patches
+
+
+async def run_with(source, results, delay=0.0):
+    patches = fake_scores(source, results, delay)
+    for p in patches:
+        p.start()
+    try:
+        return await source.get_agent_tx_success_score("0xAgent")
+    finally:
+        for p in patches:
+            p.stop()
+
+
+class TestMultiChainTxSource:
+    """Tests for MultiChainTxSource."""
+
+    def test_clients_share_limiter_store_and_cache(self):
+        """Every chain client uses the same limiter, store and block cache."""
+        store = InMemoryTransactionStore()
+        source = MultiChainTxSource.from_api_key("test_key", tx_store=store)
+
+        clients = list(source.clients.values())
+        assert source.chains == list(EtherscanClient.CHAIN_IDS)
+        assert {client.chain_id for client in clients} == set(
+            EtherscanClient.CHAIN_IDS.values()
+        )
+        assert all(client.rate_limiter is clients[0].rate_limiter for client in clients)
+        assert all(client.block_times is clients[0].block_times for client in clients)
+        assert all(client.tx_store is store for client in clients)
+
+    def test_unknown_chain_rejected(self):
+        """Chains must be known to the V2 API."""
+        with pytest.raises(ValueError, match="polygon"):
+            MultiChainTxSource.from_api_key("test_key", chains=["ethereum", "polygon"])
+
+    @pytest.mark.asyncio
+    async def test_combined_and_per_chain_stats(self):
+        """Counts are summed and the score comes from the combined rate."""
+        source = MultiChainTxSource.from_api_key("test_key", chains=["ethereum", "base"])
+
+        result = await run_with(
+            source,
+            {"ethereum": chain_result(9, 1), "base": chain_result(90, 0, pending=2)},
+        )
+
+        assert result["address"] == "0xagent"
+        assert result["total_txs"] == 102
+        assert result["successful_txs"] == 99
+        assert result["failed_txs"] == 1
+        assert result["pending_txs"] == 2
+        assert result["success_rate"] == 99.0
+        assert result["score"] == 100
+        assert result["chains"] == ["ethereum", "base"]
+        assert result["breakdown"]["ethereum"]["success_rate"] == 90.0
+        assert "partial" not in result
+
+    @pytest.mark.asyncio
+    async def test_chains_queried_concurrently(self):
+        """Latency is that of the slowest chain, not the sum."""
+        source = MultiChainTxSource.from_api_key("test_key")
+        results = {chain: chain_result(1, 0) for chain in source.chains}
+
+        start = time.monotonic()
+        await run_with(source, results, delay=0.1)
+
+        assert time.monotonic() - start < 0.1 * len(results) / 2
+
+    @pytest.mark.asyncio
+    async def test_failed_chain_gives_partial_result(self):
+        """Surviving chains are scored and the failure is reported."""
+        source = MultiChainTxSource.from_api_key("test_key", chains=["ethereum", "base"])
+
+        result = await run_with(
+            source,
+            {
+                "ethereum": chain_result(3, 1, stale=True),
+                "base": EtherscanCircuitOpenError("suspended"),
+            },
+        )
+
+        assert result["total_txs"] == 4
+        assert result["partial"] is True
+        assert result["errors"] == {"base": "suspended"}
+        assert result["stale"] is True
+        assert list(result["breakdown"]) == ["ethereum"]
+
+    @pytest.mark.asyncio
+    async def test_all_chains_failing_raises(self):
+        """With no chain scored the error propagates."""
+        source = MultiChainTxSource.from_api_key("test_key", chains=["ethereum", "base"])
+        error = EtherscanCircuitOpenError("suspended", retry_after=3)
+
+        with pytest.raises(EtherscanCircuitOpenError):
+            await run_with(source, {"ethereum": error, "base": error})
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, ["ethereum"]),
+        ({"ETHERSCAN_CHAIN": "base"}, ["base"]),
+        ({"ETHERSCAN_CHAINS": "all"}, ["ethereum", "base"]),
+        ({"ETHERSCAN_CHAINS": "ethereum, sepolia"}, ["ethereum", "sepolia"]),
+    ],
+)
+def test_tx_chains_default_to_mainnet(monkeypatch, env, expected):
+    """Testnets are only scored when listed by name."""
+    monkeypatch.delenv("ETHERSCAN_CHAIN", raising=False)
+    monkeypatch.delenv("ETHERSCAN_CHAINS", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    assert _tx_chains() == expected
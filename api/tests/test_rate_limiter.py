@@ -0,0 +1,143 @@
+"""Tests for the token-bucket rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.data_sources.rate_limiter import (
+    KeyBudget,
+    Priority,
+    RateLimiter,
+    SQLiteBucketBackend,
+    current_priority,
+    request_priority,
+    take_token,
+)
+
+
+class TestTakeToken:
+    """Tests for the bucket arithmetic."""
+
+    def test_new_buckets_start_full(self):
+        """A key that was never used has its whole burst available."""
+        state = {}
+        budgets = {"a": KeyBudget(rate=5, capacity=5)}
+
+        keys = [take_token(state, budgets, 1.0, now=0.0)[0] for _ in range(6)]
+
+        assert keys == ["a"] * 5 + [None]
+
+    def test_refill_and_wait(self):
+        """Empty buckets report the wait until the next token."""
+        state = {"a": (0.0, 0.0)}
+        budgets = {"a": KeyBudget(rate=5, capacity=5)}
+
+        key, wait = take_token(state, budgets, 1.0, now=0.1)
+        assert key is None
+        assert wait == pytest.approx(0.1)
+
+        key, _ = take_token(state, budgets, 1.0, now=0.2)
+        assert key == "a"
+
+    def test_fullest_key_is_used(self):
+        """Calls spread over the key with the most budget left."""
+        state = {"a": (1.0, 0.0), "b": (4.0, 0.0)}
+        budgets = {"a": KeyBudget(rate=5, capacity=5), "b": KeyBudget(rate=5, capacity=5)}
+
+        assert take_token(state, budgets, 1.0, now=0.0)[0] == "b"
+
+    def test_reserve_blocks_low_buckets(self):
+        """Batch calls leave the reserved tokens untouched."""
+        state = {"a": (1.5, 0.0)}
+        budgets = {"a": KeyBudget(rate=5, capacity=5)}
+
+        assert take_token(state, budgets, 2.0, now=0.0)[0] is None
+        assert take_token(state, budgets, 1.0, now=0.0)[0] == "a"
+
+
+class TestRateLimiter:
+    """Tests for key pools and priority lanes."""
+
+    def test_requires_keys(self):
+        """An empty key pool is rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter([])
+
+    def test_per_key_budgets(self):
+        """Mappings give each key its own rate."""
+        limiter = RateLimiter({"a": 5, "b": 2})
+
+        assert limiter.budgets["b"] == KeyBudget(rate=2, capacity=2)
+        assert limiter.total_rate == 7
+
+    @pytest.mark.asyncio
+    async def test_pool_multiplies_burst(self):
+        """Two keys allow twice the calls without waiting."""
+        limiter = RateLimiter(["a", "b"], rate=5)
+
+        start = time.monotonic()
+        keys = [await limiter.acquire() for _ in range(10)]
+
+        assert time.monotonic() - start < 0.1
+        assert keys.count("a") == keys.count("b") == 5
+
+    def test_priority_context(self):
+        """request_priority sets the lane for the enclosed code only."""
+        assert current_priority() == Priority.INTERACTIVE
+        with request_priority(Priority.BATCH):
+            assert current_priority() == Priority.BATCH
+        assert current_priority() == Priority.INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_interactive_preempts_batch(self):
+        """Waiting interactive calls are served before waiting batch calls."""
+        limiter = RateLimiter(["a"], rate=20, batch_reserve=0)
+        for _ in range(20):
+            await limiter.acquire()
+
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        batch = asyncio.ensure_future(call("batch", Priority.BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(call("interactive", Priority.INTERACTIVE))
+        await asyncio.gather(batch, interactive)
+
+        assert order == ["interactive", "batch"]
+
+
+class TestSQLiteBucketBackend:
+    """Tests for the cross-process SQLite backend."""
+
+    @pytest.mark.asyncio
+    async def test_buckets_shared_between_backends(self, tmp_path):
+        """Two limiters on the same file share one budget."""
+        first = SQLiteBucketBackend(tmp_path / "limits.db")
+        second = SQLiteBucketBackend(tmp_path / "limits.db")
+        try:
+            budgets = {"key": KeyBudget(rate=0.001, capacity=3)}
+            taken = [
+                (await backend.take(budgets, 1.0))[0]
+                for backend in (first, second, first, second)
+            ]
+        finally:
+            first.close()
+            second.close()
+
+        assert taken == ["key", "key", "key", None]
+
+    @pytest.mark.asyncio
+    async def test_keys_not_stored_in_clear(self, tmp_path):
+        """Only key hashes are written to the file."""
+        backend = SQLiteBucketBackend(tmp_path / "limits.db")
+        try:
+            await backend.take({"secret": KeyBudget(rate=5, capacity=5)}, 1.0)
+        finally:
+            backend.close()
+
+        for path in tmp_path.iterdir():  # database plus WAL files
+            assert b"secret" not in path.read_bytes()
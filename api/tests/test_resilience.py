@@ -0,0 +1,85 @@
+"""Tests for retry backoff and the circuit breaker."""
+
+import pytest
+
+from src.data_sources.resilience import CircuitBreaker, RetryPolicy
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRetryPolicy:
+    """Tests for jittered exponential backoff."""
+
+    def test_delay_within_exponential_ceiling(self):
+        """Each retry waits at most base * 2**attempt, capped at max_delay."""
+        policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+
+        for attempt, ceiling in [(0, 0.5), (1, 1.0), (2, 2.0), (5, 3.0)]:
+            delays = [policy.delay(attempt) for _ in range(50)]
+            assert all(0 <= d <= ceiling for d in delays)
+
+    def test_retry_after_hint_wins(self):
+        """A server hint replaces the computed backoff, within max_delay."""
+        policy = RetryPolicy(max_delay=10.0)
+
+        assert policy.delay(0, retry_after=2.5) == 2.5
+        assert policy.delay(0, retry_after=60) == 10.0
+
+
+class TestCircuitBreaker:
+    """Tests for circuit breaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the circuit."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+
+        assert [breaker.record_failure() for _ in range(3)] == [False, False, True]
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.retry_after == pytest.approx(10)
+
+    def test_success_resets_count(self):
+        """Failures must be consecutive to open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_lets_one_probe_through(self):
+        """After the timeout a single probe is allowed."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """A failing probe restarts the recovery timer."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.allow_request()
+        assert breaker.record_failure()
+
+        clock.now = 15
+        assert breaker.state == CircuitBreaker.OPEN
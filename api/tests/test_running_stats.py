@@ -0,0 +1,137 @@
+"""Tests for streaming statistics used by anomaly detection."""
+
+import random
+import statistics
+from unittest.mock import patch
+
+import pytest
+
+from src.services.anti_gaming import detect_anomaly
+from src.services.anti_gaming.running_stats import EWMStats, MetricsBaseline, RunningStats
+
+Z_SCORE_CONFIG = {
+    "enabled": True,
+    "detection_methods": {
+        "z_score": {"enabled": True, "threshold": 3.0, "min_samples": 10},
+        "rate_of_change": {"enabled": True, "max_weekly_increase_percent": 30},
+    },
+}
+
+
+class TestRunningStats:
+    """Tests for the Welford accumulator."""
+
+    def test_matches_statistics(self):
+        values = [random.Random(7).randint(0, 500) for _ in range(200)]
+
+        stats = RunningStats.from_values(values)
+
+        assert stats.count == 200
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.stdev == pytest.approx(statistics.stdev(values))
+
+    def test_remove_slides_the_window(self):
+        values = [3, 8, 1, 9, 4, 4, 12, 0]
+        stats = RunningStats.from_values(values)
+
+        for value in values[:5]:
+            stats.remove(value)
+
+        assert stats.count == 3
+        assert stats.mean == pytest.approx(statistics.mean(values[5:]))
+        assert stats.variance == pytest.approx(statistics.variance(values[5:]))
+
+    def test_small_counts(self):
+        stats = RunningStats()
+        assert stats.variance == 0.0
+        stats.push(5)
+        assert (stats.mean, stats.variance) == (5, 0.0)
+        stats.remove(5)
+        assert (stats.count, stats.mean) == (0, 0.0)
+
+
+class TestEWMStats:
+    """Tests for the exponentially weighted accumulator."""
+
+    def test_recent_values_dominate(self):
+        stats = EWMStats(alpha=0.5)
+        for value in [10] * 20 + [100] * 5:
+            stats.push(value)
+
+        assert stats.mean > 90
+        assert stats.stdev > 0
+
+    def test_constant_series(self):
+        stats = EWMStats(alpha=0.1)
+        for _ in range(10):
+            stats.push(7)
+
+        assert (stats.mean, stats.variance) == (7, 0.0)
+
+
+class TestDetectAnomalyBaseline:
+    """detect_anomaly gives the same result from a list or a baseline."""
+
+    @pytest.fixture(autouse=True)
+    def config(self):
+        with patch(
+            "src.services.anti_gaming.anomaly_detector.load_config",
+            return_value=Z_SCORE_CONFIG,
+        ):
+            yield
+
+    def history(self):
+        rng = random.Random(3)
+        return [
+            {"tx_count": rng.randint(8, 12), "success_rate": 0.9} for _ in range(30)
+        ]
+
+    def test_list_and_baseline_agree(self):
+        history = self.history()
+        current = {"tx_count": 40, "success_rate": 0.95}
+
+        from_list = detect_anomaly("0xagent", current, history)
+        from_baseline = detect_anomaly(
+            "0xagent", current, [], baseline=MetricsBaseline.from_history(history)
+        )
+
+        assert from_list["is_anomaly"]
+        assert from_list == from_baseline
+        z_flag = from_list["flags"][0]
+        counts = [m["tx_count"] for m in history]
+        expected = (40 - statistics.mean(counts)) / statistics.stdev(counts)
+        assert z_flag["z_score"] == pytest.approx(expected)
+
+    def test_too_few_samples(self):
+        result = detect_anomaly("0xagent", {"tx_count": 1000}, self.history()[:5])
+
+        assert all(flag["type"] != "z_score" for flag in result["flags"])
+
+    def test_rate_of_change_uses_latest_day(self):
+        history = self.history()
+        history[-1]["success_rate"] = 0.5
+
+        result = detect_anomaly("0xagent", {"tx_count": 10, "success_rate": 0.9}, history)
+
+        assert [flag["type"] for flag in result["flags"]] == ["rate_of_change"]
+
+    def test_ewm_weighting(self):
+        config = {
+            **Z_SCORE_CONFIG,
+            "detection_methods": {
+                "z_score": {"enabled": True, "threshold": 3.0, "weighting": "ewm"},
+            },
+        }
+        # The agent moved from ~10 to ~50 txs a day a month ago
+        history = [{"tx_count": 10 + i % 2} for i in range(60)] + [
+            {"tx_count": 50 + i % 3} for i in range(30)
+        ]
+        with patch(
+            "src.services.anti_gaming.anomaly_detector.load_config", return_value=config
+        ):
+            ewm = detect_anomaly("0xagent", {"tx_count": 10}, history)
+        uniform = detect_anomaly("0xagent", {"tx_count": 10}, history)
+
+        # Only the recency-weighted baseline sees the drop back to 10
+        assert ewm["is_anomaly"]
+        assert not uniform["is_anomaly"]
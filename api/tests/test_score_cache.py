@@ -0,0 +1,236 @@
+"""Tests for the score result cache."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.calculator.score_calculator import AgentFICOScore, RiskLevel, ScoreCalculator
+from src.services.score_cache import CacheEntry, LRUCacheBackend, ScoreCache
+
+
+def make_score(address: str = "0xagent", overall: int = 800) -> AgentFICOScore:
+    """Build a minimal AgentFICOScore."""
+    return AgentFICOScore(
+        agent_address=address,
+        overall=overall,
+        tx_success=80,
+        x402_profitability=80,
+        erc8004_stability=80,
+        risk_level=RiskLevel.GOOD,
+        confidence=80,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def calculator():
+    """Calculator whose calculate_score returns increasing overall scores."""
+    calc = ScoreCalculator(MagicMock(), MagicMock(), MagicMock())
+    counter = {"n": 0}
+
+    async def _calculate(address, days=30):
+        counter["n"] += 1
+        return make_score(address, overall=counter["n"])
+
+    calc.calculate_score = AsyncMock(side_effect=_calculate)
+    return calc
+
+
+class TestLRUCacheBackend:
+    """Tests for the in-memory LRU backend."""
+
+    def test_evicts_least_recently_used(self):
+        """Oldest untouched entry is evicted once the bound is exceeded."""
+        backend = LRUCacheBackend(max_entries=2)
+        entry = CacheEntry(score=make_score(), stored_at=0.0)
+
+        backend.set(("0xa", 30, "v"), entry)
+        backend.set(("0xb", 30, "v"), entry)
+        backend.get(("0xa", 30, "v"))  # touch a
+        backend.set(("0xc", 30, "v"), entry)
+
+        assert len(backend) == 2
+        assert backend.get(("0xb", 30, "v")) is None
+        assert backend.get(("0xa", 30, "v")) is not None
+
+    def test_delete_address_drops_all_periods(self):
+        """delete_address removes entries for every period."""
+        backend = LRUCacheBackend()
+        entry = CacheEntry(score=make_score(), stored_at=0.0)
+        backend.set(("0xa", 30, "v"), entry)
+        backend.set(("0xa", 90, "v"), entry)
+        backend.set(("0xb", 30, "v"), entry)
+
+        assert backend.delete_address("0xa") == 2
+        assert len(backend) == 1
+
+
+class TestScoreCache:
+    """Tests for TTL, stale-while-revalidate and refresh."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_calculation(self, calculator):
+        """Second read within TTL is served from the cache."""
+        cache = ScoreCache(calculator, ttl=60)
+
+        first = await cache.get_score("0xAgent", 30)
+        second = await cache.get_score("0xagent", 30)
+
+        assert first is second
+        assert calculator.calculate_score.await_count == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_days_are_part_of_key(self, calculator):
+        """Different analysis periods are cached separately."""
+        cache = ScoreCache(calculator, ttl=60)
+
+        await cache.get_score("0xagent", 30)
+        await cache.get_score("0xagent", 90)
+
+        assert calculator.calculate_score.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_revalidated(self, calculator):
+        """Stale entries are returned immediately and refreshed in background."""
+        cache = ScoreCache(calculator, ttl=0.01, stale_ttl=60)
+
+        first = await cache.get_score("0xagent")
+        await asyncio.sleep(0.02)
+
+        stale = await cache.get_score("0xagent")
+        assert stale is first
+        assert cache.stats["stale_hits"] == 1
+
+        # Let the background revalidation finish
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert calculator.calculate_score.await_count == 2
+
+        refreshed = await cache.get_score("0xagent")
+        assert refreshed.overall == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_recomputed(self, calculator):
+        """Entries past ttl + stale_ttl are recomputed synchronously."""
+        cache = ScoreCache(calculator, ttl=0.01, stale_ttl=0.01)
+
+        await cache.get_score("0xagent")
+        await asyncio.sleep(0.03)
+        score = await cache.get_score("0xagent")
+
+        assert score.overall == 2
+        assert cache.stats["misses"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "breakdown",
+        [
+            {"partial": True, "missing": ["x402_profitability"]},
+            {"sources": {"txSuccess": {"score": 90, "stale": True}}},
+            {"sources": {"txSuccess": {"score": 90, "partial": True}}},
+        ],
+        ids=["missing-source", "stale-history", "failed-chain"],
+    )
+    async def test_degraded_score_not_served_stale(self, calculator, breakdown):
+        """Partial or stale-data scores get the short TTL and no stale serving."""
+        degraded = make_score()
+        degraded.breakdown = breakdown
+        calculator.calculate_score.side_effect = [degraded, make_score(overall=2)]
+        cache = ScoreCache(calculator, ttl=60, stale_ttl=60, degraded_ttl=0.01)
+
+        assert await cache.get_score("0xagent") is degraded
+        assert await cache.get_score("0xagent") is degraded  # within degraded_ttl
+        await asyncio.sleep(0.02)
+        score = await cache.get_score("0xagent")
+
+        assert score.overall == 2
+        assert cache.stats["degraded_hits"] == 1
+        assert cache.stats["stale_hits"] == 0
+        assert calculator.calculate_score.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_evicts_and_repopulates(self, calculator):
+        """refresh() recomputes even when a fresh entry exists."""
+        cache = ScoreCache(calculator, ttl=60)
+
+        await cache.get_score("0xagent")
+        refreshed = await cache.refresh("0xagent")
+        cached = await cache.get_score("0xagent")
+
+        assert refreshed.overall == 2
+        assert cached is refreshed
+        assert calculator.calculate_score.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_weight_change_invalidates(self, calculator):
+        """Changing weights changes the cache key."""
+        cache = ScoreCache(calculator, ttl=60)
+
+        await cache.get_score("0xagent")
+        calculator.weights = {
+            "tx_success": 0.5,
+            "x402_profitability": 0.3,
+            "erc8004_stability": 0.2,
+        }
+        score = await cache.get_score("0xagent")
+
+        assert score.overall == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, calculator):
+        """invalidate() drops entries for an address."""
+        cache = ScoreCache(calculator, ttl=60)
+
+        await cache.get_score("0xagent", 30)
+        await cache.get_score("0xagent", 90)
+
+        assert cache.invalidate("0xAGENT") == 2
+        assert len(cache.backend) == 0
+
+    @pytest.mark.asyncio
+    async def test_warm_keeps_serving_old_entry(self, calculator):
+        """warm() replaces the entry without a miss in between."""
+        cache = ScoreCache(calculator, ttl=60)
+        await cache.get_score("0xagent")
+
+        warming = asyncio.ensure_future(cache.warm("0xagent"))
+        served = await cache.get_score("0xagent")
+        warmed = await warming
+
+        assert served.overall == 1
+        assert warmed.overall == 2
+        assert (await cache.get_score("0xagent")).overall == 2
+        assert cache.age("0xagent") < 1
+        assert cache.age("0xother") is None
+
+    @pytest.mark.asyncio
+    async def test_queries_counted_and_decayed(self, calculator):
+        """Lookups are counted per address and fade with decay."""
+        cache = ScoreCache(calculator, ttl=60)
+        for _ in range(3):
+            await cache.get_score("0xAgent")
+        await cache.get_score("0xother")
+
+        assert cache.queries["0xagent"] == 3
+
+        cache.decay_queries(0.5, floor=1.0)
+
+        assert cache.queries["0xagent"] == 1.5
+        assert "0xother" not in cache.queries
+
+    @pytest.mark.asyncio
+    async def test_query_counter_is_bounded(self, calculator):
+        """Tracking many distinct addresses keeps only the most queried ones."""
+        cache = ScoreCache(calculator, ttl=60, max_entries=10)
+        for _ in range(5):
+            await cache.get_score("0xpopular")
+        for i in range(50):
+            await cache.get_score(f"0x{i:x}")
+
+        assert len(cache.queries) <= 10
+        assert "0xpopular" in cache.queries
+        assert cache.stats["query_trims"] > 0
@@ -1,5 +1,8 @@
 """Tests for AgentFICO Score Calculator."""
 
+import asyncio
+import time
+
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
@@ -9,6 +12,8 @@ from src.calculator.score_calculator import (
     RiskLevel,
     ScoreCalculator,
 )
+from src.data_sources.rate_limiter import Priority, RateLimiter, current_priority
+from src.services.score_history import InMemoryScoreHistoryStore
 
 
 class TestRiskLevel:
@@ -443,6 +448,42 @@ class TestAsyncCalculation:
 
         assert before <= score.timestamp <= after
 
+    @pytest.mark.asyncio
+    async def test_calculate_score_records_history(self, mock_data_sources):
+        """Every computed score is appended to the history store."""
+        mock_etherscan, mock_x402, mock_erc8004 = mock_data_sources
+        history = InMemoryScoreHistoryStore()
+
+        calculator = ScoreCalculator(
+            mock_etherscan, mock_x402, mock_erc8004, history_store=history
+        )
+
+        await calculator.calculate_score("0xABCD", days=60)
+        page = await history.get_history("0xabcd", include_total=True)
+
+        assert page.total_count == 1
+        record = page.records[0]
+        assert record.overall == 800
+        assert record.days == 60
+        assert record.tx_count == 50
+        assert record.success_rate == 94.5
+
+    @pytest.mark.asyncio
+    async def test_history_failure_does_not_fail_score(self, mock_data_sources):
+        """A history write error is logged, not raised."""
+        mock_etherscan, mock_x402, mock_erc8004 = mock_data_sources
+        history = MagicMock()
+        history.append = AsyncMock(side_effect=RuntimeError("disk full"))
+
+        calculator = ScoreCalculator(
+            mock_etherscan, mock_x402, mock_erc8004, history_store=history
+        )
+
+        score = await calculator.calculate_score("0x1234")
+
+        assert score.overall == 800
+        history.append.assert_awaited_once()
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
@@ -495,3 +536,329 @@ class TestEdgeCases:
         # 33*0.4 + 33*0.4 + 33*0.2 = 33 → 330
         result = calculator.calculate_score_sync(33, 33, 33)
         assert result == 330
+
+
+class TestConcurrentSourceCollection:
+    """Tests for concurrent source fan-out with timeouts."""
+
+    @staticmethod
+    def _slow(result: dict, delay: float):
+        async def _source(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return result
+
+        return _source
+
+    @pytest.mark.asyncio
+    async def test_sources_fetched_concurrently(self):
+        """Latency should track the slowest source, not the sum."""
+        mock_etherscan = MagicMock()
+        mock_etherscan.get_agent_tx_success_score = self._slow({"score": 85}, 0.2)
+        mock_x402 = MagicMock()
+        mock_x402.calculate_profitability = self._slow({"score": 75}, 0.2)
+        mock_erc8004 = MagicMock()
+        mock_erc8004.calculate_stability_score = self._slow({"score": 80}, 0.2)
+
+        calculator = ScoreCalculator(mock_etherscan, mock_x402, mock_erc8004)
+
+        start = time.monotonic()
+        score = await calculator.calculate_score("0x1234")
+        elapsed = time.monotonic() - start
+
+        assert score.overall == 800
+        assert elapsed < 0.5
+        assert "missing" not in score.breakdown
+
+    @pytest.mark.asyncio
+    async def test_timed_out_source_returns_partial_score(self):
+        """A source exceeding its timeout is flagged and lowers confidence."""
+        mock_etherscan = MagicMock()
+        mock_etherscan.get_agent_tx_success_score = AsyncMock(
+            return_value={"score": 85, "total_txs": 50}
+        )
+        mock_x402 = MagicMock()
+        mock_x402.calculate_profitability = self._slow({"score": 75}, 1.0)
+        mock_erc8004 = MagicMock()
+        mock_erc8004.calculate_stability_score = AsyncMock(
+            return_value={"score": 80, "is_registered": True}
+        )
+
+        calculator = ScoreCalculator(
+            mock_etherscan,
+            mock_x402,
+            mock_erc8004,
+            source_timeouts={"x402_profitability": 0.05},
+        )
+
+        score = await calculator.calculate_score("0x1234")
+
+        # (85*0.4 + 0*0.4 + 80*0.2) * 10 = 500
+        assert score.overall == 500
+        assert score.x402_profitability == 0
+        assert score.breakdown["partial"] is True
+        assert score.breakdown["missing"] == ["x402_profitability"]
+        assert score.breakdown["sources"]["x402Profitability"]["error"] == "timeout"
+        # 50 base + 20 (50 txs) + 20 (registered) - 20 (missing source)
+        assert score.confidence == 70
+
+    @pytest.mark.asyncio
+    async def test_latency_budget_caps_source_timeouts(self):
+        """The overall latency budget bounds every source."""
+        mock_etherscan = MagicMock()
+        mock_etherscan.get_agent_tx_success_score = self._slow({"score": 85}, 1.0)
+        mock_x402 = MagicMock()
+        mock_x402.calculate_profitability = AsyncMock(return_value={"score": 75})
+        mock_erc8004 = MagicMock()
+        mock_erc8004.calculate_stability_score = AsyncMock(return_value={"score": 80})
+
+        calculator = ScoreCalculator(
+            mock_etherscan, mock_x402, mock_erc8004, latency_budget=0.05
+        )
+
+        start = time.monotonic()
+        score = await calculator.calculate_score("0x1234")
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        assert score.breakdown["missing"] == ["tx_success"]
+        assert score.tx_success == 0
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical score requests."""
+
+    @pytest.fixture
+    def slow_sources(self):
+        """Data sources that take a moment to respond."""
+
+        async def tx_source(address, days):
+            await asyncio.sleep(0.05)
+            return {"score": 85, "total_txs": 50}
+
+        mock_etherscan = MagicMock()
+        mock_etherscan.get_agent_tx_success_score = AsyncMock(side_effect=tx_source)
+        mock_x402 = MagicMock()
+        mock_x402.calculate_profitability = AsyncMock(return_value={"score": 75})
+        mock_erc8004 = MagicMock()
+        mock_erc8004.calculate_stability_score = AsyncMock(return_value={"score": 80})
+        return mock_etherscan, mock_x402, mock_erc8004
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_computation(self, slow_sources):
+        """Identical concurrent requests trigger a single computation."""
+        calculator = ScoreCalculator(*slow_sources)
+
+        scores = await asyncio.gather(
+            *(calculator.calculate_score("0xAgent", 30) for _ in range(5)),
+            calculator.calculate_score("0xagent", 30),
+        )
+
+        assert slow_sources[0].get_agent_tx_success_score.await_count == 1
+        assert all(score is scores[0] for score in scores)
+        assert calculator._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_different_days_not_coalesced(self, slow_sources):
+        """Requests for different periods are computed separately."""
+        calculator = ScoreCalculator(*slow_sources)
+
+        await asyncio.gather(
+            calculator.calculate_score("0xagent", 30),
+            calculator.calculate_score("0xagent", 90),
+        )
+
+        assert slow_sources[0].get_agent_tx_success_score.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_recompute(self, slow_sources):
+        """Once finished, the next call starts a new computation."""
+        calculator = ScoreCalculator(*slow_sources)
+
+        await calculator.calculate_score("0xagent")
+        await calculator.calculate_score("0xagent")
+
+        assert slow_sources[0].get_agent_tx_success_score.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self, slow_sources):
+        """A failing computation raises in every waiter."""
+        mock_etherscan, mock_x402, mock_erc8004 = slow_sources
+        mock_etherscan.get_agent_tx_success_score = AsyncMock(
+            side_effect=RuntimeError("etherscan down")
+        )
+        calculator = ScoreCalculator(mock_etherscan, mock_x402, mock_erc8004)
+
+        results = await asyncio.gather(
+            calculator.calculate_score("0xagent"),
+            calculator.calculate_score("0xagent"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert mock_etherscan.get_agent_tx_success_score.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self, slow_sources):
+        """Cancelling one caller leaves the shared computation running."""
+        calculator = ScoreCalculator(*slow_sources)
+
+        first = asyncio.ensure_future(calculator.calculate_score("0xagent"))
+        second = asyncio.ensure_future(calculator.calculate_score("0xagent"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        score = await second
+        assert score.tx_success == 85
+
+
+class TestBatchScoring:
+    """Tests for ScoreCalculator.calculate_scores."""
+
+    @pytest.fixture
+    def sources(self):
+        """Sources that fail for one specific address."""
+        active = {"now": 0, "peak": 0}
+
+        async def tx_source(address, days):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            if address == "0xbad":
+                raise RuntimeError("etherscan error")
+            return {"score": 90, "total_txs": 10}
+
+        mock_etherscan = MagicMock()
+        mock_etherscan.rate_limiter = RateLimiter(["key"], rate=5)
+        mock_etherscan.get_agent_tx_success_score = AsyncMock(side_effect=tx_source)
+        mock_x402 = MagicMock()
+        mock_x402.calculate_profitability = AsyncMock(return_value={"score": 50})
+        mock_erc8004 = MagicMock()
+        mock_erc8004.calculate_stability_score = AsyncMock(return_value={"score": 50})
+        return (mock_etherscan, mock_x402, mock_erc8004), active
+
+    @pytest.mark.asyncio
+    async def test_scores_and_errors_reported_per_address(self, sources):
+        """Failures are isolated to their address."""
+        calculator = ScoreCalculator(*sources[0])
+
+        result = await calculator.calculate_scores(["0xa", "0xbad", "0xb"])
+
+        assert set(result.scores) == {"0xa", "0xb"}
+        assert result.errors == {"0xbad": "etherscan error"}
+        assert result.scores["0xa"].tx_success == 90
+
+    @pytest.mark.asyncio
+    async def test_addresses_deduplicated(self, sources):
+        """Duplicate addresses (any case) are scored once."""
+        calculator = ScoreCalculator(*sources[0])
+
+        result = await calculator.calculate_scores(["0xA", "0xa", "0xa"])
+
+        assert list(result.scores) == ["0xa"]
+        assert sources[0][0].get_agent_tx_success_score.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self, sources):
+        """No more than max_concurrency scores run at once."""
+        calculator = ScoreCalculator(*sources[0])
+
+        await calculator.calculate_scores(
+            [f"0x{i:040x}" for i in range(20)], max_concurrency=3
+        )
+
+        assert sources[1]["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_default_concurrency_follows_rate_limit(self, sources):
+        """Default worker count matches the Etherscan rate limit."""
+        calculator = ScoreCalculator(*sources[0])
+
+        await calculator.calculate_scores([f"0x{i:040x}" for i in range(20)])
+
+        assert sources[1]["peak"] == 5
+
+    @pytest.mark.asyncio
+    async def test_default_concurrency_scales_with_key_pool(self, sources):
+        """A larger key pool gets more workers."""
+        sources[0][0].rate_limiter = RateLimiter({"a": 5, "b": 3})
+        calculator = ScoreCalculator(*sources[0])
+
+        await calculator.calculate_scores([f"0x{i:040x}" for i in range(20)])
+
+        assert sources[1]["peak"] == 8
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_in_batch_lane(self, sources):
+        """Batch scoring yields to interactive calls at the rate limiter."""
+        lanes = []
+
+        async def tx_source(address, days):
+            lanes.append(current_priority())
+            return {"score": 90}
+
+        sources[0][0].get_agent_tx_success_score = AsyncMock(side_effect=tx_source)
+        calculator = ScoreCalculator(*sources[0])
+
+        await calculator.calculate_scores(["0xa", "0xb"])
+        await calculator.calculate_score("0xc")
+
+        assert lanes == [Priority.BATCH, Priority.BATCH, Priority.INTERACTIVE]
+
+
+class TestStreamingBatchScoring:
+    """Tests for ScoreCalculator.iter_scores."""
+
+    @pytest.fixture
+    def calculator(self):
+        """Calculator whose tx source latency depends on the address."""
+        delays = {"0xslow": 0.1, "0xfast": 0.0, "0xmid": 0.05}
+
+        async def tx_source(address, days):
+            await asyncio.sleep(delays.get(address, 0))
+            if address == "0xbad":
+                raise RuntimeError("boom")
+            return {"score": 90}
+
+        mock_etherscan = MagicMock()
+        mock_etherscan.get_agent_tx_success_score = AsyncMock(side_effect=tx_source)
+        mock_x402 = MagicMock()
+        mock_x402.calculate_profitability = AsyncMock(return_value={"score": 50})
+        mock_erc8004 = MagicMock()
+        mock_erc8004.calculate_stability_score = AsyncMock(return_value={"score": 50})
+        return ScoreCalculator(mock_etherscan, mock_x402, mock_erc8004)
+
+    @pytest.mark.asyncio
+    async def test_yields_in_completion_order(self, calculator):
+        """Fast agents are yielded before slow ones."""
+        order = [
+            address
+            async for address, _, _ in calculator.iter_scores(
+                ["0xslow", "0xmid", "0xfast"], max_concurrency=3
+            )
+        ]
+        assert order == ["0xfast", "0xmid", "0xslow"]
+
+    @pytest.mark.asyncio
+    async def test_errors_yielded_inline(self, calculator):
+        """Failures are yielded as (address, None, error)."""
+        items = [item async for item in calculator.iter_scores(["0xbad", "0xfast"])]
+
+        by_address = {address: (score, error) for address, score, error in items}
+        assert by_address["0xbad"] == (None, "boom")
+        assert by_address["0xfast"][0].tx_success == 90
+
+    @pytest.mark.asyncio
+    async def test_consumes_addresses_lazily(self, calculator):
+        """Addresses are pulled from a generator as workers free up."""
+        pulled = []
+
+        def addresses():
+            for i in range(10):
+                pulled.append(i)
+                yield f"0x{i:040x}"
+
+        iterator = calculator.iter_scores(addresses(), max_concurrency=2)
+        await iterator.__anext__()
+        assert len(pulled) < 10
+        await iterator.aclose()
@@ -0,0 +1,148 @@
+"""Tests for the append-only score history store."""
+
+import pytest
+
+from src.services.score_history import (
+    InMemoryScoreHistoryStore,
+    ScoreRecord,
+    SQLiteScoreHistoryStore,
+)
+
+HOUR_MS = 3600 * 1000
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each test runs against both implementations."""
+    if request.param == "memory":
+        yield InMemoryScoreHistoryStore()
+    else:
+        store = SQLiteScoreHistoryStore(tmp_path / "history.db")
+        yield store
+        store.close()
+
+
+def record(recorded_at, overall=800, address="0xAgent", days=30, risk_level=2):
+    return ScoreRecord(
+        address=address,
+        recorded_at=recorded_at,
+        days=days,
+        overall=overall,
+        tx_success=90,
+        x402_profitability=0,
+        erc8004_stability=0,
+        risk_level=risk_level,
+        confidence=60,
+        tx_count=10,
+        success_rate=90.0,
+    )
+
+
+class TestScoreHistoryStore:
+    """Tests shared by every ScoreHistoryStore."""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_newest_first(self, store):
+        """Pages follow each other without gaps or repeats, ties by id."""
+        for i, ts in enumerate([100, 200, 200, 300, 400]):
+            await store.append(record(ts, overall=i))
+        await store.append(record(250, address="0xother"))
+
+        seen = []
+        cursor = None
+        while True:
+            page = await store.get_history(
+                "0xagent", limit=2, cursor=cursor, include_total=cursor is None
+            )
+            seen.extend(r.overall for r in page.records)
+            assert page.total_count == (5 if cursor is None else None)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [4, 3, 2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_range_and_period_filters(self, store):
+        """since/until bound the range and days selects the period."""
+        for ts in (100, 200, 300):
+            await store.append(record(ts))
+        await store.append(record(250, days=90))
+
+        page = await store.get_history(
+            "0xagent", since=200, until=300, days=30, include_total=True
+        )
+
+        assert [r.recorded_at for r in page.records] == [300, 200]
+        assert page.total_count == 2
+
+    @pytest.mark.asyncio
+    async def test_append_assigns_ids(self, store):
+        """Appended records get increasing ids and a lowercase address."""
+        first = await store.append(record(100))
+        second = await store.append(record(100))
+
+        assert first.address == "0xagent"
+        assert second.id > first.id
+
+    @pytest.mark.asyncio
+    async def test_downsampling(self, store):
+        """Records are averaged per bucket; empty buckets are skipped."""
+        # Hours 0 (two records), 1 (one) and 5 (two)
+        for ts, overall in [(0, 700), (10, 900), (HOUR_MS, 500),
+                            (5 * HOUR_MS, 100), (5 * HOUR_MS + 1, 300)]:
+            await store.append(record(ts, overall=overall))
+
+        page = await store.get_history(
+            "0xagent", limit=2, resolution=3600, include_total=True
+        )
+
+        assert [(r.overall, r.samples) for r in page.records] == [(200, 2), (500, 1)]
+        assert page.records[0].recorded_at == 5 * HOUR_MS + 1
+        assert page.total_count == 5
+
+        rest = await store.get_history(
+            "0xagent", limit=2, resolution=3600, cursor=page.next_cursor
+        )
+
+        assert [(r.overall, r.samples) for r in rest.records] == [(800, 2)]
+        assert rest.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_downsampling_reads_in_chunks(self, store):
+        """Buckets spanning several read chunks are merged whole."""
+        store.DOWNSAMPLE_CHUNK = 3
+        for i in range(10):
+            await store.append(record(i, overall=i * 10))
+        await store.append(record(HOUR_MS, overall=0))
+
+        page = await store.get_history("0xagent", limit=1, resolution=3600)
+        rest = await store.get_history(
+            "0xagent", limit=1, resolution=3600, cursor=page.next_cursor
+        )
+
+        assert page.records[0].samples == 1
+        assert rest.records[0].samples == 10
+        assert rest.records[0].overall == 45
+
+    @pytest.mark.asyncio
+    async def test_downsampling_row_cap_continues(self, store):
+        """A bucket cut off by MAX_DOWNSAMPLE_ROWS continues on the next page."""
+        store.DOWNSAMPLE_CHUNK = 10
+        store.MAX_DOWNSAMPLE_ROWS = 50
+        for i in range(120):
+            await store.append(record(i))
+
+        samples, cursor, pages = [], None, 0
+        while pages == 0 or cursor:
+            page = await store.get_history("0xagent", limit=5, resolution=3600, cursor=cursor)
+            samples += [r.samples for r in page.records]
+            cursor, pages = page.next_cursor, pages + 1
+
+        assert samples == [50, 50, 20]
+
+    @pytest.mark.asyncio
+    async def test_bad_cursor(self, store):
+        """A malformed cursor raises ValueError."""
+        with pytest.raises(ValueError):
+            await store.get_history("0xagent", cursor="not-a-cursor")
@@ -0,0 +1,117 @@
+"""Tests for the background score refresh scheduler."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.calculator.score_calculator import ScoreCalculator
+from src.data_sources.rate_limiter import Priority, current_priority
+from src.services.score_cache import ScoreCache
+from src.services.score_scheduler import ScoreRefreshScheduler
+
+from .test_score_cache import make_score
+
+
+@pytest.fixture
+def calculator():
+    """Calculator recording the addresses it scores and their lane."""
+    calc = ScoreCalculator(MagicMock(), MagicMock(), MagicMock())
+    calc.scored = []
+
+    async def _calculate(address, days=30):
+        calc.scored.append((address, current_priority()))
+        return make_score(address)
+
+    calc.calculate_score = AsyncMock(side_effect=_calculate)
+    return calc
+
+
+def scheduler_for(cache, tracked=(), **kwargs):
+    async def agents():
+        return list(tracked)
+
+    return ScoreRefreshScheduler(cache, agent_source=agents, **kwargs)
+
+
+class TestScoreRefreshScheduler:
+    """Tests for planning and running refresh cycles."""
+
+    @pytest.mark.asyncio
+    async def test_tracked_agents_precomputed(self, calculator):
+        """Tracked agents without a cached score are scored in the batch lane."""
+        cache = ScoreCache(calculator, ttl=60)
+        scheduler = scheduler_for(cache, ["0xA", "0xb", "0xa"])
+
+        await scheduler.reload_agents()
+        assert await scheduler.run_once() == 2
+
+        assert sorted(a for a, _ in calculator.scored) == ["0xa", "0xb"]
+        assert {lane for _, lane in calculator.scored} == {Priority.BATCH}
+        assert cache.age("0xa") is not None
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_skipped(self, calculator):
+        """Entries younger than refresh_ahead * ttl are left alone."""
+        cache = ScoreCache(calculator, ttl=60)
+        await cache.get_score("0xa")
+        scheduler = scheduler_for(cache, ["0xa"])
+        await scheduler.reload_agents()
+
+        assert scheduler.plan() == []
+
+        cache.backend.get(cache._key("0xa", 30)).stored_at -= 50
+        assert scheduler.plan() == ["0xa"]
+
+    @pytest.mark.asyncio
+    async def test_popular_and_stale_first_within_budget(self, calculator):
+        """The call budget caps a cycle; popular untracked agents are included."""
+        cache = ScoreCache(calculator, ttl=60)
+        scheduler = scheduler_for(
+            cache, ["0xa", "0xb"], interval=1, rate_budget=6, calls_per_score=3
+        )
+        await scheduler.reload_agents()
+        cache.queries.update({"0xpopular": 50, "0xb": 5})
+
+        assert scheduler.per_cycle == 2
+        assert scheduler.plan() == ["0xpopular", "0xb"]
+
+    @pytest.mark.asyncio
+    async def test_failures_counted(self, calculator):
+        """A failing score does not stop the rest of the cycle."""
+        calculator.calculate_score.side_effect = [RuntimeError("boom"), make_score("0xb")]
+        cache = ScoreCache(calculator, ttl=60)
+        scheduler = scheduler_for(cache, ["0xa", "0xb"], max_concurrency=1)
+        await scheduler.reload_agents()
+
+        assert await scheduler.run_once() == 1
+        assert scheduler.stats["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_agent_reload_failure_keeps_tracked_set(self, calculator):
+        """A failing agent source leaves the previous set in place."""
+        scheduler = ScoreRefreshScheduler(
+            ScoreCache(calculator), agent_source=AsyncMock(side_effect=OSError("rpc down"))
+        )
+        scheduler.track(["0xA"])
+
+        await scheduler.reload_agents()
+
+        assert scheduler.tracked == ["0xa"]
+        assert scheduler.stats["agent_reload_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, calculator):
+        """The background task runs cycles until stopped."""
+        cache = ScoreCache(calculator, ttl=60)
+        scheduler = scheduler_for(cache, ["0xa"], interval=0.01)
+
+        scheduler.start()
+        for _ in range(100):
+            if scheduler.stats["cycles"]:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert not scheduler.running
+        assert scheduler.stats["refreshed"] == 1
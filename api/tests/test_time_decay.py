@@ -0,0 +1,141 @@
+"""Tests for the columnar time-decay weighting."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.services.anti_gaming import time_decay
+from src.services.anti_gaming.config_loader import DecayWindow, TimeDecayConfig
+from src.services.anti_gaming.time_decay import apply_time_decay, apply_time_decay_columns
+
+NUMPY_MODULE = time_decay  # patched by the engine fixture
+
+DAY = 86400
+REFERENCE = datetime(2026, 3, 1, 12)
+REFERENCE_TS = (REFERENCE - datetime(1970, 1, 1)).total_seconds()
+INF = float("inf")
+
+# Windows with a gap (30-40 days) that no transaction is assigned to
+CONFIG = TimeDecayConfig(
+    windows=(
+        DecayWindow("week", 0, 7, 1.0),
+        DecayWindow("month", 7, 30, 0.5),
+        DecayWindow("old", 40, INF, 0.1),
+    ),
+    min_transactions_per_window=3,
+    no_activity_penalty=0.9,
+)
+
+
+@pytest.fixture(autouse=True)
+def config():
+    snapshot = SimpleNamespace(time_decay=CONFIG)
+    with patch.object(time_decay, "get_snapshot", return_value=snapshot), patch.object(
+        time_decay, "is_feature_enabled", return_value=True
+    ):
+        yield CONFIG
+
+
+def scan_windows(days_ago_list, successes):
+    """Per-transaction linear scan over the windows (the reference)."""
+    counts = [0] * len(CONFIG.windows)
+    success_counts = [0] * len(CONFIG.windows)
+    for days_ago, success in zip(days_ago_list, successes):
+        for i, window in enumerate(CONFIG.windows):
+            if window.days_from <= days_ago < window.days_to:
+                counts[i] += 1
+                success_counts[i] += success
+                break
+    return counts, success_counts
+
+
+class TestApplyTimeDecayColumns:
+    """The columnar path bins transactions into the compiled windows."""
+
+    def test_window_stats(self, engine):
+        days_ago = [0.5, 1, 2, 6.9, 8, 9, 35, 50, 51, 52, -1]
+        successes = [True, True, False, True, True, False, True, True, True, False, True]
+        timestamps = [REFERENCE_TS - d * DAY for d in days_ago]
+
+        result = apply_time_decay_columns(timestamps, successes, REFERENCE_TS)
+
+        stats = result["window_stats"]
+        assert stats["week"]["tx_count"] == 4
+        assert stats["week"]["success_rate"] == pytest.approx(0.75)
+        assert stats["month"] == {
+            "tx_count": 2,
+            "success_rate": None,
+            "weight": 0.5,
+            "contribution": 0,
+            "note": "insufficient_data",
+        }
+        assert stats["old"]["tx_count"] == 3  # the 35-day tx falls in the gap
+        expected = (0.75 * 1.0 * 4 + (2 / 3) * 0.1 * 3) / (1.0 * 4 + 0.1 * 3)
+        assert result["weighted_success_rate"] == pytest.approx(expected)
+        assert "penalty" not in stats
+
+    def test_matches_linear_scan(self, engine):
+        rng = random.Random(7)
+        timestamps = [REFERENCE_TS - rng.uniform(-2, 120) * DAY for _ in range(2_000)]
+        successes = [rng.random() < 0.8 for _ in timestamps]
+        days_ago = [(REFERENCE_TS - ts) // DAY for ts in timestamps]
+
+        counts, success_counts = scan_windows(days_ago, successes)
+        result = apply_time_decay_columns(timestamps, successes, REFERENCE_TS)
+
+        for window, count, success_count in zip(CONFIG.windows, counts, success_counts):
+            stats = result["window_stats"][window.name]
+            assert stats["tx_count"] == count
+            assert stats["success_rate"] == pytest.approx(success_count / count)
+
+    def test_no_recent_activity_penalty(self, engine):
+        timestamps = [REFERENCE_TS - d * DAY for d in (10, 11, 12, float("nan"))]
+
+        result = apply_time_decay_columns(timestamps, [True] * 4, REFERENCE_TS)
+
+        assert result["window_stats"]["penalty"]["factor"] == 0.9
+        assert result["weighted_success_rate"] == pytest.approx(0.9)
+        assert result["window_stats"]["month"]["tx_count"] == 3
+
+    def test_empty(self, engine):
+        result = apply_time_decay_columns([], [], REFERENCE_TS)
+
+        assert result["weighted_success_rate"] == 0
+        assert result["window_stats"]["week"]["tx_count"] == 0
+
+
+class TestApplyTimeDecay:
+    """The dict API converts timestamps and delegates to the columnar path."""
+
+    def test_mixed_timestamp_formats(self, engine):
+        transactions = [
+            {"timestamp": REFERENCE_TS - 3600, "success": True},
+            {"timestamp": REFERENCE - timedelta(days=1), "success": False},
+            {"timestamp": (REFERENCE - timedelta(days=2)).isoformat() + "Z"},
+            {
+                "timestamp": (REFERENCE - timedelta(days=3)).replace(tzinfo=timezone.utc),
+                "success": True,
+            },
+            {"timestamp": "not a date"},
+            {"success": True},
+        ]
+
+        result = apply_time_decay(transactions, reference_date=REFERENCE)
+
+        assert result["decay_applied"]
+        assert result["total_transactions"] == 6
+        assert result["window_stats"]["week"]["tx_count"] == 4
+        assert result["weighted_success_rate"] == pytest.approx(0.75)
+
+    def test_disabled(self):
+        with patch.object(time_decay, "is_feature_enabled", return_value=False):
+            result = apply_time_decay([{"success": True}, {"success": False}])
+
+        assert result == {
+            "weighted_success_rate": 0.5,
+            "decay_applied": False,
+            "window_stats": {},
+        }
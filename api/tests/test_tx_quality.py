@@ -0,0 +1,133 @@
+"""Tests for the columnar transaction quality assessment."""
+
+import random
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.services.anti_gaming import tx_quality
+from src.services.anti_gaming.config_loader import TxQualityConfig
+from src.services.anti_gaming.tx_quality import (
+    KNOWN_DEFI_CONTRACTS,
+    assess_transaction_quality,
+    assess_transaction_quality_columns,
+)
+
+NUMPY_MODULE = tx_quality  # patched by the engine fixture
+
+UNISWAP, _, AAVE, ONEINCH = KNOWN_DEFI_CONTRACTS
+AGENT = "0x" + "a" * 40
+
+CONFIG = TxQualityConfig(
+    value_bands=((0.01, 0.05), (1.0, 0.3), (10.0, 0.7), (float("inf"), 1.0)),
+    interaction_weights=MappingProxyType({
+        "self_transfer": 0.1,
+        "defi_interaction": 1.0,
+        "contract_interaction": 0.7,
+        "simple_transfer": 0.4,
+    }),
+    diversity_bonus=MappingProxyType({
+        "enabled": True, "min_unique_protocols": 2, "bonus_per_protocol": 3, "max_bonus": 10,
+    }),
+    repetition_penalty=MappingProxyType({
+        "enabled": True,
+        "same_contract_threshold": 3,
+        "penalty_per_repeat": 0.02,
+        "max_penalty_percent": 30,
+    }),
+)
+
+
+@pytest.fixture(autouse=True)
+def config():
+    snapshot = SimpleNamespace(tx_quality=CONFIG)
+    with patch.object(tx_quality, "get_snapshot", return_value=snapshot), patch.object(
+        tx_quality, "is_feature_enabled", return_value=True
+    ):
+        yield CONFIG
+
+
+def make_tx(to, value=50.0, success=True, input_data=None, sender=AGENT):
+    tx = {"from": sender, "to": to, "value": value, "success": success}
+    if input_data is not None:
+        tx["input"] = input_data
+    return tx
+
+
+class TestAssessTransactionQuality:
+    """Weights, diversity and repetition match the documented rules."""
+
+    def test_weights_and_bonuses(self, engine):
+        other = "0x" + "b" * 40
+        transactions = [
+            make_tx("0x" + UNISWAP[2:].upper()),  # DeFi (any case), high value: 1.0
+            make_tx(AAVE, value=5.0, success=False),  # DeFi, medium: 0.7
+            make_tx(ONEINCH, value=0.5),  # DeFi, low: 0.3
+            make_tx(AGENT, value=0.001),  # self transfer, dust: 0.05 * 0.1
+            make_tx(other, input_data="0xa9059cbb"),  # contract call: 0.7
+            make_tx(other, input_data="0x"),  # simple transfer: 0.4
+            make_tx(other),
+            make_tx(other),
+            make_tx(other),  # 5 calls to `other`: 2 over the threshold
+        ]
+
+        result = assess_transaction_quality(transactions)
+
+        weights = [1.0, 0.7, 0.3, 0.005, 0.7, 0.4, 0.4, 0.4, 0.4]
+        total = sum(weights)
+        assert result["unique_protocols"] == 3
+        assert result["diversity_bonus"] == 6  # (3 - 2 + 1) * 3
+        assert result["penalties"]["repetition"] == pytest.approx(4.0)
+        assert result["weighted_success_rate"] == pytest.approx((total - 0.7) / total)
+        assert result["quality_score"] == pytest.approx(total / 9 * 100 + 6 - 4)
+        assert result["stats"] == {
+            "total_transactions": 9,
+            "avg_value_weight": pytest.approx(total / 9),
+        }
+
+    def test_numpy_matches_python(self):
+        rng = random.Random(3)
+        addresses = [AGENT, *KNOWN_DEFI_CONTRACTS] + [f"0x{i:040x}" for i in range(30)]
+        rows = 5_000
+        columns = (
+            [rng.choice([0.001, 0.5, 3.0, 40.0, rng.uniform(0, 20)]) for _ in range(rows)],
+            [rng.choice([0, 0, 0, rng.randrange(len(addresses))]) for _ in range(rows)],
+            [rng.randrange(len(addresses)) for _ in range(rows)],
+            [rng.random() < 0.5 for _ in range(rows)],
+            [rng.random() < 0.9 for _ in range(rows)],
+            addresses,
+        )
+
+        with patch.object(tx_quality, "NUMPY_AVAILABLE", True):
+            vectorized = assess_transaction_quality_columns(*columns)
+        with patch.object(tx_quality, "NUMPY_AVAILABLE", False):
+            rows_result = assess_transaction_quality_columns(*columns)
+
+        assert vectorized.keys() == rows_result.keys()
+        for key, value in rows_result.items():
+            assert vectorized[key] == pytest.approx(value)
+        assert vectorized["unique_protocols"] == 3
+
+    def test_repetition_penalty_is_capped(self, engine):
+        result = assess_transaction_quality([make_tx(UNISWAP)] * 40)
+
+        assert result["penalties"]["repetition"] == pytest.approx(30.0)
+        assert result["diversity_bonus"] == 0
+
+    def test_empty_and_disabled(self, engine):
+        assert assess_transaction_quality([]) == {
+            "quality_score": 0,
+            "weighted_success_rate": 0,
+            "diversity_bonus": 0,
+            "penalties": {},
+        }
+
+        with patch.object(tx_quality, "is_feature_enabled", return_value=False):
+            result = assess_transaction_quality_columns(
+                [1.0, 1.0], [0, 0], [1, 1], [False, False], [True, False], [AGENT, UNISWAP]
+            )
+
+        assert result["quality_score"] == 50.0
+        assert result["weighted_success_rate"] == 0.5
+        assert result["enabled"] is False
@@ -0,0 +1,100 @@
+"""Tests for columnar transaction success aggregation."""
+
+from array import array
+
+from src.data_sources import tx_stats
+from src.data_sources.tx_stats import (
+    daily_tx_success_stats,
+    normalize_success_rate,
+    tx_success_stats,
+    windowed_tx_success_stats,
+)
+from src.models.transaction import STATUS_CODES, Transaction, TransactionBatch, TransactionStatus
+
+NUMPY_MODULE = tx_stats  # patched by the engine fixture
+
+S, F, P = TransactionStatus.SUCCESS, TransactionStatus.FAILED, TransactionStatus.PENDING
+
+
+def make_batch(rows):
+    """Build a batch from (timestamp, status) pairs."""
+    return TransactionBatch.from_transactions(
+        Transaction(
+            hash=f"0x{i:064x}",
+            from_address="0xagent",
+            to_address="0xreceiver",
+            value=0,
+            gas_used=21000,
+            gas_price=1,
+            status=status,
+            timestamp=timestamp,
+            block_number=i,
+        )
+        for i, (timestamp, status) in enumerate(rows)
+    )
+
+
+class TestTxSuccessStats:
+    """Tests for counts, rates and windows."""
+
+    def test_counts_and_rate(self, engine):
+        """Pending rows count toward the total but not the rate."""
+        batch = make_batch([(1, S), (2, S), (3, S), (4, F), (5, P)])
+
+        stats = tx_success_stats(batch)
+
+        assert (stats.successful, stats.failed, stats.pending, stats.total) == (3, 1, 1, 5)
+        assert stats.success_rate == 75.0
+        assert stats.score == normalize_success_rate(75.0)
+
+    def test_window(self, engine):
+        """Rows before the cutoff are ignored."""
+        batch = make_batch([(100, F), (200, S), (300, S)])
+
+        assert tx_success_stats(batch, since=200).success_rate == 100.0
+        assert tx_success_stats(list(batch), since=200).total == 2
+
+    def test_several_windows(self, engine):
+        """Every window is counted from the same columns."""
+        timestamps = array("q", [10, 20, 30, 40])
+        statuses = array("b", [STATUS_CODES[s] for s in (F, S, F, S)])
+
+        stats = windowed_tx_success_stats(timestamps, statuses, [None, 15, 35, 50])
+
+        assert [s.total for s in stats] == [4, 3, 1, 0]
+        assert stats[1].failed == 1
+
+    def test_empty(self, engine):
+        """No transactions yields a zero rate."""
+        stats = tx_success_stats(TransactionBatch())
+
+        assert stats.total == 0
+        assert stats.success_rate == 0.0
+
+
+class TestDailyTxSuccessStats:
+    """Tests for per-day aggregation."""
+
+    def test_counts_per_day(self, engine):
+        """Rows are grouped by UTC day; days without rows are absent."""
+        day = 86400
+        batch = make_batch([(day + 1, S), (day + 2, F), (2 * day - 1, P), (3 * day, S)])
+
+        stats = daily_tx_success_stats(batch.timestamps, batch.statuses)
+
+        assert sorted(stats) == [1, 3]
+        assert (stats[1].successful, stats[1].failed, stats[1].pending) == (1, 1, 1)
+        assert stats[3].total == 1
+
+    def test_empty(self, engine):
+        assert daily_tx_success_stats(array("q"), array("b")) == {}
+
+
+class TestNormalization:
+    """Tests for the shared score curve."""
+
+    def test_curve_points(self):
+        """The curve rewards high success rates and penalizes low ones."""
+        rates = [100.0, 99.0, 95.0, 90.0, 80.0, 50.0, 0.0]
+
+        assert [normalize_success_rate(r) for r in rates] == [100, 100, 95, 85, 65, 30, 0]
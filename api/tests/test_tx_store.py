@@ -0,0 +1,286 @@
+"""Tests for the local transaction store and incremental sync."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.data_sources.etherscan import EtherscanClient
+from src.data_sources.tx_store import (
+    INTERNAL,
+    NORMAL,
+    InMemoryTransactionStore,
+    SQLiteTransactionStore,
+)
+from src.models.transaction import Transaction, TransactionStatus
+
+
+def make_tx(hash_: str, block: int, timestamp: int, status=TransactionStatus.SUCCESS):
+    """Build a transaction for store tests."""
+    return Transaction(
+        hash=hash_,
+        from_address="0xagent",
+        to_address="0xreceiver",
+        value=0,
+        gas_used=21000,
+        gas_price=20000000000,
+        status=status,
+        timestamp=timestamp,
+        block_number=block,
+    )
+
+
+class TestInMemoryTransactionStore:
+    """Tests for InMemoryTransactionStore."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_starts_empty(self):
+        """Unsynced addresses have no cursor."""
+        store = InMemoryTransactionStore()
+        assert await store.get_cursor(1, "0xagent", NORMAL) is None
+
+    @pytest.mark.asyncio
+    async def test_save_merges_and_deduplicates(self):
+        """Saved pages are merged newest first without duplicates."""
+        store = InMemoryTransactionStore()
+
+        await store.save_transactions(
+            1, "0xAgent", NORMAL, [make_tx("0x2", 20, 200), make_tx("0x1", 10, 100)], cursor=20
+        )
+        added = await store.save_transactions(
+            1, "0xagent", NORMAL, [make_tx("0x3", 30, 300), make_tx("0x2", 20, 200)], cursor=30
+        )
+
+        txs = await store.get_transactions(1, "0xagent")
+        assert added == 1
+        assert [tx.hash for tx in txs] == ["0x3", "0x2", "0x1"]
+        assert await store.get_cursor(1, "0xagent", NORMAL) == 30
+
+    @pytest.mark.asyncio
+    async def test_window_and_kind_filters(self):
+        """Reads can be limited by timestamp and kind."""
+        store = InMemoryTransactionStore()
+        await store.save_transactions(1, "0xagent", NORMAL, [make_tx("0xn", 10, 100)], cursor=10)
+        await store.save_transactions(1, "0xagent", INTERNAL, [make_tx("0xi", 20, 200)], cursor=20)
+
+        assert [tx.hash for tx in await store.get_transactions(1, "0xagent")] == ["0xi", "0xn"]
+        assert [
+            tx.hash for tx in await store.get_transactions(1, "0xagent", since_timestamp=150)
+        ] == ["0xi"]
+        assert [
+            tx.hash for tx in await store.get_transactions(1, "0xagent", kinds=[NORMAL])
+        ] == ["0xn"]
+
+    @pytest.mark.asyncio
+    async def test_chains_are_isolated(self):
+        """Histories are keyed by chain id."""
+        store = InMemoryTransactionStore()
+        await store.save_transactions(1, "0xagent", NORMAL, [make_tx("0x1", 10, 100)], cursor=10)
+
+        assert await store.get_transactions(8453, "0xagent") == []
+
+
+class TestIncrementalSync:
+    """Tests for EtherscanClient.sync_transactions."""
+
+    @pytest.mark.asyncio
+    async def test_second_sync_starts_after_cursor(self):
+        """Subsequent syncs only request blocks after the cursor."""
+        client = EtherscanClient(api_key="test_key", tx_store=InMemoryTransactionStore())
+
+        with patch.object(client, "get_transactions", new_callable=AsyncMock) as normal, \
+                patch.object(client, "get_internal_transactions", new_callable=AsyncMock) as internal:
+            normal.return_value = [make_tx("0x2", 105, 200), make_tx("0x1", 100, 100)]
+            internal.return_value = [make_tx("0xi", 90, 90)]
+
+            counts = await client.sync_transactions("0xAgent")
+            assert counts == {NORMAL: 2, INTERNAL: 1}
+            assert normal.call_args.kwargs["start_block"] == 0
+
+            normal.return_value = [make_tx("0x3", 110, 300)]
+            internal.return_value = []
+            counts = await client.sync_transactions("0xagent")
+
+            assert counts == {NORMAL: 1, INTERNAL: 0}
+            assert normal.call_args.kwargs["start_block"] == 106
+            assert internal.call_args.kwargs["start_block"] == 91
+
+        txs = await client.tx_store.get_transactions(client.chain_id, "0xagent")
+        assert [tx.hash for tx in txs] == ["0x3", "0x2", "0x1", "0xi"]
+
+    @pytest.mark.asyncio
+    async def test_score_uses_synced_history(self):
+        """get_agent_tx_success_score reads the window from the store."""
+        client = EtherscanClient(api_key="test_key", tx_store=InMemoryTransactionStore())
+        now = int(time.time())
+
+        with patch.object(client, "get_transactions", new_callable=AsyncMock) as normal, \
+                patch.object(client, "get_internal_transactions", new_callable=AsyncMock) as internal, \
+                patch.object(client, "get_block_by_timestamp", new_callable=AsyncMock) as block:
+            block.return_value = 0
+            normal.return_value = [
+                make_tx("0xnew", 200, now - 100),
+                make_tx("0xfail", 150, now - 200, TransactionStatus.FAILED),
+                make_tx("0xold", 100, now - 90 * 86400),
+            ]
+            internal.return_value = []
+
+            result = await client.get_agent_tx_success_score("0xagent", days=30)
+
+        assert result["total_txs"] == 2
+        assert result["successful_txs"] == 1
+        assert result["failed_txs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_first_sync_starts_at_window(self):
+        """The first sync only fetches blocks from the requested start."""
+        client = EtherscanClient(api_key="test_key", tx_store=InMemoryTransactionStore())
+
+        with patch.object(client, "get_transactions", new_callable=AsyncMock) as normal:
+            normal.return_value = [make_tx("0x1", 150, 150)]
+            await client.sync_transactions("0xagent", include_internal=False, start_block=100)
+
+        assert normal.call_args.kwargs["start_block"] == 100
+        assert await client.tx_store.get_first_block(client.chain_id, "0xagent", NORMAL) == 100
+
+    @pytest.mark.asyncio
+    async def test_longer_window_backfills(self):
+        """Asking for an earlier start block fetches only the missing range."""
+        client = EtherscanClient(api_key="test_key", tx_store=InMemoryTransactionStore())
+
+        with patch.object(client, "get_transactions", new_callable=AsyncMock) as normal:
+            normal.return_value = [make_tx("0x2", 150, 150)]
+            await client.sync_transactions("0xagent", include_internal=False, start_block=100)
+
+            normal.reset_mock()
+            normal.side_effect = lambda **kwargs: (
+                [make_tx("0x1", 60, 60)] if kwargs["sort"] == "desc" else []
+            )
+            counts = await client.sync_transactions(
+                "0xagent", include_internal=False, start_block=50
+            )
+
+        windows = sorted(
+            (call.kwargs["start_block"], call.kwargs["end_block"])
+            for call in normal.call_args_list
+        )
+        assert windows[0] == (50, 99)
+        assert windows[1][0] == 151
+        assert counts == {NORMAL: 1}
+        assert await client.tx_store.get_first_block(client.chain_id, "0xagent", NORMAL) == 50
+        assert await client.tx_store.get_cursor(client.chain_id, "0xagent", NORMAL) == 150
+
+    @pytest.mark.asyncio
+    async def test_sync_requires_store(self):
+        """Syncing without a store is a programming error."""
+        client = EtherscanClient(api_key="test_key")
+        with pytest.raises(ValueError):
+            await client.sync_transactions("0xagent")
+
+
+class TestSQLiteTransactionStore:
+    """Tests for the on-disk SQLite store."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = SQLiteTransactionStore(tmp_path / "txs.db")
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_preserves_fields(self, store):
+        """Stored rows are read back as equal Transaction objects."""
+        tx = Transaction(
+            hash="0xabc",
+            from_address="0xagent",
+            to_address="0xreceiver",
+            value=10**30,  # exceeds 64-bit
+            gas_used=21000,
+            gas_price=20000000000,
+            status=TransactionStatus.FAILED,
+            timestamp=1706536800,
+            block_number=19000000,
+            method_id="0xa9059cbb",
+        )
+        await store.save_transactions(1, "0xAgent", NORMAL, [tx], cursor=19000000)
+
+        assert await store.get_transactions(1, "0xagent") == [tx]
+        assert await store.get_cursor(1, "0xagent", NORMAL) == 19000000
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_and_orders(self, store):
+        """Duplicate rows are ignored and reads are newest first."""
+        await store.save_transactions(1, "0xagent", NORMAL, [make_tx("0x1", 10, 100)], cursor=10)
+        added = await store.save_transactions(
+            1, "0xagent", NORMAL, [make_tx("0x2", 20, 200), make_tx("0x1", 10, 100)], cursor=20
+        )
+        await store.save_transactions(1, "0xagent", INTERNAL, [make_tx("0xi", 15, 150)], cursor=15)
+
+        assert added == 1
+        txs = await store.get_transactions(1, "0xagent")
+        assert [tx.hash for tx in txs] == ["0x2", "0xi", "0x1"]
+        windowed = await store.get_transactions(1, "0xagent", since_timestamp=150, kinds=[NORMAL])
+        assert [tx.hash for tx in windowed] == ["0x2"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_never_moves_backwards(self, store):
+        """Saving an older cursor keeps the highest synced block."""
+        await store.save_transactions(1, "0xagent", NORMAL, [], cursor=50)
+        await store.save_transactions(1, "0xagent", NORMAL, [], cursor=40)
+
+        assert await store.get_cursor(1, "0xagent", NORMAL) == 50
+
+    @pytest.mark.asyncio
+    async def test_first_block_only_moves_backwards(self, store):
+        """The synced range only ever widens."""
+        await store.save_transactions(1, "0xagent", NORMAL, [], cursor=50, first_block=20)
+        await store.save_transactions(1, "0xagent", NORMAL, [], cursor=60, first_block=30)
+        await store.save_transactions(1, "0xagent", NORMAL, [], cursor=60)
+        assert await store.get_first_block(1, "0xagent", NORMAL) == 20
+
+        await store.save_transactions(1, "0xagent", NORMAL, [], cursor=60, first_block=10)
+        assert await store.get_first_block(1, "0xagent", NORMAL) == 10
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_row_read(self, store):
+        """Batches hold the same rows (and statuses) as row reads."""
+        await store.save_transactions(
+            1, "0xagent", NORMAL,
+            [make_tx("0x2", 20, 200), make_tx("0x1", 10, 100, TransactionStatus.FAILED)],
+            cursor=20,
+        )
+
+        txs = await store.get_transactions(1, "0xagent")
+        batch = await store.get_batch(1, "0xagent")
+
+        assert list(batch) == txs
+        assert txs[1].status == TransactionStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_internal_calls_keyed_by_trace_id(self, store):
+        """Calls of one parent with the same endpoints and value are kept apart."""
+        calls = [make_tx("0xparent", 10, 100) for _ in range(2)]
+        calls[0].trace_id, calls[1].trace_id = "0", "1"
+
+        added = await store.save_transactions(1, "0xagent", INTERNAL, calls, cursor=10)
+        again = await store.save_transactions(1, "0xagent", INTERNAL, calls, cursor=10)
+
+        assert (added, again) == (2, 0)
+        txs = await store.get_transactions(1, "0xagent")
+        assert sorted(tx.trace_id for tx in txs) == ["0", "1"]
+        assert list(await store.get_batch(1, "0xagent")) == txs
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        """A second store on the same file sees earlier writes."""
+        path = tmp_path / "shared.db"
+        first = SQLiteTransactionStore(path)
+        await first.save_transactions(1, "0xagent", NORMAL, [make_tx("0x1", 10, 100)], cursor=10)
+        first.close()
+
+        second = SQLiteTransactionStore(path)
+        try:
+            assert await second.get_cursor(1, "0xagent", NORMAL) == 10
+            assert len(await second.get_transactions(1, "0xagent")) == 1
+        finally:
+            second.close()